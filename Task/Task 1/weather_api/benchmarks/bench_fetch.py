@@ -0,0 +1,81 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+Compare the sequential scrape loop with the concurrent fetch engine.
+
+Run from the weather_api folder:
+    python -m benchmarks.bench_fetch --states 36 --latency 0.1
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import argparse
+import time
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+
+from weather_api.benchmarks.stub_server import StubServer
+from weather_api.scraper import scraper
+
+
+def run_sequential(url_template, states):
+    """Original nested loop: one blocking request per (date, state)."""
+    frames = []
+    for date in scraper.generate_7days_dates():
+        for state in states:
+            url = scraper.get_full_url(url_template, state, date)
+            raw_data = scraper.extract_data(url)
+            if raw_data:
+                frame = scraper.transform_data(raw_data, scraper.get_wind_direction)
+                frame["state"] = state
+                frame["url"] = url
+                frame["date"] = datetime.strptime(date, "%Y%m%d").strftime("%Y-%m-%d")
+                frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run_concurrent(url_template, states, max_concurrency, requests_per_second):
+    """Concurrent engine used by `extract_transform_main`."""
+    with mock.patch.object(scraper, "URL", url_template), \
+            mock.patch.object(scraper, "STATES", states):
+        return scraper.extract_transform_main(
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            use_cache=False,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=36, help="number of state capitals")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub response delay (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0, help="per-host requests/s (0 = off)")
+    args = parser.parse_args()
+
+    states = [f"state{i}" for i in range(args.states)]
+
+    with StubServer(latency=args.latency) as server:
+        start = time.perf_counter()
+        run_sequential(server.url, states)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_concurrent(server.url, states, args.concurrency, args.rate)
+        concurrent = time.perf_counter() - start
+
+    pages = 8 * args.states
+    print(f"pages: {pages}, stub latency: {args.latency}s, concurrency: {args.concurrency}")
+    print(f"sequential: {sequential:.2f}s ({pages / sequential:.1f} pages/s)")
+    print(f"concurrent: {concurrent:.2f}s ({pages / concurrent:.1f} pages/s)")
+    print(f"speedup:    {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+Parse throughput (pages/sec) of each parser backend on recorded pages.
+
+Run from the weather_api folder:
+    python -m benchmarks.bench_parse --seconds 3
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import argparse
+import glob
+import os
+import time
+
+from weather_api.benchmarks.stub_server import FIXTURE_DIR, load_fixture
+from weather_api.scraper.parsers import HAS_LXML, PARSERS
+
+
+def pages_per_second(parser, pages, seconds):
+    """Parse the fixture pages in a loop for `seconds` and return the rate."""
+    parsed = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for page in pages:
+            parser(page)
+        parsed += len(pages)
+    return parsed / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=3.0, help="time per backend")
+    args = parser.parse_args()
+
+    pages = [load_fixture(path) for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))]
+    print(f"fixtures: {len(pages)}")
+
+    results = {}
+    for name, backend in PARSERS.items():
+        if name == "lxml" and not HAS_LXML:
+            print("lxml: skipped (not installed)")
+            continue
+        results[name] = pages_per_second(backend, pages, args.seconds)
+        print(f"{name}: {results[name]:.1f} pages/s")
+
+    if len(results) == len(PARSERS):
+        print(f"speedup: {results['lxml'] / results['bs4']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+Per-stage throughput of the scraper pipeline on recorded timeanddate pages
+served by a local stub, reported as JSON so runs can be compared.
+
+Stages:
+    fetch        - download every page through the concurrent fetch engine
+    parse        - BeautifulSoup html.parser tree + `#wt-hbh` lookup
+    transform    - `transform_data` row extraction from the parsed tables
+    lxml         - lxml backend, parse and rows in one step
+    concat       - per-page DataFrames joined with `pd.concat` (old path)
+    records      - `WeatherRecords` column store built once (current path)
+    serialize    - `sync_data_to_sheet` payload (`sheet_payload`: `to_sheet_values`
+                   + upsert diff against an empty sheet)
+
+Each stage reports its wall time, throughput and rss_delta_mb: the highest
+resident memory sampled while it ran minus the memory before it started
+(Linux only; elsewhere it is None). The process-wide peak is reported once.
+
+Run from the weather_api folder:
+    python -m benchmarks.run_benchmarks --pages 288 --output bench.json
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import argparse
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+from weather_api.benchmarks.stub_server import StubServer
+from weather_api.scraper import scraper
+from weather_api.scraper.fetcher import fetch_all
+from weather_api.scraper.google_sheet import SheetSnapshot, sheet_payload
+from weather_api.scraper.parsers import HAS_LXML, lxml_rows, parse_table
+from weather_api.scraper.records import WeatherRecords
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def current_rss() -> int:
+    """Resident set size of this process now, in bytes (None where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class RssSampler:
+    """Records the highest resident memory of this process in a background thread."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start = current_rss()
+        self.peak = self.start
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if self.start is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, current_rss())
+
+    @property
+    def delta_mb(self):
+        """Memory added while sampling, in MB (None where RSS is not available)."""
+        if self.start is None:
+            return None
+        return round((self.peak - self.start) / 2**20, 2)
+
+
+class StageTimer:
+    """Collects wall time, throughput, memory growth and peak allocations per stage."""
+
+    def __init__(self, pages: int, trace_alloc: bool):
+        self.pages = pages
+        self.trace_alloc = trace_alloc
+        self.results = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_alloc:
+            tracemalloc.start()
+        sampler = RssSampler()
+        start_time = time.perf_counter()
+        try:
+            with sampler:
+                yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            result = {
+                "seconds": round(elapsed, 6),
+                "pages_per_sec": round(self.pages / elapsed, 2) if elapsed else None,
+                "rss_delta_mb": sampler.delta_mb,
+            }
+            if self.trace_alloc:
+                result["peak_alloc_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+                tracemalloc.stop()
+            self.results[name] = result
+
+
+def run(pages: int, latency: float, concurrency: int, trace_alloc: bool) -> dict:
+    """
+    Push `pages` recorded pages through every stage of the pipeline.
+
+    Returns:
+        dict: Machine-readable benchmark report.
+    """
+    timer = StageTimer(pages, trace_alloc)
+    states = [f"state{i}" for i in range(pages)]
+
+    with StubServer(latency=latency) as server:
+        urls = [scraper.get_full_url(server.url, state, "20250221") for state in states]
+        with timer.stage("fetch"):
+            responses = fetch_all(urls, max_concurrency=concurrency, requests_per_second=0)
+
+    failed = [url for url in urls if responses[url] is None]
+    if failed:
+        raise RuntimeError(f"{len(failed)} pages could not be fetched from the stub server")
+    contents = [responses[url].content for url in urls]
+
+    with timer.stage("parse"):
+        tables = [parse_table(content) for content in contents]
+
+    with timer.stage("transform"):
+        frames = [scraper.transform_data(table, scraper.get_wind_direction) for table in tables]
+
+    if HAS_LXML:
+        with timer.stage("lxml"):
+            rows = [lxml_rows(content) for content in contents]
+    else:
+        rows = [frame.values.tolist() for frame in frames]
+
+    with timer.stage("concat"):
+        for state, url, frame in zip(states, urls, frames):
+            frame["state"] = state
+            frame["url"] = url
+            frame["date"] = "2025-02-21"
+        pd.concat(frames, ignore_index=True)
+
+    with timer.stage("records"):
+        records = WeatherRecords()
+        for state, url, page_rows in zip(states, urls, rows):
+            records.add_page(page_rows, state, url, "2025-02-21")
+        data = records.to_frame()
+
+    with timer.stage("serialize"):
+        sheet_payload(SheetSnapshot([]), data)
+
+    return {
+        "pages": pages,
+        "rows": len(data),
+        "stub_latency_seconds": latency,
+        "concurrency": concurrency,
+        "stages": timer.results,
+        "peak_rss_mb": round(peak_rss_mb(), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=288, help="pages to replay (36 states x 8 days)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub response delay (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--trace-alloc", action="store_true", help="record peak Python allocations per stage")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.pages, args.latency, args.concurrency, args.trace_alloc)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://docs.python.org/3/library/http.server.html
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", "fixtures")
+
+FIXTURE_PAGE = os.path.join(FIXTURE_DIR, "wt_hbh.html")
+
+
+def load_fixture(path: str = FIXTURE_PAGE) -> bytes:
+    """Read a recorded timeanddate page from disk."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class StubServer:
+    """
+    Local HTTP server that answers every GET with a recorded forecast page.
+
+    Each response is delayed by `latency` seconds to stand in for the round
+    trip to timeanddate.com. The arrival time of every request and the most
+    requests handled at once are recorded, for checking the fetcher's limits.
+    With an `etag`, pages carry that ETag and a request sending it back in
+    If-None-Match is answered 304 Not Modified.
+    """
+
+    def __init__(self, page: bytes = None, latency: float = 0.05, etag: str = None):
+        self.page = page if page is not None else load_fixture()
+        self.latency = latency
+        self.etag = etag
+        self.requests = 0
+        self.not_modified = 0
+        self.arrivals = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL template in the same shape as `config.URL`."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/weather/nigeria/{{}}/hourly?hd={{}}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.arrivals.append(time.monotonic())
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.latency)
+                # done before replying, so the client cannot start its next
+                # request while this one still counts
+                with stub._lock:
+                    stub.in_flight -= 1
+
+                if stub.etag and self.headers.get("If-None-Match") == stub.etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", stub.etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                if stub.etag:
+                    self.send_header("ETag", stub.etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(stub.page)))
+                self.end_headers()
+                self.wfile.write(stub.page)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
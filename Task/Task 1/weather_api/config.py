@@ -5,6 +5,8 @@ Date: 21-02-2025
 
 """
 
+import os
+
 
 GOOGLE_SHEET_NAME = "weather-data-epic"
 
@@ -14,4 +16,65 @@ STATES = ["abeokuta", "asaba", "kano"]
 
 URL = "https://www.timeanddate.com/weather/nigeria/{}/hourly?hd={}"
 
+# concurrent fetch settings
+MAX_CONCURRENCY = 8
+
+REQUESTS_PER_HOST_PER_SECOND = 5
+
+REQUEST_TIMEOUT = 30
+
+# html parser backend: "lxml" (fast, C-accelerated) or "bs4"
+PARSER_BACKEND = "lxml"
+
+# on-disk cache of forecast pages
+HTTP_CACHE_ENABLED = True
+
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper", ".cache")
+
+HTTP_CACHE_MAX_ENTRIES = 512
+
+# seconds a cached page stays fresh, by days ahead (today, tomorrow, ..., day+7)
+HTTP_CACHE_TTL_BY_DAY = [15 * 60, 60 * 60, 3 * 3600, 3 * 3600, 6 * 3600, 6 * 3600, 12 * 3600, 12 * 3600]
+
+# where weather data is stored: "sqlite" (local, indexed) or "sheets"
+STORAGE_BACKEND = "sqlite"
+
+SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "weather.db")
+
+# append-only Parquet history of every scrape
+ARCHIVE_ENABLED = True
+
+ARCHIVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "archive")
+
+# also push every scrape to Google Sheets when the main store is not "sheets".
+# Off by default, as it needs the service account key; set
+# WEATHER_EXPORT_TO_SHEETS=1 to turn it on.
+EXPORT_TO_SHEETS = os.environ.get("WEATHER_EXPORT_TO_SHEETS", "0") == "1"
+
+# a state's data is stale (needs a re-scrape) after this many seconds
+STALE_AFTER_SECONDS = 3 * 3600
+
+# background re-scrape inside the API process
+SCRAPE_SCHEDULER_ENABLED = True
+
+SCRAPE_INTERVAL_SECONDS = 15 * 60
+
+# how load_data_to_sheet writes: "upsert" by (state, date, time) or "append"
+SHEET_SYNC_MODE = "upsert"
+
+# rows/ranges per Sheets API write request
+SHEET_WRITE_CHUNK_SIZE = 500
+
+# seconds between background refreshes of the in-memory read model
+READ_MODEL_REFRESH_SECONDS = 300
+
+# stage timing: JSON span log and samples kept per stage for p50/p95/p99.
+# The log is only created when the first span is written; set
+# WEATHER_SPAN_LOG to move it, or to an empty value to turn it off.
+SPAN_LOG_FILE = os.environ.get(
+    "WEATHER_SPAN_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "spans.log")
+)
+
+METRICS_WINDOW_SIZE = 1024
+
 """"""
\ No newline at end of file
@@ -8,13 +8,40 @@ https://www.geeksforgeeks.org/logging-in-python/
 
 
 import logging
+import os
+
+from weather_api.config import SPAN_LOG_FILE
 
 # set up logging
 logging.basicConfig(filename="log.txt",
                     format='%(asctime)s %(message)s',
-                    filemode='w')
+                    filemode='a')
 
 logger = logging.getLogger()
 
 # setting the threshold of looger to debug
-logger.setLevel(logging.DEBUG)
\ No newline at end of file
+logger.setLevel(logging.DEBUG)
+
+
+class LazyFileHandler(logging.FileHandler):
+    """File handler that creates its folder and file on the first record, not on import."""
+
+    def __init__(self, filename: str):
+        super().__init__(filename, mode="a", delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+# stage timing spans, one JSON object per line, kept out of log.txt
+span_logger = logging.getLogger("weather_api.spans")
+span_logger.setLevel(logging.INFO)
+span_logger.propagate = False
+
+if SPAN_LOG_FILE:
+    _span_handler = LazyFileHandler(SPAN_LOG_FILE)
+    _span_handler.setFormatter(logging.Formatter("%(message)s"))
+else:
+    _span_handler = logging.NullHandler()
+span_logger.addHandler(_span_handler)
@@ -13,8 +13,11 @@ import sys
 sys.path.append("../")
 
 
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.encoders import jsonable_encoder
 import uvicorn
 from weather_api.scraper import scraper, google_sheet
@@ -22,30 +25,165 @@ from weather_api.scraper import scraper, google_sheet
 from weather_api.utils.utils import (
     get_current_time,
     check_if_current_data_indb,
-    query_current_weather_info,
+    filter_weather_data,
+    parse_date,
+    parse_hour,
+    to_arrow_ipc,
+)
+from weather_api.utils.google_sheet_utils import sheet_clients
+from weather_api.utils.instrumentation import instrumentation, span
+from weather_api.utils.read_model import WeatherReadModel
+from weather_api.storage import get_storage
+from weather_api.storage.archive import WeatherArchive
+from weather_api.scheduler import ScrapeScheduler
+from weather_api.config import (
+    GOOGLE_SHEET_NAME,
+    SERVICE_KEY_PATH,
+    READ_MODEL_REFRESH_SECONDS,
+    STORAGE_BACKEND,
+    EXPORT_TO_SHEETS,
+    STATES,
+    STALE_AFTER_SECONDS,
+    MAX_CONCURRENCY,
+    SCRAPE_SCHEDULER_ENABLED,
+    SCRAPE_INTERVAL_SECONDS,
+    ARCHIVE_ENABLED,
+    ARCHIVE_PATH,
+)
+
+
+# Weather store selected in config.STORAGE_BACKEND
+storage = get_storage()
+
+# Parquet history of every scrape
+archive = WeatherArchive(ARCHIVE_PATH)
+
+# In-memory copy of the store, refreshed in the background
+read_model = WeatherReadModel(storage.load, READ_MODEL_REFRESH_SECONDS)
+
+
+def load(data):
+    """
+    Loads scraped weather data into the weather store and the history archive
+    (and into the Google Sheet when it is used as an export target).
+    """
+    with span("save", labels={"backend": STORAGE_BACKEND}, rows=len(data)):
+        storage.save(data)
+
+    if ARCHIVE_ENABLED:
+        with span("archive", rows=len(data)):
+            archive.append(data)
+
+    if EXPORT_TO_SHEETS and STORAGE_BACKEND != "sheets":
+        with span("sheets_export", rows=len(data)):
+            google_sheet.load_data_to_sheet(data, GOOGLE_SHEET_NAME, SERVICE_KEY_PATH)
+
+
+# Re-scrapes stale states while the API is running
+scheduler = ScrapeScheduler(
+    storage,
+    read_model,
+    load,
+    states=STATES,
+    interval=SCRAPE_INTERVAL_SECONDS,
+    stale_after=STALE_AFTER_SECONDS,
+    max_workers=MAX_CONCURRENCY,
 )
-from weather_api.config import GOOGLE_SHEET_NAME, SERVICE_KEY_PATH
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start loading the read model in the background and start the scrape
+    scheduler on startup; stop both on shutdown. The port binds immediately;
+    lookups answer 503 until the first load finishes.
+    """
+    read_model.start()
+    if SCRAPE_SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+    read_model.stop()
+
 
 app = FastAPI(
     title="Weather API",
     description="This API provides real-time weather data for state capitals, "
-    "fetching and storing the data in Google Sheets.",
+    "fetching and storing the data in a local store or Google Sheets.",
     version="1.0.0",
     contact={
         "name": "Adedoyin Samuel",
         "email": "adedoyinsamuel25@gmail.com",
     },
+    lifespan=lifespan,
 )
 
 
+@app.middleware("http")
+async def time_request(request: Request, call_next):
+    """
+    Records every request as a "request" span, labelled by route template
+    (not the raw path, so /current_weather/kano and /current_weather/asaba
+    share one histogram).
+    """
+    labels = {"route": "unmatched"}
+    with span("request", labels=labels, method=request.method, path=request.url.path) as attributes:
+        response = await call_next(request)
+        # the route is only known once the request has been routed
+        labels["route"] = getattr(request.scope.get("route"), "path", "unmatched")
+        attributes["status_code"] = response.status_code
+    return response
+
+
 def main():
     """
-    Extracts and transforms weather data, then loads it into a Google Sheet.
+    Extracts and transforms weather data, then loads it.
     """
     data = scraper.extract_transform_main()
-    google_sheet.load_data_to_sheet(data, GOOGLE_SHEET_NAME, SERVICE_KEY_PATH)
+    load(data)
+
+
+def columnar_response(data, output_format):
+    """
+    Return a DataFrame column by column as compact JSON or an Arrow IPC stream.
+
+    Args:
+        data (pd.DataFrame): The records to return.
+        output_format (str): "json" or "arrow".
+
+    Returns:
+        JSONResponse | Response: {"columns": [...], "data": {column: [values]}}
+        or an Arrow IPC stream.
+    """
+    if output_format == "arrow":
+        return Response(
+            content=to_arrow_ipc(data), media_type="application/vnd.apache.arrow.stream"
+        )
+
+    data = data.astype(object).where(data.notna(), None)
+    return JSONResponse(
+        content=jsonable_encoder(
+            {"columns": list(data.columns), "data": data.to_dict(orient="list")}
+        )
+    )
+
+
+def parse_range(start_date, end_date, start_hour, end_hour):
+    """
+    Validate the date and hour range query parameters.
+
+    Returns:
+        dict: The normalized `start_date`, `end_date`, `start_hour` and `end_hour`.
+
+    Raises:
+        ValueError: If a date or hour is malformed.
+    """
+    return dict(
+        start_date=parse_date(start_date),
+        end_date=parse_date(end_date),
+        start_hour=parse_hour(start_hour),
+        end_hour=parse_hour(end_hour),
+    )
 
 
 @app.get("/current_weather/{state_capital}")
@@ -53,22 +191,164 @@ def get_data(state_capital: str):
     """
     Retrieves the current weather information for the specified state capital.
 
+    The answer comes from the in-memory read model, so the weather store is
+    not queried per request.
+
     Args:
         state_capital (str): The name of the state capital to fetch weather data for.
 
     Returns:
         JSONResponse: A JSON object containing the weather data.
     """
-    data = query_current_weather_info(
-        state_capital, SERVICE_KEY_PATH, GOOGLE_SHEET_NAME, get_current_time
-    )
+    if not read_model.is_loaded:
+        return JSONResponse(
+            status_code=503, content={"error": "Weather data is not loaded yet"}
+        )
+
+    current_date, current_time = get_current_time()
+    data = read_model.lookup(state_capital, current_date, current_time)
     json_compatible_item_data = jsonable_encoder(data)
     return JSONResponse(content=json_compatible_item_data)
 
 
+@app.get("/weather/bulk")
+def get_bulk_data(
+    states: List[str] = Query(..., description="State capitals, repeated or comma-separated"),
+    start_date: Optional[str] = Query(None, description="First date, YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="Last date, YYYY-MM-DD"),
+    start_hour: Optional[str] = Query(None, description="First hour, HH:00"),
+    end_hour: Optional[str] = Query(None, description="Last hour, HH:00"),
+    output_format: str = Query("json", alias="format", pattern="^(json|arrow)$"),
+):
+    """
+    Retrieves weather data for several state capitals in one call.
+
+    The records are filtered in a single scan of the in-memory read model and
+    returned column by column, either as compact JSON or as an Arrow IPC stream.
+
+    Returns:
+        JSONResponse | Response: {"columns": [...], "data": {column: [values]}}
+        or an Arrow IPC stream.
+    """
+    if not read_model.is_loaded:
+        return JSONResponse(
+            status_code=503, content={"error": "Weather data is not loaded yet"}
+        )
+
+    states = [state for value in states for state in value.split(",") if state.strip()]
+
+    try:
+        filters = parse_range(start_date, end_date, start_hour, end_hour)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    try:
+        data = filter_weather_data(read_model.frame(), states, **filters)
+    except ValueError as e:
+        # the store has records but not the expected columns
+        return JSONResponse(status_code=503, content={"error": str(e)})
+
+    return columnar_response(data, output_format)
+
+
+@app.get("/weather/history")
+def get_history(
+    states: Optional[List[str]] = Query(None, description="State capitals, repeated or comma-separated"),
+    start_date: Optional[str] = Query(None, description="First date, YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="Last date, YYYY-MM-DD"),
+    start_hour: Optional[str] = Query(None, description="First hour, HH:00"),
+    end_hour: Optional[str] = Query(None, description="Last hour, HH:00"),
+    mode: str = Query("range", pattern="^(range|forecast_vs_actual)$"),
+    output_format: str = Query("json", alias="format", pattern="^(json|arrow)$"),
+):
+    """
+    Retrieves archived weather forecasts over a time range.
+
+    With mode=range every archived snapshot in the range is returned; with
+    mode=forecast_vs_actual the earliest forecast of each hour is compared
+    with the latest one. Only the Parquet partitions in range are read.
+
+    Returns:
+        JSONResponse | Response: Column-oriented JSON or an Arrow IPC stream.
+    """
+    if states:
+        states = [state for value in states for state in value.split(",") if state.strip()]
+
+    try:
+        filters = parse_range(start_date, end_date, start_hour, end_hour)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    filters["states"] = states
+    if mode == "forecast_vs_actual":
+        data = archive.forecast_vs_actual(**filters)
+    else:
+        data = archive.scan(**filters)
+
+    return columnar_response(data, output_format)
+
+
+@app.get("/read_model/status")
+def get_read_model_status():
+    """
+    Reports the age and refresh statistics of the in-memory weather data.
+
+    Returns:
+        JSONResponse: A JSON object with the read model metrics.
+    """
+    return JSONResponse(content=jsonable_encoder(read_model.metrics()))
+
+
+@app.get("/freshness")
+def get_freshness():
+    """
+    Reports when each state's data was last loaded and whether it is stale.
+
+    Returns:
+        JSONResponse: Last load time, age in seconds and stale flag per state.
+    """
+    data = storage.staleness(STATES, STALE_AFTER_SECONDS)
+    return JSONResponse(content=jsonable_encoder(data))
+
+
+@app.get("/scheduler/status")
+def get_scheduler_status():
+    """
+    Reports the background scrape scheduler's cycle counts and last outcome.
+
+    Returns:
+        JSONResponse: A JSON object with the scheduler metrics.
+    """
+    return JSONResponse(content=jsonable_encoder(scheduler.metrics()))
+
+
+@app.get("/sheets/status")
+def get_sheets_status():
+    """
+    Reports time spent on Google Sheets auth, spreadsheet lookup and data transfer.
+
+    Returns:
+        JSONResponse: A JSON object with call counts and seconds per stage.
+    """
+    return JSONResponse(content=jsonable_encoder(sheet_clients.metrics()))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Exposes p50/p95/p99 latency per stage (fetch, parse, transform, sheet I/O,
+    requests, ...) in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: The Prometheus metrics page.
+    """
+    return PlainTextResponse(
+        instrumentation.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     # check db  and send data to db
-    if not check_if_current_data_indb(GOOGLE_SHEET_NAME, SERVICE_KEY_PATH):
+    if not check_if_current_data_indb(storage):
         main()
 
     # run fastapi
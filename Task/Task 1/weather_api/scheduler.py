@@ -0,0 +1,170 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://fastapi.tiangolo.com/advanced/events/
+https://docs.python.org/3/library/asyncio-task.html#running-in-threads
+"""
+import sys
+# set all depencies (module) part
+sys.path.append("../")
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from weather_api.logger import logger
+from weather_api.scraper import scraper
+from weather_api.storage.base import WeatherStorage
+from weather_api.utils.read_model import WeatherReadModel
+
+
+class ScrapeScheduler:
+    """
+    Re-scrapes stale states on a fixed cadence inside the API process.
+
+    A cycle only scrapes the states whose freshness metadata is older than
+    `stale_after`; within those, forecast pages that are still fresh in the
+    page cache are not downloaded again. A new cycle is skipped while the
+    previous one is still running. The scrape runs in a worker thread and the
+    read model is swapped in one step afterwards, so requests never wait on it.
+    """
+
+    def __init__(
+        self,
+        storage: WeatherStorage,
+        read_model: WeatherReadModel,
+        load: Callable[[pd.DataFrame], None],
+        states: List[str],
+        interval: float,
+        stale_after: float,
+        max_workers: int,
+    ):
+        """
+        Args:
+            storage (WeatherStorage): Store used to find stale states.
+            read_model (WeatherReadModel): Read model refreshed after each scrape.
+            load (Callable[[pd.DataFrame], None]): Saves scraped data.
+            states (List[str]): All state capitals to keep fresh.
+            interval (float): Seconds between cycles.
+            stale_after (float): Age in seconds after which a state is re-scraped.
+            max_workers (int): Maximum number of page requests in flight.
+        """
+        self.storage = storage
+        self.read_model = read_model
+        self.load = load
+        self.states = states
+        self.interval = interval
+        self.stale_after = stale_after
+        self.max_workers = max_workers
+
+        self._task: Optional[asyncio.Task] = None
+        self._cycle: Optional[asyncio.Task] = None
+
+        self.cycles = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_started: Optional[str] = None
+        self.last_duration: Optional[float] = None
+        self.last_states: List[str] = []
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._cycle is not None and not self._cycle.done()
+
+    def scrape_stale(self) -> List[str]:
+        """
+        Scrape and load the stale states, then refresh the read model.
+
+        Returns:
+            List[str]: The states that were scraped.
+        """
+        stale = self.storage.stale_states(self.states, self.stale_after)
+        if not stale:
+            logger.info("Scheduler: all states are fresh")
+            return []
+
+        logger.info(f"Scheduler: scraping stale states {', '.join(stale)}")
+        data = scraper.extract_transform_main(states=stale, max_concurrency=self.max_workers)
+        if not data.empty:
+            self.load(data)
+            self.read_model.refresh()
+        return stale
+
+    async def run_cycle(self) -> None:
+        """Run one scrape cycle in a worker thread and record its outcome."""
+        start_time = time.time()
+        self.last_started = datetime.now().isoformat(timespec="seconds")
+        try:
+            self.last_states = await asyncio.to_thread(self.scrape_stale)
+            self.last_error = None
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.exception(f"Scheduler: scrape cycle failed: {e}")
+        finally:
+            self.cycles += 1
+            self.last_duration = time.time() - start_time
+
+    def trigger(self) -> bool:
+        """
+        Start a cycle unless one is already running.
+
+        Returns:
+            bool: True if a cycle was started, False if it was skipped.
+        """
+        if self.running:
+            self.skipped += 1
+            logger.info("Scheduler: previous cycle still running, skipping")
+            return False
+
+        self._cycle = asyncio.create_task(self.run_cycle())
+        return True
+
+    async def _loop(self) -> None:
+        while True:
+            self.trigger()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the cadence loop on the running event loop."""
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the cadence loop and wait for a running cycle to finish."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._cycle:
+            await self._cycle
+            self._cycle = None
+
+    def metrics(self) -> dict:
+        """
+        Cycle counts and the outcome of the last cycle.
+
+        Returns:
+            dict: Metrics describing the scheduler.
+        """
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "stale_after_seconds": self.stale_after,
+            "cycles": self.cycles,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_started": self.last_started,
+            "last_duration_seconds": self.last_duration,
+            "last_states": self.last_states,
+            "last_error": self.last_error,
+        }
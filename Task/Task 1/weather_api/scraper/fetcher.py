@@ -0,0 +1,152 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://www.python-httpx.org/async/
+https://www.python-httpx.org/advanced/resource-limits/
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from weather_api.config import (
+    MAX_CONCURRENCY,
+    REQUESTS_PER_HOST_PER_SECOND,
+    REQUEST_TIMEOUT,
+)
+from weather_api.logger import logger
+from weather_api.utils.instrumentation import span
+
+
+class HostRateLimiter:
+    """Spaces out requests so that no host receives more than a fixed rate."""
+
+    def __init__(self, requests_per_second: float):
+        """
+        Args:
+            requests_per_second (float): Allowed requests per second per host.
+                A value of 0 or less disables rate limiting.
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host: str) -> None:
+        """
+        Sleep until the next request slot for the given host is available.
+
+        Args:
+            host (str): The host name the request is going to.
+        """
+        if not self.interval:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    semaphore: asyncio.Semaphore,
+    limiter: HostRateLimiter,
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[httpx.Response]:
+    """
+    Fetch a single page through the shared client.
+
+    Args:
+        client (httpx.AsyncClient): The shared client holding the connection pool.
+        url (str): The URL to fetch.
+        semaphore (asyncio.Semaphore): Bounds the number of requests in flight.
+        limiter (HostRateLimiter): Per-host rate limiter.
+        headers (Optional[Dict[str, str]]): Extra request headers, e.g. for a
+            conditional GET.
+
+    Returns:
+        Optional[httpx.Response]: The response (200 or 304), or None if the
+        request failed.
+    """
+    async with semaphore:
+        await limiter.wait(urlsplit(url).netloc)
+        try:
+            with span("fetch", url=url) as attributes:
+                response = await client.get(url, headers=headers)
+                attributes["status_code"] = response.status_code
+            if response.status_code not in (200, 304):
+                logger.error(f"Website not loading, Error: {response.status_code}")
+                return None
+            return response
+        except Exception as e:
+            logger.exception(f"An error occurred: {e}")
+            return None
+
+
+async def fetch_pages(
+    urls: Iterable[str],
+    max_concurrency: int = MAX_CONCURRENCY,
+    requests_per_second: float = REQUESTS_PER_HOST_PER_SECOND,
+    timeout: float = REQUEST_TIMEOUT,
+    headers: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Dict[str, Optional[httpx.Response]]:
+    """
+    Fetch many pages concurrently over a single connection pool.
+
+    Args:
+        urls (Iterable[str]): The URLs to fetch.
+        max_concurrency (int): Maximum number of requests in flight.
+        requests_per_second (float): Allowed requests per second per host.
+        timeout (float): Request timeout in seconds.
+        headers (Optional[Dict[str, Dict[str, str]]]): Extra request headers per URL.
+
+    Returns:
+        Dict[str, Optional[httpx.Response]]: Response for each URL (None on failure).
+    """
+    urls = list(urls)
+    headers = headers or {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = HostRateLimiter(requests_per_second)
+    limits = httpx.Limits(
+        max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+    )
+
+    async with httpx.AsyncClient(
+        limits=limits, timeout=timeout, follow_redirects=True
+    ) as client:
+        results = await asyncio.gather(
+            *(
+                fetch_page(client, url, semaphore, limiter, headers.get(url))
+                for url in urls
+            )
+        )
+
+    return dict(zip(urls, results))
+
+
+def fetch_all(urls: Iterable[str], **kwargs) -> Dict[str, Optional[httpx.Response]]:
+    """
+    Synchronous entry point for `fetch_pages`.
+
+    Args:
+        urls (Iterable[str]): The URLs to fetch.
+        **kwargs: Passed through to `fetch_pages`.
+
+    Returns:
+        Dict[str, Optional[httpx.Response]]: Response for each URL (None on failure).
+    """
+    return asyncio.run(fetch_pages(urls, **kwargs))
@@ -4,26 +4,267 @@ Email: adedoyinsamuel25@gmail.com
 Date: 21-02-2025
 
 https://blog.finxter.com/how-to-append-data-in-a-google-sheet-with-python/
+https://docs.gspread.org/en/latest/api/models/worksheet.html#gspread.worksheet.Worksheet.batch_update
 """
 
-from weather_api.utils.google_sheet_utils import connect_to_sheet
+import sys
+# set all depencies (module) part
+sys.path.append('../')
 
-def load_data_to_sheet(df, google_sheet_name, service_key_path):
+from typing import Dict, List, Tuple
+
+from gspread.utils import rowcol_to_a1
+
+from weather_api.config import SHEET_SYNC_MODE, SHEET_WRITE_CHUNK_SIZE
+from weather_api.utils.google_sheet_utils import connect_to_sheet, sheet_clients
+
+KEY_COLUMNS = ("state", "date", "time")
+
+
+def to_sheet_values(df) -> List[List]:
+    """
+    Convert a DataFrame to a list of lists (missing numbers become empty cells).
+    """
+    return df.astype(object).where(df.notna(), "").values.tolist()
+
+
+def chunks(items: List, size: int):
+    """Yield successive slices of `items` with at most `size` elements."""
+    for start in range(0, len(items), size):
+        yield items[start: start + size]
+
+
+def same_value(old, new) -> bool:
+    """
+    Compare a cell read back from the sheet with a value about to be written.
+
+    The sheet returns every cell as text, so numbers are compared numerically
+    (27 and 27.0 are the same cell).
+    """
+    if str(old) == str(new):
+        return True
+    try:
+        return float(old) == float(new)
+    except (TypeError, ValueError):
+        return False
+
+
+class SheetSnapshot:
+    """
+    Cached copy of a worksheet's values, indexed by (state, date, time).
+    """
+
+    def __init__(self, values: List[List[str]]):
+        """
+        Args:
+            values (List[List[str]]): All cell values, header row first.
+        """
+        self.header = list(values[0]) if values else []
+        self.row_count = len(values)
+        self.rows: Dict[Tuple[str, str, str], Tuple[int, List[str]]] = {}
+
+        if set(KEY_COLUMNS).issubset(self.header):
+            positions = [self.header.index(column) for column in KEY_COLUMNS]
+            for row_number, row in enumerate(values[1:], start=2):
+                row = row + [""] * (len(self.header) - len(row))
+                key = tuple(str(row[i]).lower() for i in positions)
+                # keep the first copy when older appends left duplicates
+                self.rows.setdefault(key, (row_number, row))
+
+    def key_ranges(self) -> List[str]:
+        """A1 ranges of the key columns (e.g. "C:C"), header included."""
+        letters = [rowcol_to_a1(1, self.header.index(column) + 1)[:-1] for column in KEY_COLUMNS]
+        return [f"{letter}:{letter}" for letter in letters]
+
+    def matches(self, key_columns: List[List[str]]) -> bool:
+        """
+        Check that the sheet still has the rows this snapshot expects.
+
+        Args:
+            key_columns (List[List[str]]): Current cells of the key columns
+                (`key_ranges`), header first, as read from the sheet.
+
+        Returns:
+            bool: False when rows were added, removed or moved by another
+            writer, so cached row numbers would point at the wrong rows.
+        """
+        if [column[0] if column else "" for column in key_columns] != list(KEY_COLUMNS):
+            return False
+        row_count = max(len(column) for column in key_columns)
+        if row_count != self.row_count:
+            return False
+
+        def key_at(row_number):
+            return tuple(
+                str(column[row_number - 1]).lower() if row_number - 1 < len(column) else ""
+                for column in key_columns
+            )
+
+        return all(key_at(row_number) == key for key, (row_number, _) in self.rows.items())
+
+    def diff(self, columns: List[str], data: List[List]) -> Tuple[List[dict], List[List]]:
+        """
+        Work out which cells to update and which rows to append.
+
+        Args:
+            columns (List[str]): Column names of `data`.
+            data (List[List]): Rows to sync.
+
+        Returns:
+            Tuple[List[dict], List[List]]: `batch_update` ranges for changed
+            rows, and rows whose key is not in the sheet yet (in header order).
+        """
+        header = self.header or list(columns)
+        source = [columns.index(name) if name in columns else None for name in header]
+        positions = [header.index(column) for column in KEY_COLUMNS]
+
+        updates, appends = [], []
+        for values in data:
+            row = [values[i] if i is not None else "" for i in source]
+            key = tuple(str(row[i]).lower() for i in positions)
+
+            if key not in self.rows:
+                appends.append(row)
+                self.rows[key] = (self.row_count + len(appends), row)
+                continue
+
+            row_number, old_row = self.rows[key]
+            # columns missing from `data` keep what the sheet already has
+            row = [
+                new if source[col] is not None else old
+                for col, (old, new) in enumerate(zip(old_row, row))
+            ]
+            changed = [
+                col for col, (old, new) in enumerate(zip(old_row, row))
+                if not same_value(old, new)
+            ]
+            if changed:
+                first, last = changed[0], changed[-1]
+                updates.append({
+                    "range": f"{rowcol_to_a1(row_number, first + 1)}:{rowcol_to_a1(row_number, last + 1)}",
+                    "values": [row[first: last + 1]],
+                })
+                self.rows[key] = (row_number, row)
+
+        self.row_count += len(appends)
+        return updates, appends
+
+
+def sheet_payload(snapshot: SheetSnapshot, df) -> Tuple[List[dict], List[List]]:
+    """
+    Convert a DataFrame to sheet values and diff it against a snapshot.
+
+    Returns:
+        Tuple[List[dict], List[List]]: `batch_update` ranges and rows to append
+        (see `SheetSnapshot.diff`).
+    """
+    return snapshot.diff(list(df.columns), to_sheet_values(df))
+
+
+# Cached sheet snapshots, keyed by (service key path, sheet name)
+_snapshots: Dict[Tuple[str, str], SheetSnapshot] = {}
+
+
+def sync_data_to_sheet(df, google_sheet_name, service_key_path, refresh_snapshot=False):
+    """
+    Upsert a DataFrame into a Google Sheet keyed by (state, date, time).
+
+    Only cells that differ from the cached snapshot of the sheet are sent
+    with `batch_update`, and only new keys are appended. Both are sent in
+    chunks of `SHEET_WRITE_CHUNK_SIZE` to stay under the API request limits.
+
+    Before each sync the key columns are read back and compared with the
+    snapshot; if another writer (or a manual edit) added, removed or moved
+    rows, the whole sheet is read again so no update lands on the wrong row.
+    Edits to non-key cells are not detected and may be left as they are.
+
+    Args:
+        df (pd.DataFrame): The DataFrame containing data.
+        google_sheet_name (str): Name of the Google Sheet.
+        service_key_path (str): Path to the service account key file.
+        refresh_snapshot (bool): Re-read the sheet instead of using the cached snapshot.
+
+    Returns:
+        Tuple[int, int]: Number of updated and appended rows.
+    """
+    key = (service_key_path, google_sheet_name)
+    sheet = connect_to_sheet(google_sheet_name, service_key_path)
+
+    try:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and not refresh_snapshot:
+            if not snapshot.header:
+                # nothing to compare against, and an empty sheet is cheap to read
+                snapshot = None
+            else:
+                with sheet_clients.timed("data"):
+                    ranges = sheet.batch_get(snapshot.key_ranges(), major_dimension="COLUMNS")
+                if not snapshot.matches([value_range[0] if value_range else [] for value_range in ranges]):
+                    print(f"{google_sheet_name} changed since the last sync, reading it again")
+                    snapshot = None
+
+        if snapshot is None or refresh_snapshot:
+            with sheet_clients.timed("data"):
+                snapshot = SheetSnapshot(sheet.get_all_values())
+            _snapshots[key] = snapshot
+
+        if not snapshot.header:
+            with sheet_clients.timed("data"):
+                sheet.append_rows([list(df.columns)], value_input_option="RAW")
+            snapshot.header = list(df.columns)
+            snapshot.row_count = 1
+
+        updates, appends = sheet_payload(snapshot, df)
+
+        with sheet_clients.timed("data"):
+            for batch in chunks(updates, SHEET_WRITE_CHUNK_SIZE):
+                sheet.batch_update(batch, value_input_option="RAW")
+            for batch in chunks(appends, SHEET_WRITE_CHUNK_SIZE):
+                sheet.append_rows(batch, value_input_option="RAW")
+    except Exception:
+        # the snapshot may no longer match the sheet
+        _snapshots.pop(key, None)
+        raise
+
+    return len(updates), len(appends)
+
+
+def write_data_to_sheet(df, google_sheet_name, service_key_path, mode=SHEET_SYNC_MODE):
+    """
+    Write a DataFrame to a Google Sheet, raising on failure.
+
+    Args:
+        df (pd.DataFrame): The DataFrame containing data.
+        google_sheet_name (str): Name of the Google Sheet.
+        service_key_path (str): Path to the service account key file.
+        mode (str): "upsert" to sync by (state, date, time), "append" to append every row.
     """
-    Loads data from a Pandas DataFrame and appends it to a Google Sheet.
+    if mode == "upsert":
+        updated, appended = sync_data_to_sheet(df, google_sheet_name, service_key_path)
+        print(f"Data synced successfully! {updated} rows updated, {appended} rows appended")
+        return
+
+    sheet = connect_to_sheet(google_sheet_name,service_key_path)
+    data = to_sheet_values(df)
+
+    # Batch update
+    with sheet_clients.timed("data"):
+        for batch in chunks(data, SHEET_WRITE_CHUNK_SIZE):
+            sheet.append_rows(batch, value_input_option="RAW")
+
+    print("Data appended successfully!")
+
+
+def load_data_to_sheet(df, google_sheet_name, service_key_path, mode=SHEET_SYNC_MODE):
+    """
+    Loads data from a Pandas DataFrame into a Google Sheet.
     Parameters:
     - df (pd.DataFrame): The DataFrame containing data.
     - google_sheet_name (str): Name of the Google Sheet.
-    - worksheet_index (int): Index of the worksheet (default is the first sheet).
+    - service_key_path (str): Path to the service account key file.
+    - mode (str): "upsert" to sync by (state, date, time), "append" to append every row.
     """
     try:
-        sheet = connect_to_sheet(google_sheet_name,service_key_path)
-        # Convert DataFrame to list of lists
-        data = df.values.tolist()
-
-        # Batch update
-        sheet.append_rows(data, value_input_option="RAW")
-
-        print("Data appended successfully!")
+        write_data_to_sheet(df, google_sheet_name, service_key_path, mode)
     except Exception as e:
-        print(f"An Error  occured: {e}")
\ No newline at end of file
+        print(f"An Error  occured: {e}")
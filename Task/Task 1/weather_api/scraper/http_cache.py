@@ -0,0 +1,205 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Conditional_requests
+
+On-disk cache for timeanddate forecast pages. Each entry is keyed by the page
+URL and stores the ETag/Last-Modified validators together with the parsed
+rows, so a fresh hit or a 304 response skips both the download and the parse.
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from weather_api.config import (
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_ENTRIES,
+    HTTP_CACHE_TTL_BY_DAY,
+)
+from weather_api.logger import logger
+
+
+def days_ahead(date: str) -> int:
+    """
+    Number of days between today and a forecast date.
+
+    Args:
+        date (str): The forecast date in 'YYYYMMDD' format.
+
+    Returns:
+        int: 0 for today, 1 for tomorrow, and so on (never negative).
+    """
+    forecast_date = datetime.strptime(date, "%Y%m%d").date()
+    return max((forecast_date - datetime.today().date()).days, 0)
+
+
+class PageCache:
+    """
+    LRU-capped, on-disk cache of forecast pages keyed by URL.
+
+    Recency is tracked through the modification time of each entry file, so
+    the cache needs no separate index and survives restarts.
+    """
+
+    def __init__(
+        self,
+        directory: str = HTTP_CACHE_DIR,
+        max_entries: int = HTTP_CACHE_MAX_ENTRIES,
+        ttl_by_day: List[int] = HTTP_CACHE_TTL_BY_DAY,
+    ):
+        """
+        Args:
+            directory (str): Folder holding the cache entries.
+            max_entries (int): Maximum number of pages kept on disk.
+            ttl_by_day (List[int]): Seconds an entry stays fresh, indexed by
+                how many days ahead the forecast is. The last value is used
+                for anything further out.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl_by_day = ttl_by_day
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def ttl(self, date: str) -> int:
+        """
+        Time-to-live in seconds for a forecast date ('YYYYMMDD').
+        """
+        return self.ttl_by_day[min(days_ahead(date), len(self.ttl_by_day) - 1)]
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Read a cache entry and mark it as recently used.
+
+        Args:
+            url (str): The page URL.
+
+        Returns:
+            Optional[Dict]: The entry, or None if the URL is not cached.
+        """
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.exception(f"An error occurred reading cache entry for {url}: {e}")
+            return None
+
+    def is_fresh(self, entry: Dict, date: str) -> bool:
+        """
+        Check whether an entry can be used without contacting the server.
+
+        Args:
+            entry (Dict): The cache entry.
+            date (str): The forecast date in 'YYYYMMDD' format.
+
+        Returns:
+            bool: True if the entry is younger than the TTL for that date.
+        """
+        return time.time() - entry["fetched_at"] < self.ttl(date)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers from an entry.
+
+        Args:
+            entry (Optional[Dict]): The cache entry, if any.
+
+        Returns:
+            Dict[str, str]: Request headers for a conditional GET.
+        """
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        rows: List[List[str]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Store the parsed rows of a page along with its validators.
+
+        Args:
+            url (str): The page URL.
+            rows (List[List[str]]): The parsed table rows.
+            etag (Optional[str]): The ETag response header.
+            last_modified (Optional[str]): The Last-Modified response header.
+        """
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "rows": rows,
+        }
+        path = self._path(url)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+            self._evict()
+        except Exception as e:
+            logger.exception(f"An error occurred writing cache entry for {url}: {e}")
+
+    def refresh(self, url: str, entry: Dict) -> None:
+        """
+        Restart the TTL of an entry after the server answered 304.
+
+        Args:
+            url (str): The page URL.
+            entry (Dict): The cache entry that was revalidated.
+        """
+        self.put(url, entry["rows"], entry.get("etag"), entry.get("last_modified"))
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries beyond `max_entries`."""
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+        if len(paths) <= self.max_entries:
+            return
+
+        paths.sort(key=os.path.getmtime)
+        for path in paths[: len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def log_stats(self) -> None:
+        """Write the hit/miss counts of this run to the log."""
+        logger.info(
+            f"HTTP cache: {self.hits} hits, {self.revalidated} revalidated (304), "
+            f"{self.misses} misses"
+        )
@@ -0,0 +1,200 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://lxml.de/lxmlhtml.html
+https://lxml.de/xpathxslt.html
+
+Parser backends for the timeanddate hourly table. Every backend returns the
+same rows, built by `clean_row`, so they can be swapped through
+`config.PARSER_BACKEND` without changing the output.
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from weather_api.logger import logger
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+COLUMNS = [
+    "time",
+    "temp_C",
+    "weather",
+    "feels_C",
+    "wind_km/h",
+    "wind_direction",
+    "humidity_%",
+    "precipitation_chance_%",
+    "precipitation_amount",
+]
+
+TABLE_ID = "wt-hbh"
+
+
+def clean_row(timeline: str, cells: List[str], wind_direction: str) -> List[str]:
+    """
+    Turn the raw text of one table row into the scraper's column values.
+
+    Args:
+        timeline (str): Text of the row header (time of day).
+        cells (List[str]): Text of the nine data cells.
+        wind_direction (str): Wind direction read from the arrow's title.
+
+    Returns:
+        List[str]: Values in `COLUMNS` order.
+    """
+    return [
+        timeline.strip()[:5],
+        cells[1].strip().split("°C")[0],
+        cells[2].strip(),
+        cells[3].strip().split("°C")[0],
+        cells[4].strip().split(" ")[0],
+        wind_direction,
+        cells[6].strip(),
+        cells[7].strip(),
+        cells[8].strip(),
+    ]
+
+
+def parse_table(content: bytes) -> Any:
+    """
+    Parse a forecast page and return the hourly weather table.
+
+    Args:
+        content (bytes): The raw HTML of the page.
+
+    Returns:
+        Any: The extracted HTML table element.
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    return soup.find("table", id=TABLE_ID)
+
+
+def get_wind_direction(data: List[Any]) -> str:
+    """
+    Extract wind direction from an HTML element.
+
+    Args:
+        data (List[Any]): The HTML data containing wind direction information.
+
+    Returns:
+        str: The extracted wind direction or an empty string if not found.
+    """
+    try:
+        str_data = str(data)
+        match = re.search(r'title="(.*?)"', str_data)
+        return match.group(1) if match else ""
+    except Exception as e:
+        logger.exception("An error occurred",{e})
+        return ""
+
+
+def bs4_rows(content: bytes) -> Optional[List[List[str]]]:
+    """
+    Extract table rows with BeautifulSoup and the pure-Python html.parser.
+
+    Args:
+        content (bytes): The raw HTML of the page.
+
+    Returns:
+        Optional[List[List[str]]]: The cleaned rows, or None if the table is missing.
+    """
+    html_table = parse_table(content)
+    if html_table is None:
+        return None
+
+    rows = []
+    for row in html_table.find_all("tr"):
+        cells = row.find_all("td")
+        timeline = row.find_all("th")
+
+        if len(cells) == 9:
+            rows.append(
+                clean_row(
+                    timeline[0].text,
+                    [cell.text for cell in cells],
+                    get_wind_direction(cells[5]),
+                )
+            )
+    return rows
+
+
+def lxml_rows(content: bytes) -> Optional[List[List[str]]]:
+    """
+    Extract table rows with lxml, walking only the `#wt-hbh` table.
+
+    The wind direction is read straight from the first `title` attribute in
+    the wind cell instead of serialising the cell and running a regex.
+
+    Args:
+        content (bytes): The raw HTML of the page.
+
+    Returns:
+        Optional[List[List[str]]]: The cleaned rows, or None if the table is missing.
+    """
+    if isinstance(content, bytes):
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        document = lxml.html.document_fromstring(content, parser=parser)
+    else:
+        document = lxml.html.document_fromstring(content)
+
+    tables = document.xpath(f'//table[@id="{TABLE_ID}"]')
+    if not tables:
+        return None
+
+    rows = []
+    for row in tables[0].iter("tr"):
+        cells = row.xpath(".//td")
+        timeline = row.xpath(".//th")
+
+        if len(cells) == 9:
+            rows.append(
+                clean_row(
+                    timeline[0].text_content(),
+                    [cell.text_content() for cell in cells],
+                    cells[5].xpath("string((.//@title)[1])"),
+                )
+            )
+    return rows
+
+
+PARSERS: Dict[str, Callable[[bytes], Optional[List[List[str]]]]] = {
+    "bs4": bs4_rows,
+    "lxml": lxml_rows,
+}
+
+
+def get_parser(name: str) -> Callable[[bytes], Optional[List[List[str]]]]:
+    """
+    Look up a parser backend by name.
+
+    Falls back to the BeautifulSoup backend when lxml is not installed.
+
+    Args:
+        name (str): Backend name, one of `PARSERS`.
+
+    Returns:
+        Callable: Function taking page content and returning cleaned rows.
+    """
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser backend: {name}. Use one of {', '.join(PARSERS)}")
+
+    if name == "lxml" and not HAS_LXML:
+        logger.warning("lxml is not installed, falling back to the bs4 parser")
+        return bs4_rows
+
+    return PARSERS[name]
@@ -0,0 +1,88 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://pandas.pydata.org/docs/reference/api/pandas.to_numeric.html
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+
+from typing import Dict, List
+
+import pandas as pd
+
+from weather_api.scraper.parsers import COLUMNS
+
+
+# Final column layout and dtype of the scraped data, declared up front
+SCHEMA: Dict[str, str] = {
+    "time": "object",
+    "temp_C": "float64",
+    "weather": "object",
+    "feels_C": "float64",
+    "wind_km/h": "float64",
+    "wind_direction": "object",
+    "humidity_%": "float64",
+    "precipitation_chance_%": "float64",
+    "precipitation_amount": "object",
+    "state": "object",
+    "url": "object",
+    "date": "object",
+}
+
+NUMERIC_COLUMNS = [name for name, dtype in SCHEMA.items() if dtype == "float64"]
+
+
+class WeatherRecords:
+    """
+    Growable column store that every scraped page writes its rows into.
+
+    Rows are appended column by column into plain lists, and the DataFrame is
+    built once in `to_frame`, where the numeric columns are converted in a
+    single vectorized pass.
+    """
+
+    def __init__(self):
+        """Create one empty column per entry in `SCHEMA`."""
+        self.columns: Dict[str, List] = {name: [] for name in SCHEMA}
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def add_page(self, rows: List[List[str]], state: str, url: str, date: str) -> None:
+        """
+        Append the rows of one forecast page.
+
+        Args:
+            rows (List[List[str]]): Cleaned rows in `parsers.COLUMNS` order.
+            state (str): The state capital the page belongs to.
+            url (str): The page URL.
+            date (str): The forecast date in 'YYYY-MM-DD' format.
+        """
+        for name, values in zip(COLUMNS, zip(*rows)):
+            self.columns[name].extend(values)
+
+        self.columns["state"].extend([state] * len(rows))
+        self.columns["url"].extend([url] * len(rows))
+        self.columns["date"].extend([date] * len(rows))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build the final DataFrame.
+
+        Returns:
+            pd.DataFrame: All accumulated rows, typed according to `SCHEMA`.
+        """
+        if not len(self):
+            return pd.DataFrame()
+
+        df = pd.DataFrame(self.columns, columns=list(SCHEMA))
+        numeric = df[NUMERIC_COLUMNS].apply(
+            lambda column: column.str.replace("%", "", regex=False).str.strip()
+        )
+        df[NUMERIC_COLUMNS] = numeric.apply(pd.to_numeric, errors="coerce")
+        return df.astype(SCHEMA)
@@ -13,17 +13,33 @@ import sys
 sys.path.append('../')
 
 
-import re
 from typing import Any, List
 from datetime import datetime
 from datetime import timedelta
 import html
 import time
-from weather_api.config import STATES,URL
+from weather_api.config import (
+    STATES,
+    URL,
+    MAX_CONCURRENCY,
+    REQUESTS_PER_HOST_PER_SECOND,
+    PARSER_BACKEND,
+    HTTP_CACHE_ENABLED,
+)
 from weather_api.logger import logger
+from weather_api.scraper.fetcher import fetch_all
+from weather_api.scraper.http_cache import PageCache
+from weather_api.scraper.parsers import (
+    COLUMNS,
+    clean_row,
+    get_parser,
+    get_wind_direction,
+    parse_table,
+)
+from weather_api.scraper.records import WeatherRecords
+from weather_api.utils.instrumentation import span, timed
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 
 
@@ -80,30 +96,11 @@ def extract_data(url: str) -> Any:
             logger.error(f"Website not loading, Error: {response.status_code}")
             return None
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        return soup.find("table", id="wt-hbh")
+        return parse_table(response.content)
     except Exception as e:
         logger.exception(f"An error occurred: {e}")
         return None
 
-def get_wind_direction(data: List[Any]) -> str:
-    """
-    Extract wind direction from an HTML element.
-
-    Args:
-        data (List[Any]): The HTML data containing wind direction information.
-
-    Returns:
-        str: The extracted wind direction or an empty string if not found.
-    """
-    try:
-        str_data = str(data)
-        match = re.search(r'title="(.*?)"', str_data)
-        return match.group(1) if match else ""
-    except Exception as e:
-        logger.exception("An error occurred",{e})
-        return ""
-
 def transform_data(html_table:html, helper_function=None) -> pd.DataFrame:
     """
     Transform extracted HTML table data into a structured Pandas DataFrame.
@@ -115,75 +112,129 @@ def transform_data(html_table:html, helper_function=None) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing processed weather data.
     """
-    time_list = []
-    temp  = []
-    weather  = []
-    feels  = []
-    wind  = []
-    wind_dir  = []
-    humidity  = []
-    chance  = []
-    amount  = []
-
     try:
+        rows = []
         for row in html_table.find_all("tr"):
             cells = row.find_all("td")
             timeline = row.find_all("th")
 
             if len(cells) == 9:
-                time_list.append(timeline[0].text.strip()[:5])
-                temp.append(cells[1].text.strip().split("°C")[0])
-                weather.append(cells[2].text.strip())
-                feels.append(cells[3].text.strip().split("°C")[0])
-                wind.append(cells[4].text.strip().split(" ")[0])
-                wind_dir.append(helper_function(cells[5]) if helper_function else "")
-                humidity.append(cells[6].text.strip())
-                chance.append(cells[7].text.strip())
-                amount.append(cells[8].text.strip())
-
-        data_dict = {
-            "time": time_list,
-            "temp_C": temp,
-            "weather": weather,
-            "feels_C": feels,
-            "wind_km/h": wind,
-            "wind_direction": wind_dir,
-            "humidity_%": humidity,
-            "precipitation_chance_%": chance,
-            "precipitation_amount": amount,
-        }
-
-        return pd.DataFrame(data_dict)
+                rows.append(
+                    clean_row(
+                        timeline[0].text,
+                        [cell.text for cell in cells],
+                        helper_function(cells[5]) if helper_function else "",
+                    )
+                )
+
+        return pd.DataFrame(rows, columns=COLUMNS)
     except Exception as e:
         logger.exception("An error occurred",{e})
         return pd.DataFrame()
 
-def extract_transform_main() -> pd.DataFrame:
+@timed("scrape")
+def extract_transform_main(
+    states: List[str] = None,
+    max_concurrency: int = MAX_CONCURRENCY,
+    requests_per_second: float = REQUESTS_PER_HOST_PER_SECOND,
+    backend: str = PARSER_BACKEND,
+    use_cache: bool = HTTP_CACHE_ENABLED,
+) -> pd.DataFrame:
     """
     Main function to extract and transform weather data for multiple states and dates.
 
+    All pages are fetched concurrently first, then parsed in date/state order
+    so the result matches the sequential scrape row for row. Every page writes
+    its rows into one `WeatherRecords` store and the DataFrame is built once.
+
+    With the page cache enabled, pages still within their TTL are not
+    requested at all, and expired ones are revalidated with a conditional GET;
+    a 304 reuses the cached rows without parsing.
+
+    Args:
+        states (List[str], optional): State capitals to scrape (defaults to `config.STATES`).
+        max_concurrency (int): Maximum number of requests in flight.
+        requests_per_second (float): Allowed requests per second to timeanddate.com.
+        backend (str): Parser backend name (see `scraper.parsers.PARSERS`).
+        use_cache (bool): Whether to use the on-disk page cache.
+
     Returns:
         pd.DataFrame: A DataFrame containing processed weather data for all states and dates.
     """
     start_time = time.time()
     logger.info(f"Start time: {datetime.now()}")
 
-    all_data = []  # List to store processed data
-
-    for date in generate_7days_dates():
-        for state in STATES:
-            url = get_full_url(url=URL, state=state, date=date)
-            raw_data = extract_data(url)
-
-            if raw_data:
-                processed_data = transform_data(raw_data, get_wind_direction)
-                processed_data["state"] = state
-                processed_data["url"] = url
-                processed_data["date"] = datetime.strptime(date, "%Y%m%d").strftime("%Y-%m-%d")
-                all_data.append(processed_data)
-
-    # Combine all data into a single DataFrame
-    final_data = pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
+    records = WeatherRecords()  # Column store shared by every page
+    parse_rows = get_parser(backend)
+
+    pages = [
+        (date, state, get_full_url(url=URL, state=state, date=date))
+        for date in generate_7days_dates()
+        for state in (states or STATES)
+    ]
+    cache = PageCache() if use_cache else None
+    cached = {}  # url -> cache entry
+    fresh = set()  # urls served from the cache without a request
+
+    if cache:
+        for date, _, url in pages:
+            entry = cache.get(url)
+            if entry:
+                cached[url] = entry
+                if cache.is_fresh(entry, date):
+                    fresh.add(url)
+
+    with span("fetch_all", pages=len(pages), cached=len(fresh)):
+        responses = fetch_all(
+            [url for _, _, url in pages if url not in fresh],
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            headers={url: PageCache.conditional_headers(entry) for url, entry in cached.items()},
+        )
+
+    for date, state, url in pages:
+        if url in fresh:
+            cache.hits += 1
+            rows = cached[url]["rows"]
+        else:
+            response = responses.get(url)
+            if response is None:
+                continue
+
+            if response.status_code == 304 and url in cached:
+                cache.revalidated += 1
+                rows = cached[url]["rows"]
+                cache.refresh(url, cached[url])
+            else:
+                try:
+                    with span("parse", labels={"backend": backend}, url=url):
+                        rows = parse_rows(response.content)
+                except Exception as e:
+                    logger.exception(f"An error occurred: {e}")
+                    continue
+
+                if cache and rows is not None:
+                    cache.misses += 1
+                    cache.put(
+                        url,
+                        rows,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+
+        if rows is not None:
+            with span("transform", url=url):
+                records.add_page(
+                    rows, state, url, datetime.strptime(date, "%Y%m%d").strftime("%Y-%m-%d")
+                )
+
+    if cache:
+        cache.log_stats()
+
+    # Build the final DataFrame once from the column store
+    with span("to_frame") as attributes:
+        final_data = records.to_frame()
+        attributes["rows"] = len(final_data)
 
     end_time = time.time()
     logger.info(f"End time: {datetime.now()}")
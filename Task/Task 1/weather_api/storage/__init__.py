@@ -0,0 +1,32 @@
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+from weather_api.config import (
+    STORAGE_BACKEND,
+    SQLITE_PATH,
+    GOOGLE_SHEET_NAME,
+    SERVICE_KEY_PATH,
+)
+from weather_api.storage.base import WeatherStorage
+
+
+def get_storage(backend: str = STORAGE_BACKEND) -> WeatherStorage:
+    """
+    Create the weather store selected in `config.STORAGE_BACKEND`.
+
+    Args:
+        backend (str): "sqlite" or "sheets".
+
+    Returns:
+        WeatherStorage: The configured store.
+    """
+    if backend == "sqlite":
+        from weather_api.storage.sqlite import SQLiteStorage
+        return SQLiteStorage(SQLITE_PATH)
+
+    if backend == "sheets":
+        from weather_api.storage.sheets import GoogleSheetStorage
+        return GoogleSheetStorage(GOOGLE_SHEET_NAME, SERVICE_KEY_PATH)
+
+    raise ValueError(f"Unknown storage backend: {backend}. Use 'sqlite' or 'sheets'")
@@ -0,0 +1,216 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://arrow.apache.org/docs/python/dataset.html
+
+Append-only archive of every scraped forecast snapshot, written as Parquet
+and partitioned by state and forecast date (hive layout,
+`state=kano/date=2025-02-21/...`). Scans prune partitions and push the
+remaining filters down to the Parquet reader.
+
+Every scrape adds one small file to each partition it covers. Once a date is
+in the past no scrape writes to it again, so its partition is compacted into
+a single file.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import os
+from datetime import date, datetime
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from weather_api.logger import logger
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("state", pa.string()), ("date", pa.string())]), flavor="hive"
+)
+
+# file a closed partition is compacted into
+COMPACTED_FILE = "compacted.parquet"
+
+COMPARE_COLUMNS = ["temp_C", "feels_C", "wind_km/h", "humidity_%", "precipitation_chance_%"]
+
+
+class WeatherArchive:
+    """
+    Time-partitioned Parquet history of scraped forecasts.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): Folder holding the partitioned dataset.
+        """
+        self.root = root
+
+    def append(self, df: pd.DataFrame, scraped_at: Optional[datetime] = None) -> None:
+        """
+        Add one scrape to the archive without touching earlier snapshots.
+
+        Args:
+            df (pd.DataFrame): The scraped weather data.
+            scraped_at (Optional[datetime]): Scrape time (defaults to now).
+        """
+        if df.empty:
+            return
+
+        scraped_at = scraped_at or datetime.now()
+        df = df.assign(scraped_at=scraped_at.isoformat(timespec="seconds"))
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            self.root,
+            format="parquet",
+            partitioning=PARTITIONING,
+            # a new file name per scrape keeps the archive append-only
+            basename_template=f"{scraped_at.strftime('%Y%m%dT%H%M%S%f')}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        logger.info(f"Archived {len(df)} rows scraped at {scraped_at}")
+
+        self.compact(before=scraped_at.date())
+
+    def compact(self, before: Optional[date] = None) -> int:
+        """
+        Rewrite every closed date partition that holds several files as one file.
+
+        A partition is closed once its date is before `before` (today by
+        default): later scrapes only cover today and the days after. The
+        compacted file is renamed into place before the small files are
+        removed, so a scan running at the same time may see a partition's
+        rows twice, but never misses them.
+
+        Args:
+            before (Optional[date]): First date that is still open.
+
+        Returns:
+            int: Number of partitions compacted.
+        """
+        if not os.path.isdir(self.root):
+            return 0
+
+        before = (before or date.today()).isoformat()
+        compacted = 0
+        for state_dir in os.listdir(self.root):
+            state_path = os.path.join(self.root, state_dir)
+            if not state_dir.startswith("state=") or not os.path.isdir(state_path):
+                continue
+            for date_dir in os.listdir(state_path):
+                if not date_dir.startswith("date=") or date_dir[len("date="):] >= before:
+                    continue
+                if self._compact_partition(os.path.join(state_path, date_dir)):
+                    compacted += 1
+        return compacted
+
+    def _compact_partition(self, path: str) -> bool:
+        """Merge the Parquet files of one partition folder; False if there was nothing to do."""
+        files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.endswith(".parquet") and not name.startswith((".", "_"))
+        )
+        if len(files) < 2:
+            return False
+
+        # files written by different scrapes may type an all-empty column differently
+        schema = pa.unify_schemas([pq.read_schema(file) for file in files], promote_options="permissive")
+        table = ds.dataset(files, schema=schema, format="parquet").to_table()
+        sort_keys = [(column, "ascending") for column in ("scraped_at", "time") if column in schema.names]
+        table = table.sort_by(sort_keys)
+
+        # the leading underscore hides the file from scans until it is renamed
+        tmp_path = os.path.join(path, f"_{COMPACTED_FILE}")
+        target = os.path.join(path, COMPACTED_FILE)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, target)
+        for file in files:
+            if file != target:
+                os.remove(file)
+        logger.info(f"Compacted {len(files)} files in {path}")
+        return True
+
+    def scan(
+        self,
+        states: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        start_hour: Optional[str] = None,
+        end_hour: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Read every archived snapshot that matches the filters.
+
+        Args:
+            states (Optional[List[str]]): State capitals to keep.
+            start_date (Optional[str]): First forecast date, 'YYYY-MM-DD'.
+            end_date (Optional[str]): Last forecast date, 'YYYY-MM-DD'.
+            start_hour (Optional[str]): First hour, 'HH:00'.
+            end_hour (Optional[str]): Last hour, 'HH:00'.
+
+        Returns:
+            pd.DataFrame: Matching rows, one per (snapshot, state, date, time).
+        """
+        try:
+            dataset = ds.dataset(self.root, format="parquet", partitioning=PARTITIONING)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+        conditions = []
+        if states:
+            conditions.append(ds.field("state").isin([state.lower().strip() for state in states]))
+        if start_date:
+            conditions.append(ds.field("date") >= start_date)
+        if end_date:
+            conditions.append(ds.field("date") <= end_date)
+        if start_hour:
+            conditions.append(ds.field("time") >= start_hour)
+        if end_hour:
+            conditions.append(ds.field("time") <= end_hour)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(filter=expression).to_pandas()
+
+    def forecast_vs_actual(self, **filters) -> pd.DataFrame:
+        """
+        Compare the earliest forecast for each hour with the latest one.
+
+        The latest snapshot of an hour is scraped closest to (or on) the day
+        itself, so it stands in for the actual weather.
+
+        Args:
+            **filters: Passed to `scan`.
+
+        Returns:
+            pd.DataFrame: One row per (state, date, time) with the first and
+            last forecast, how many days ahead the first one was made, and the
+            error of each compared column.
+        """
+        data = self.scan(**filters)
+        if data.empty:
+            return data
+
+        data = data.sort_values("scraped_at")
+        keys = ["state", "date", "time"]
+        columns = ["scraped_at"] + [col for col in COMPARE_COLUMNS if col in data.columns]
+
+        grouped = data.groupby(keys, sort=True)[columns]
+        first = grouped.first().add_prefix("forecast_")
+        last = grouped.last().add_prefix("actual_")
+        result = first.join(last).reset_index()
+
+        result["lead_days"] = (
+            pd.to_datetime(result["date"])
+            - pd.to_datetime(result["forecast_scraped_at"]).dt.normalize()
+        ).dt.days
+        for col in columns[1:]:
+            result[f"{col}_error"] = result[f"forecast_{col}"] - result[f"actual_{col}"]
+        return result
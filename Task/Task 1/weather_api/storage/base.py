@@ -0,0 +1,87 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://docs.python.org/3/library/abc.html
+"""
+
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+import pandas as pd
+
+from weather_api.storage.freshness import covers, staleness as compute_staleness
+
+
+class WeatherStorage(ABC):
+    """
+    Interface every weather data store implements.
+    """
+
+    @abstractmethod
+    def save(self, df: pd.DataFrame) -> None:
+        """
+        Write scraped weather data, replacing rows with the same (state, date, time).
+
+        The freshness record of every state in `df` is updated in the same write.
+
+        Args:
+            df (pd.DataFrame): The scraped weather data.
+        """
+
+    @abstractmethod
+    def load(self) -> pd.DataFrame:
+        """
+        Read every weather record.
+
+        Returns:
+            pd.DataFrame: All stored records.
+        """
+
+    @abstractmethod
+    def freshness(self) -> Dict[str, dict]:
+        """
+        Read the freshness metadata only.
+
+        Returns:
+            Dict[str, dict]: Freshness record for each state (see `storage.freshness`).
+        """
+
+    def has_date(self, date: str) -> bool:
+        """
+        Check whether the last load of any state covered a date.
+
+        Args:
+            date (str): Date in 'YYYY-MM-DD' format.
+
+        Returns:
+            bool: True if data for that date has been loaded.
+        """
+        return covers(self.freshness(), date)
+
+    def staleness(self, states: List[str], max_age_seconds: float) -> Dict[str, dict]:
+        """
+        Age of every state's data and whether it needs a re-scrape.
+
+        Args:
+            states (List[str]): The states that should be present.
+            max_age_seconds (float): Age after which a state is stale.
+
+        Returns:
+            Dict[str, dict]: For each state: loaded_at, age_seconds and stale.
+        """
+        return compute_staleness(self.freshness(), states, max_age_seconds)
+
+    def stale_states(self, states: List[str], max_age_seconds: float) -> List[str]:
+        """
+        The states whose data is missing or older than `max_age_seconds`.
+        """
+        return [
+            state for state, entry in self.staleness(states, max_age_seconds).items()
+            if entry["stale"]
+        ]
@@ -0,0 +1,95 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+Freshness metadata: one small record per state saying when it was last
+loaded and which forecast dates that load covered. Stores write it together
+with the data, so "is today's data present?" and "which states are stale?"
+can be answered without reading the weather records.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+FIELDS = ["state", "loaded_at", "first_date", "last_date"]
+
+
+def summarize(df: pd.DataFrame, loaded_at: Optional[datetime] = None) -> Dict[str, dict]:
+    """
+    Build freshness records for the states in a freshly loaded DataFrame.
+
+    Args:
+        df (pd.DataFrame): The weather data being saved.
+        loaded_at (Optional[datetime]): Load time (defaults to now).
+
+    Returns:
+        Dict[str, dict]: Freshness record for each state.
+    """
+    if df.empty:
+        return {}
+
+    loaded_at = (loaded_at or datetime.now()).isoformat(timespec="seconds")
+    dates = df.groupby("state")["date"].agg(["min", "max"])
+    return {
+        state: {
+            "state": state,
+            "loaded_at": loaded_at,
+            "first_date": str(row["min"]),
+            "last_date": str(row["max"]),
+        }
+        for state, row in dates.iterrows()
+    }
+
+
+def covers(freshness: Dict[str, dict], date: str) -> bool:
+    """
+    Check whether any state's last load covered a date.
+
+    Args:
+        freshness (Dict[str, dict]): Freshness records by state.
+        date (str): Date in 'YYYY-MM-DD' format.
+
+    Returns:
+        bool: True if some state has data for the date.
+    """
+    return any(
+        entry["first_date"] <= date <= entry["last_date"] for entry in freshness.values()
+    )
+
+
+def staleness(
+    freshness: Dict[str, dict],
+    states: List[str],
+    max_age_seconds: float,
+    now: Optional[datetime] = None,
+) -> Dict[str, dict]:
+    """
+    Age of every state's data and whether it needs a re-scrape.
+
+    Args:
+        freshness (Dict[str, dict]): Freshness records by state.
+        states (List[str]): The states that should be present.
+        max_age_seconds (float): Age after which a state is stale.
+        now (Optional[datetime]): Current time (defaults to now).
+
+    Returns:
+        Dict[str, dict]: For each state: loaded_at, age_seconds and stale.
+    """
+    now = now or datetime.now()
+    result = {}
+    for state in states:
+        entry = freshness.get(state)
+        if entry is None:
+            result[state] = {"loaded_at": None, "age_seconds": None, "stale": True}
+            continue
+
+        age = (now - datetime.fromisoformat(entry["loaded_at"])).total_seconds()
+        result[state] = {
+            "loaded_at": entry["loaded_at"],
+            "age_seconds": age,
+            "stale": age > max_age_seconds,
+        }
+    return result
@@ -0,0 +1,64 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import pandas as pd
+
+from weather_api.scraper.google_sheet import write_data_to_sheet
+from weather_api.storage.base import WeatherStorage
+from weather_api.storage.freshness import FIELDS, summarize
+from weather_api.utils.google_sheet_utils import connect_to_sheet, get_all_record, sheet_clients
+
+# worksheet holding one freshness row per state
+FRESHNESS_WORKSHEET = "_freshness"
+
+
+class GoogleSheetStorage(WeatherStorage):
+    """
+    Weather data kept in a Google Sheet.
+
+    Freshness metadata lives in a separate small worksheet, so checking it
+    never downloads the weather records.
+    """
+
+    def __init__(self, sheet_name: str, service_key_path: str):
+        """
+        Args:
+            sheet_name (str): Name of the Google Sheet.
+            service_key_path (str): Path to the service account key file.
+        """
+        self.sheet_name = sheet_name
+        self.service_key_path = service_key_path
+
+    def _freshness_sheet(self):
+        return sheet_clients.get_worksheet(
+            self.sheet_name, self.service_key_path, FRESHNESS_WORKSHEET
+        )
+
+    def save(self, df: pd.DataFrame) -> None:
+        # raises on failure, so freshness is only updated once the data is written
+        write_data_to_sheet(df, self.sheet_name, self.service_key_path)
+
+        freshness = {**self.freshness(), **summarize(df)}
+        values = [FIELDS] + [[entry[field] for field in FIELDS] for entry in freshness.values()]
+
+        # the whole metadata table is replaced in a single request
+        with sheet_clients.timed("data"):
+            self._freshness_sheet().update("A1", values, value_input_option="RAW")
+
+    def load(self) -> pd.DataFrame:
+        return get_all_record(connect_to_sheet(self.sheet_name, self.service_key_path))
+
+    def freshness(self) -> dict:
+        with sheet_clients.timed("data"):
+            values = self._freshness_sheet().get_all_values()
+        return {
+            row[0]: dict(zip(FIELDS, row))
+            for row in values[1:]
+            if row and row[0]
+        }
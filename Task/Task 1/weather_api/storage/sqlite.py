@@ -0,0 +1,100 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://docs.python.org/3/library/sqlite3.html
+https://www.sqlite.org/lang_upsert.html
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from weather_api.scraper.records import SCHEMA
+from weather_api.storage.base import WeatherStorage
+from weather_api.storage.freshness import FIELDS, summarize
+
+TABLE = "weather"
+
+FRESHNESS_TABLE = "freshness"
+
+SQL_TYPES = {"object": "TEXT", "float64": "REAL"}
+
+
+def quote(name: str) -> str:
+    """Quote a column name such as "wind_km/h" for SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteStorage(WeatherStorage):
+    """
+    Weather data kept in a local SQLite file.
+
+    Rows are keyed by (state, date, time), so saving is an upsert. Freshness
+    metadata lives in its own small table, written in the same transaction.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path to the SQLite database file.
+        """
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._create_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per call so the store can be used from any thread
+        return sqlite3.connect(self.path)
+
+    def _create_table(self) -> None:
+        columns = ", ".join(f"{quote(name)} {SQL_TYPES[dtype]}" for name, dtype in SCHEMA.items())
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE} ({columns}, "
+                f"PRIMARY KEY (state, date, time))"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_date ON {TABLE} (date)")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {FRESHNESS_TABLE} "
+                f"(state TEXT PRIMARY KEY, loaded_at TEXT, first_date TEXT, last_date TEXT)"
+            )
+
+    def save(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        df = df.reindex(columns=list(SCHEMA))
+        rows = df.astype(object).where(df.notna(), None).values.tolist()
+        columns = ", ".join(quote(name) for name in SCHEMA)
+        placeholders = ", ".join("?" for _ in SCHEMA)
+
+        freshness = [[entry[field] for field in FIELDS] for entry in summarize(df).values()]
+
+        # data and freshness metadata are committed together
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {TABLE} ({columns}) VALUES ({placeholders})",
+                rows,
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {FRESHNESS_TABLE} ({', '.join(FIELDS)}) "
+                f"VALUES ({', '.join('?' for _ in FIELDS)})",
+                freshness,
+            )
+
+    def load(self) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(f"SELECT * FROM {TABLE} ORDER BY date, state, time", conn)
+
+    def freshness(self) -> dict:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT {', '.join(FIELDS)} FROM {FRESHNESS_TABLE}").fetchall()
+        return {row[0]: dict(zip(FIELDS, row)) for row in rows}
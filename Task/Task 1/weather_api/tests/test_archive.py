@@ -0,0 +1,70 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from weather_api.storage.archive import WeatherArchive
+
+
+def snapshot(temp):
+    return pd.DataFrame(
+        {
+            "time": ["10:00", "11:00"],
+            "temp_C": [temp, temp + 1],
+            "state": ["kano", "asaba"],
+            "date": ["2025-02-23", "2025-02-23"],
+        }
+    )
+
+
+def test_append_and_scan(tmp_path):
+    archive = WeatherArchive(str(tmp_path))
+    assert archive.scan().empty
+
+    archive.append(snapshot(30.0), datetime(2025, 2, 21, 6))
+    archive.append(snapshot(27.0), datetime(2025, 2, 23, 6))
+
+    assert len(archive.scan()) == 4
+    kano = archive.scan(states=["Kano"], start_date="2025-02-23", end_date="2025-02-23")
+    assert sorted(kano["temp_C"]) == [27.0, 30.0]
+
+
+def test_forecast_vs_actual(tmp_path):
+    archive = WeatherArchive(str(tmp_path))
+    archive.append(snapshot(30.0), datetime(2025, 2, 21, 6))
+    archive.append(snapshot(27.0), datetime(2025, 2, 23, 6))
+
+    result = archive.forecast_vs_actual(states=["kano"])
+
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert row["forecast_temp_C"] == 30.0
+    assert row["actual_temp_C"] == 27.0
+    assert row["temp_C_error"] == 3.0
+    assert row["lead_days"] == 2
+
+
+def test_closed_partitions_are_compacted(tmp_path):
+    archive = WeatherArchive(str(tmp_path))
+    for day in (20, 21, 22):
+        archive.append(snapshot(25.0 + day), datetime(2025, 2, day, 6))
+
+    # 2025-02-23 is still ahead of every scrape
+    partition = tmp_path / "state=kano" / "date=2025-02-23"
+    assert len(os.listdir(partition)) == 3
+
+    assert archive.compact(before=date(2025, 2, 24)) == 2
+    assert os.listdir(partition) == ["compacted.parquet"]
+    assert archive.compact(before=date(2025, 2, 24)) == 0
+
+    kano = archive.scan(states=["kano"])
+    assert sorted(kano["temp_C"]) == [45.0, 46.0, 47.0]
+    assert len(archive.forecast_vs_actual()) == 2
@@ -0,0 +1,23 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import json
+
+from weather_api.benchmarks.run_benchmarks import run
+
+
+def test_benchmark_report_covers_every_stage():
+    report = run(pages=4, latency=0, concurrency=2, trace_alloc=True)
+
+    assert report["rows"] == 4 * 24
+    for stage in ["fetch", "parse", "transform", "concat", "records", "serialize"]:
+        assert report["stages"][stage]["pages_per_sec"] > 0
+        assert "peak_alloc_mb" in report["stages"][stage]
+        delta = report["stages"][stage]["rss_delta_mb"]
+        assert delta is None or delta >= 0
+    json.dumps(report)
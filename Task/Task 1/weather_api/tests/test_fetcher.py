@@ -0,0 +1,56 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import pandas as pd
+
+from weather_api.benchmarks.bench_fetch import run_concurrent, run_sequential
+from weather_api.benchmarks.stub_server import StubServer
+from weather_api.scraper.fetcher import fetch_all
+from weather_api.scraper.records import NUMERIC_COLUMNS, SCHEMA
+
+STATES = ["abeokuta", "asaba", "kano"]
+
+
+def typed(frame):
+    """The sequential scrape's text columns, typed as `WeatherRecords.to_frame` does."""
+    frame = frame[list(SCHEMA)].copy()
+    for column in NUMERIC_COLUMNS:
+        frame[column] = pd.to_numeric(
+            frame[column].str.replace("%", "", regex=False).str.strip(), errors="coerce"
+        )
+    return frame.astype(SCHEMA)
+
+
+def test_concurrent_scrape_matches_sequential():
+    with StubServer(latency=0.01) as server:
+        sequential = run_sequential(server.url, STATES)
+        concurrent = run_concurrent(server.url, STATES, max_concurrency=4, requests_per_second=0)
+
+    assert len(concurrent) == 8 * len(STATES) * 24
+    pd.testing.assert_frame_equal(concurrent, typed(sequential))
+
+
+def test_concurrency_limit_is_respected():
+    with StubServer(latency=0.05) as server:
+        urls = [server.url.format(state, day) for state in STATES for day in range(8)]
+        responses = fetch_all(urls, max_concurrency=4, requests_per_second=0)
+
+    assert all(response is not None for response in responses.values())
+    assert 1 < server.max_in_flight <= 4
+
+
+def test_rate_limit_spaces_requests_to_a_host():
+    rate = 20
+    with StubServer(latency=0) as server:
+        urls = [server.url.format("kano", day) for day in range(8)]
+        fetch_all(urls, max_concurrency=8, requests_per_second=rate)
+
+    arrivals = sorted(server.arrivals)
+    assert len(arrivals) == 8
+    # slots are 1/rate apart; allow some scheduling jitter
+    assert arrivals[-1] - arrivals[0] >= 0.9 * 7 / rate
@@ -0,0 +1,43 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+from datetime import datetime
+
+from weather_api.storage.freshness import covers, staleness
+
+FRESHNESS = {
+    "abeokuta": {
+        "state": "abeokuta",
+        "loaded_at": "2025-02-21T06:00:00",
+        "first_date": "2025-02-21",
+        "last_date": "2025-02-28",
+    },
+    "kano": {
+        "state": "kano",
+        "loaded_at": "2025-02-21T11:00:00",
+        "first_date": "2025-02-21",
+        "last_date": "2025-02-28",
+    },
+}
+
+
+def test_covers():
+    assert covers(FRESHNESS, "2025-02-25")
+    assert not covers(FRESHNESS, "2025-03-01")
+    assert not covers({}, "2025-02-25")
+
+
+def test_staleness():
+    result = staleness(
+        FRESHNESS, ["abeokuta", "asaba", "kano"], 3 * 3600, now=datetime(2025, 2, 21, 12)
+    )
+
+    assert result["abeokuta"]["stale"]
+    assert result["abeokuta"]["age_seconds"] == 6 * 3600
+    assert result["asaba"] == {"loaded_at": None, "age_seconds": None, "stale": True}
+    assert not result["kano"]["stale"]
@@ -0,0 +1,55 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+from weather_api.scraper.google_sheet import SheetSnapshot, chunks
+
+HEADER = ["time", "temp_C", "state", "date"]
+
+
+def test_diff_updates_changed_cells_and_appends_new_keys():
+    snapshot = SheetSnapshot([
+        HEADER,
+        ["10:00", "27", "abeokuta", "2025-02-21"],
+        ["11:00", "28", "abeokuta", "2025-02-21"],
+    ])
+
+    updates, appends = snapshot.diff(HEADER, [
+        ["10:00", 27.0, "abeokuta", "2025-02-21"],  # unchanged
+        ["11:00", 30.0, "abeokuta", "2025-02-21"],  # temp changed
+        ["12:00", 29.0, "abeokuta", "2025-02-21"],  # new key
+    ])
+
+    assert updates == [{"range": "B3:B3", "values": [[30.0]]}]
+    assert appends == [["12:00", 29.0, "abeokuta", "2025-02-21"]]
+    assert snapshot.row_count == 4
+
+    # a second sync of the same data sends nothing
+    assert snapshot.diff(HEADER, [["12:00", 29.0, "abeokuta", "2025-02-21"]]) == ([], [])
+
+
+def test_snapshot_detects_moved_rows():
+    snapshot = SheetSnapshot([
+        HEADER,
+        ["10:00", "27", "abeokuta", "2025-02-21"],
+        ["11:00", "28", "abeokuta", "2025-02-21"],
+    ])
+    assert snapshot.key_ranges() == ["C:C", "D:D", "A:A"]
+
+    # key columns in KEY_COLUMNS order: state, date, time
+    states = ["state", "abeokuta", "abeokuta"]
+    dates = ["date", "2025-02-21", "2025-02-21"]
+    assert snapshot.matches([states, dates, ["time", "10:00", "11:00"]])
+
+    # rows swapped, a row inserted, or the sheet cleared by another writer
+    assert not snapshot.matches([states, dates, ["time", "11:00", "10:00"]])
+    assert not snapshot.matches([states + ["kano"], dates + ["2025-02-21"], ["time", "10:00", "11:00", "10:00"]])
+    assert not snapshot.matches([[], [], []])
+
+
+def test_chunks():
+    assert list(chunks([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,100 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from weather_api.benchmarks.stub_server import StubServer
+from weather_api.scraper import scraper
+from weather_api.scraper.http_cache import PageCache
+
+
+def date_in(days):
+    return (datetime.today() + timedelta(days=days)).strftime("%Y%m%d")
+
+
+def test_put_and_get(tmp_path):
+    cache = PageCache(str(tmp_path), max_entries=10, ttl_by_day=[60])
+    cache.put("http://x/1", [["00:00", "27"]], etag='"abc"', last_modified="Fri, 21 Feb 2025 00:00:00 GMT")
+
+    entry = cache.get("http://x/1")
+    assert entry["rows"] == [["00:00", "27"]]
+    assert PageCache.conditional_headers(entry) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Fri, 21 Feb 2025 00:00:00 GMT",
+    }
+    assert cache.get("http://x/2") is None
+
+
+def test_ttl_depends_on_forecast_day(tmp_path):
+    cache = PageCache(str(tmp_path), ttl_by_day=[10, 100, 1000])
+    assert cache.ttl(date_in(0)) == 10
+    assert cache.ttl(date_in(1)) == 100
+    assert cache.ttl(date_in(7)) == 1000
+
+    entry = {"fetched_at": time.time() - 50}
+    assert not cache.is_fresh(entry, date_in(0))
+    assert cache.is_fresh(entry, date_in(1))
+
+
+def test_lru_eviction(tmp_path):
+    cache = PageCache(str(tmp_path), max_entries=2)
+    cache.put("http://x/1", [])
+    cache.put("http://x/2", [])
+    os.utime(cache._path("http://x/1"), (1, 1))
+    os.utime(cache._path("http://x/2"), (2, 2))
+    cache.get("http://x/1")  # marks 1 as recently used
+    cache.put("http://x/3", [])
+
+    assert cache.get("http://x/1") is not None
+    assert cache.get("http://x/2") is None
+    assert cache.get("http://x/3") is not None
+
+
+def test_scrape_revalidates_with_etag(tmp_path, monkeypatch):
+    caches = []
+
+    class ExpiredCache(PageCache):
+        # every entry is expired at once, so each page is revalidated
+        def __init__(self):
+            super().__init__(str(tmp_path), ttl_by_day=[0])
+            self.refreshed = []
+            caches.append(self)
+
+        def refresh(self, url, entry):
+            self.refreshed.append(url)
+            super().refresh(url, entry)
+
+    parsed = []
+    parse_rows = scraper.get_parser("bs4")
+
+    def counting_parser(backend):
+        def parse(content):
+            parsed.append(content)
+            return parse_rows(content)
+        return parse
+
+    monkeypatch.setattr(scraper, "PageCache", ExpiredCache)
+    monkeypatch.setattr(scraper, "get_parser", counting_parser)
+
+    with StubServer(latency=0, etag='"v1"') as server:
+        monkeypatch.setattr(scraper, "URL", server.url)
+        first = scraper.extract_transform_main(states=["kano"], requests_per_second=0, use_cache=True)
+        second = scraper.extract_transform_main(states=["kano"], requests_per_second=0, use_cache=True)
+
+    assert len(first) == 8 * 24
+    assert (caches[0].misses, caches[0].revalidated, caches[0].hits) == (8, 0, 0)
+    # the second run sends If-None-Match, gets 304s and parses nothing
+    assert server.not_modified == 8
+    assert len(parsed) == 8
+    assert (caches[1].misses, caches[1].revalidated, caches[1].hits) == (0, 8, 0)
+    assert len(caches[1].refreshed) == 8
+    pd.testing.assert_frame_equal(second, first)
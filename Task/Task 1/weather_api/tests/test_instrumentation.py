@@ -0,0 +1,85 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import json
+import logging
+
+import pytest
+
+from weather_api.logger import LazyFileHandler
+from weather_api.utils.instrumentation import Instrumentation, quantile
+
+
+def test_quantile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert quantile(values, 0.5) == 50.0
+    assert quantile(values, 0.95) == 95.0
+    assert quantile(values, 0.99) == 99.0
+    assert quantile([3.0], 0.99) == 3.0
+
+
+def test_span_emits_json_and_links_parent():
+    spans = []
+    instrumentation = Instrumentation(window_size=10, emit=spans.append)
+
+    with instrumentation.span("scrape"):
+        with instrumentation.span("parse", labels={"backend": "lxml"}, url="u") as attributes:
+            attributes["rows"] = 24
+
+    parse, scrape = [json.loads(line) for line in spans]
+    assert parse["stage"] == "parse"
+    assert parse["parent_id"] == scrape["span_id"]
+    assert parse["backend"] == "lxml"
+    assert parse["rows"] == 24
+    assert parse["status"] == "ok"
+    assert scrape["parent_id"] is None
+
+
+def test_span_records_errors_and_reraises():
+    spans = []
+    instrumentation = Instrumentation(window_size=10, emit=spans.append)
+
+    @instrumentation.timed("fetch")
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fail()
+
+    assert json.loads(spans[0])["status"] == "error"
+    assert instrumentation.metrics()["fetch"]["errors"] == 1
+
+
+def test_rolling_window_and_prometheus_output():
+    instrumentation = Instrumentation(window_size=3, emit=lambda line: None)
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        instrumentation.observe("fetch", seconds)
+    instrumentation.observe("request", 0.5, labels={"route": "/freshness"})
+
+    metrics = instrumentation.metrics()
+    # the first sample fell out of the window but still counts in the totals
+    assert metrics["fetch"]["p99"] == 3.0
+    assert metrics["fetch"]["count"] == 4
+    assert metrics["fetch"]["seconds"] == 16.0
+
+    text = instrumentation.render_prometheus()
+    assert '# TYPE weather_api_stage_duration_seconds summary' in text
+    assert 'weather_api_stage_duration_seconds{stage="fetch",quantile="0.5"} 2.000000' in text
+    assert 'weather_api_stage_duration_seconds_count{stage="fetch"} 4' in text
+    assert 'weather_api_stage_duration_seconds_sum{stage="request",route="/freshness"} 0.500000' in text
+    assert 'weather_api_stage_errors_total{stage="fetch"} 0' in text
+
+
+def test_span_log_is_created_on_first_record(tmp_path):
+    path = tmp_path / "logs" / "spans.log"
+    handler = LazyFileHandler(str(path))
+    assert not path.exists()
+
+    handler.emit(logging.makeLogRecord({"msg": '{"stage": "fetch"}'}))
+    handler.close()
+    assert path.read_text().strip() == '{"stage": "fetch"}'
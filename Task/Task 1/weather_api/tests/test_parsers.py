@@ -0,0 +1,39 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import pytest
+
+from weather_api.benchmarks.stub_server import load_fixture
+from weather_api.scraper.parsers import COLUMNS, HAS_LXML, bs4_rows, lxml_rows, get_parser
+
+
+@pytest.fixture
+def page():
+    return load_fixture()
+
+
+def test_bs4_rows(page):
+    rows = bs4_rows(page)
+    assert len(rows) == 24
+    assert all(len(row) == len(COLUMNS) for row in rows)
+    assert rows[0][0] == "00:00"
+    assert rows[0][5].startswith("Wind blowing from")
+
+
+@pytest.mark.skipif(not HAS_LXML, reason="lxml is not installed")
+def test_lxml_rows_match_bs4(page):
+    assert lxml_rows(page) == bs4_rows(page)
+
+
+def test_missing_table_returns_none():
+    assert bs4_rows(b"<html><body></body></html>") is None
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_parser("regex")
@@ -0,0 +1,77 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import threading
+import time
+
+import pandas as pd
+
+from weather_api.utils.read_model import WeatherReadModel
+
+
+def sheet():
+    return pd.DataFrame(
+        {
+            "time": ["10:00", "11:00", "10:00"],
+            "temp_C": [27, 28, 31],
+            "state": ["Abeokuta", "abeokuta", "kano"],
+            "date": ["2025-02-21"] * 3,
+        }
+    )
+
+
+def test_lookup_after_refresh():
+    model = WeatherReadModel(sheet, refresh_interval=60)
+    assert not model.is_loaded
+    assert model.refresh()
+
+    assert model.lookup(" ABEOKUTA ", "2025-02-21", "10:00")[0]["temp_C"] == 27
+    assert model.lookup("kano", "2025-02-21", "11:00") == []
+    assert model.metrics()["rows"] == 3
+
+
+def test_missing_values_are_served_as_none():
+    data = sheet()
+    data["temp_C"] = [27.0, float("nan"), 31.0]
+    model = WeatherReadModel(lambda: data, refresh_interval=60)
+    assert model.refresh()
+
+    assert model.lookup("abeokuta", "2025-02-21", "11:00")[0]["temp_C"] is None
+    assert model.lookup("kano", "2025-02-21", "10:00")[0]["temp_C"] == 31.0
+
+
+def test_failed_refresh_keeps_previous_data():
+    frames = [sheet(), pd.DataFrame({"time": ["10:00"]})]
+    model = WeatherReadModel(lambda: frames.pop(0), refresh_interval=60)
+
+    assert model.refresh()
+    assert not model.refresh()
+    assert model.lookup("kano", "2025-02-21", "10:00")[0]["temp_C"] == 31
+    assert model.metrics()["failure_count"] == 1
+
+
+def test_start_loads_in_the_background():
+    release = threading.Event()
+
+    def slow_sheet():
+        release.wait(5)
+        return sheet()
+
+    model = WeatherReadModel(slow_sheet, refresh_interval=60)
+    model.start()
+    try:
+        # start returned before the store was read
+        assert not model.is_loaded
+        release.set()
+        for _ in range(100):
+            if model.is_loaded:
+                break
+            time.sleep(0.05)
+        assert model.lookup("kano", "2025-02-21", "10:00")[0]["temp_C"] == 31
+    finally:
+        model.stop()
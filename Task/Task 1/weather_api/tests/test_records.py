@@ -0,0 +1,30 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+from weather_api.benchmarks.stub_server import load_fixture
+from weather_api.scraper.parsers import bs4_rows
+from weather_api.scraper.records import SCHEMA, WeatherRecords
+
+
+def test_to_frame_builds_typed_frame():
+    records = WeatherRecords()
+    rows = bs4_rows(load_fixture())
+    records.add_page(rows, "abeokuta", "url-1", "2025-02-21")
+    records.add_page(rows, "kano", "url-2", "2025-02-21")
+
+    df = records.to_frame()
+
+    assert list(df.columns) == list(SCHEMA)
+    assert len(df) == 2 * len(rows)
+    assert df["temp_C"].dtype == "float64"
+    assert df["humidity_%"].iloc[0] == float(rows[0][6].rstrip("%"))
+    assert df["state"].tolist() == ["abeokuta"] * len(rows) + ["kano"] * len(rows)
+
+
+def test_empty_records():
+    assert WeatherRecords().to_frame().empty
@@ -0,0 +1,37 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import asyncio
+import time
+
+from weather_api.scheduler import ScrapeScheduler
+
+
+class SlowFreshStorage:
+    """Store whose staleness check takes a while and reports nothing stale."""
+
+    def stale_states(self, states, max_age_seconds):
+        time.sleep(0.2)
+        return []
+
+
+def test_cycle_is_skipped_while_previous_one_runs():
+    async def run():
+        scheduler = ScrapeScheduler(
+            SlowFreshStorage(), None, None,
+            states=["kano"], interval=60, stale_after=60, max_workers=1,
+        )
+        assert scheduler.trigger()
+        assert not scheduler.trigger()
+        await scheduler.stop()
+        return scheduler.metrics()
+
+    metrics = asyncio.run(run())
+    assert metrics["cycles"] == 1
+    assert metrics["skipped"] == 1
+    assert metrics["last_states"] == []
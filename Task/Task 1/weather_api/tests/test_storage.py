@@ -0,0 +1,80 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import pandas as pd
+import pytest
+
+from weather_api.storage import sheets as sheets_module
+from weather_api.storage.sheets import GoogleSheetStorage
+from weather_api.storage.sqlite import SQLiteStorage
+
+
+def frame(temp):
+    return pd.DataFrame(
+        {
+            "time": ["10:00", "11:00"],
+            "temp_C": [temp, float("nan")],
+            "state": ["abeokuta", "abeokuta"],
+            "date": ["2025-02-21", "2025-02-21"],
+        }
+    )
+
+
+def test_sqlite_save_load_and_upsert(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "weather.db"))
+    assert storage.load().empty
+    assert not storage.has_date("2025-02-21")
+
+    storage.save(frame(27.0))
+    storage.save(frame(30.0))
+
+    data = storage.load()
+    assert len(data) == 2
+    assert data.loc[data["time"] == "10:00", "temp_C"].item() == 30.0
+    assert storage.has_date("2025-02-21")
+    assert not storage.has_date("2025-02-22")
+
+
+def test_sqlite_freshness(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "weather.db"))
+    storage.save(frame(27.0))
+
+    assert set(storage.freshness()) == {"abeokuta"}
+    assert storage.stale_states(["abeokuta", "kano"], 3600) == ["kano"]
+
+
+class FakeWorksheet:
+    def __init__(self, values):
+        self.values = values
+
+    def get_all_values(self):
+        return self.values
+
+    def update(self, cell, values, value_input_option=None):
+        self.values = values
+
+
+def test_sheets_freshness_unchanged_when_data_write_fails(monkeypatch):
+    freshness_sheet = FakeWorksheet([
+        ["state", "loaded_at", "first_date", "last_date"],
+        ["abeokuta", "2025-02-20T10:00:00", "2025-02-20", "2025-02-20"],
+    ])
+    storage = GoogleSheetStorage("weather", "key.json")
+    monkeypatch.setattr(storage, "_freshness_sheet", lambda: freshness_sheet)
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("quota exceeded")
+
+    monkeypatch.setattr(sheets_module, "write_data_to_sheet", fail)
+    with pytest.raises(ConnectionError):
+        storage.save(frame(27.0))
+    assert storage.freshness()["abeokuta"]["last_date"] == "2025-02-20"
+
+    monkeypatch.setattr(sheets_module, "write_data_to_sheet", lambda *args, **kwargs: None)
+    storage.save(frame(27.0))
+    assert storage.freshness()["abeokuta"]["last_date"] == "2025-02-21"
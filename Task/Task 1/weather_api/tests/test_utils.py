@@ -0,0 +1,53 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+"""
+import sys
+sys.path.append('../')
+
+import pandas as pd
+import pytest
+
+from weather_api.utils.utils import filter_weather_data, parse_date, parse_hour
+
+DATA = pd.DataFrame(
+    {
+        "time": ["05:00", "06:00", "12:00", "18:00", "12:00"],
+        "state": ["Kano", "kano", "kano", "asaba", "abeokuta"],
+        "date": ["2025-02-21", "2025-02-21", "2025-02-22", "2025-02-21", "2025-02-21"],
+    }
+)
+
+
+def test_filter_by_states_and_ranges():
+    match = filter_weather_data(
+        DATA, ["KANO ", "asaba"], start_date="2025-02-21", end_date="2025-02-21",
+        start_hour="06:00", end_hour="18:00",
+    )
+    assert match.index.tolist() == [1, 3]
+
+
+def test_filter_without_ranges():
+    assert len(filter_weather_data(DATA, ["kano"])) == 3
+
+
+def test_missing_columns():
+    with pytest.raises(ValueError):
+        filter_weather_data(DATA.drop(columns="date"), ["kano"])
+
+
+def test_empty_store_gives_empty_result():
+    assert filter_weather_data(pd.DataFrame(), ["kano"]).empty
+
+
+def test_parse_range_parameters():
+    assert parse_hour("7") == parse_hour("07:00") == "07:00"
+    assert parse_hour(None) is None
+    assert parse_date("2025-02-21") == "2025-02-21"
+    for hour in ["25", "7pm", "07:00:00"]:
+        with pytest.raises(ValueError):
+            parse_hour(hour)
+    for date in ["21-02-2025", "20250221", "2025-02-30"]:
+        with pytest.raises(ValueError):
+            parse_date(date)
@@ -6,6 +6,10 @@ Date: 21-02-2025
 https://fastapi.tiangolo.com/advanced/response-directly/
 """
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 
 import pandas as pd
 import gspread
@@ -16,10 +20,159 @@ from oauth2client.service_account import ServiceAccountCredentials
 # set all depencies (module) part
 sys.path.append('../')
 
+from weather_api.utils.instrumentation import span
+
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.file",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+class SheetClientManager:
+    """
+    Process-wide pool of authorized gspread clients and worksheet handles.
+
+    Each service account is authorized once and each spreadsheet is opened
+    once; later calls reuse the cached handles. Access tokens are refreshed
+    shortly before they expire. Creation and refresh are guarded by a lock,
+    so the manager can be shared by FastAPI worker threads.
+    """
+
+    def __init__(self, token_refresh_margin: int = 300):
+        """
+        Args:
+            token_refresh_margin (int): Refresh the access token when it has
+                fewer than this many seconds left.
+        """
+        self.token_refresh_margin = timedelta(seconds=token_refresh_margin)
+        self._lock = threading.RLock()
+        self._clients = {}
+        self._sheets = {}
+        self._timings = {}
+
+    @contextmanager
+    def timed(self, stage: str):
+        """
+        Add the duration of the wrapped block to the counters of a stage.
+
+        The block is also recorded as a `sheets_<stage>` span.
+
+        Args:
+            stage (str): Stage name, e.g. "auth", "open" or "data".
+        """
+        start_time = time.perf_counter()
+        try:
+            with span(f"sheets_{stage}"):
+                yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            with self._lock:
+                timing = self._timings.setdefault(stage, {"count": 0, "seconds": 0.0})
+                timing["count"] += 1
+                timing["seconds"] += elapsed
+
+    def _refresh_token_if_needed(self, client: gspread.Client) -> None:
+        """Refresh the client's access token before it expires."""
+        auth = client.auth
+        expiry = getattr(auth, "expiry", None)
+        if expiry is not None and expiry - datetime.utcnow() > self.token_refresh_margin:
+            return
+
+        from google.auth.transport.requests import Request
+
+        with self.timed("auth"):
+            auth.refresh(Request())
+
+    def get_client(self, service_key_path: str) -> gspread.Client:
+        """
+        Get an authorized client for a service account key.
+
+        Args:
+            service_key_path (str): Path to the service account key file.
+
+        Returns:
+            gspread.Client: The shared, authorized client.
+        """
+        with self._lock:
+            client = self._clients.get(service_key_path)
+            if client is None:
+                with self.timed("auth"):
+                    creds = ServiceAccountCredentials.from_json_keyfile_name(
+                        service_key_path, SCOPE
+                    )
+                    client = gspread.authorize(creds)
+                self._clients[service_key_path] = client
+
+            self._refresh_token_if_needed(client)
+            return client
+
+    def get_worksheet(self, sheet_name: str, service_key_path: str, title: str = None):
+        """
+        Get a worksheet of a spreadsheet, opening it only once.
+
+        Args:
+            sheet_name (str): The name of the Google Sheet.
+            service_key_path (str): Path to the service account key file.
+            title (str, optional): Worksheet title; the first sheet when omitted.
+                A missing worksheet is created.
+
+        Returns:
+            gspread.models.Worksheet: The requested worksheet.
+        """
+        client = self.get_client(service_key_path)
+        key = (service_key_path, sheet_name, title)
+        with self._lock:
+            sheet = self._sheets.get(key)
+            if sheet is None:
+                with self.timed("open"):
+                    spreadsheet = client.open(sheet_name)
+                    if title is None:
+                        sheet = spreadsheet.sheet1
+                    else:
+                        try:
+                            sheet = spreadsheet.worksheet(title)
+                        except gspread.exceptions.WorksheetNotFound:
+                            sheet = spreadsheet.add_worksheet(title=title, rows=100, cols=10)
+                self._sheets[key] = sheet
+            return sheet
+
+    def reset(self) -> None:
+        """Drop every cached client and worksheet."""
+        with self._lock:
+            self._clients.clear()
+            self._sheets.clear()
+
+    def metrics(self) -> dict:
+        """
+        Time spent per stage (auth, open, data).
+
+        Returns:
+            dict: Call count, total and average seconds for each stage.
+        """
+        with self._lock:
+            return {
+                stage: {
+                    "count": timing["count"],
+                    "seconds": timing["seconds"],
+                    "average_seconds": timing["seconds"] / timing["count"],
+                }
+                for stage, timing in self._timings.items()
+            }
+
+
+# Shared by every caller in the process
+sheet_clients = SheetClientManager()
+
+
 def connect_to_sheet(sheet_name, service_key_path):
     """
     Establish a connection to a Google Sheet.
 
+    The connection comes from the shared `sheet_clients` pool, so the OAuth
+    handshake and the spreadsheet lookup only happen on the first call.
+
     Args:
         sheet_name (str): The name of the Google Sheet.
         service_key_path (str): Path to the service account key file.
@@ -27,20 +180,7 @@ def connect_to_sheet(sheet_name, service_key_path):
     Returns:
         gspread.models.Worksheet: The first sheet of the Google Sheet.
     """
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive",
-    ]
-
-    # Authenticate using the service account key
-    creds = ServiceAccountCredentials.from_json_keyfile_name(service_key_path, scope)
-    client = gspread.authorize(creds)
-
-    # Open the Google Sheet and return the first worksheet
-    sheet = client.open(sheet_name).sheet1
-    return sheet
+    return sheet_clients.get_worksheet(sheet_name, service_key_path)
 
 def get_all_record(sheet):
     """
@@ -52,6 +192,7 @@ def get_all_record(sheet):
     Returns:
         pd.DataFrame: A DataFrame containing all records from the sheet.
     """
-    data = sheet.get_all_records()  # Get all records from the sheet
+    with sheet_clients.timed("data"):
+        data = sheet.get_all_records()  # Get all records from the sheet
     df = pd.DataFrame(data)  # Convert records to a Pandas DataFrame
     return df
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://prometheus.io/docs/instrumenting/exposition_formats/
+https://docs.python.org/3/library/contextvars.html
+
+Per-stage timing for the scraper and the API. Every timed block is written
+as one JSON line to the span log and added to a rolling window of latencies,
+from which `/metrics` reports p50/p95/p99 in the Prometheus text format.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import contextvars
+import functools
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from weather_api.config import METRICS_WINDOW_SIZE
+from weather_api.logger import span_logger
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Stage name plus sorted Prometheus labels, e.g. ("request", (("route", "/freshness"),))
+StageKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Id of the innermost open span, so nested spans can point to their parent
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def quantile(sorted_values: List[float], q: float) -> float:
+    """
+    Nearest-rank quantile of an already sorted list.
+
+    Args:
+        sorted_values (List[float]): Values in ascending order (not empty).
+        q (float): Quantile between 0 and 1.
+
+    Returns:
+        float: The value at that rank.
+    """
+    rank = max(math.ceil(q * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LatencyHistogram:
+    """
+    Rolling window of the most recent durations of one stage, plus lifetime
+    count, sum and error totals.
+    """
+
+    def __init__(self, window_size: int):
+        """
+        Args:
+            window_size (int): Number of recent samples kept for the quantiles.
+        """
+        self.samples = deque(maxlen=window_size)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+
+    def quantiles(self) -> Dict[float, float]:
+        """
+        Returns:
+            Dict[float, float]: p50/p95/p99 of the window (empty if no samples).
+        """
+        values = sorted(self.samples)
+        if not values:
+            return {}
+        return {q: quantile(values, q) for q in QUANTILES}
+
+
+class Instrumentation:
+    """
+    Records spans around pipeline stages and keeps a histogram per stage.
+
+    Thread-safe, so the scraper thread, the scheduler and FastAPI worker
+    threads can all report into the same instance.
+    """
+
+    def __init__(self, window_size: int = METRICS_WINDOW_SIZE, emit=span_logger.info):
+        """
+        Args:
+            window_size (int): Samples kept per stage for the quantiles.
+            emit (Callable[[str], None]): Receives every span as a JSON string.
+        """
+        self.window_size = window_size
+        self.emit = emit
+        self._lock = threading.Lock()
+        self._histograms: Dict[StageKey, LatencyHistogram] = {}
+        self._ids = itertools.count(1)
+
+    def observe(self, stage: str, seconds: float, labels: Optional[dict] = None, error: bool = False) -> None:
+        """
+        Add one duration to the histogram of a stage.
+
+        Args:
+            stage (str): Stage name, e.g. "fetch".
+            seconds (float): Duration of the stage.
+            labels (Optional[dict]): Prometheus labels that split the stage,
+                e.g. {"route": "/freshness"}. Keep them low-cardinality.
+            error (bool): Whether the stage raised.
+        """
+        key = (stage, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.window_size)
+            histogram.observe(seconds, error)
+
+    @contextmanager
+    def span(self, stage: str, labels: Optional[dict] = None, **fields):
+        """
+        Time the wrapped block, record it and emit it as a JSON span.
+
+        Exceptions are recorded on the span and re-raised.
+
+        Args:
+            stage (str): Stage name, e.g. "fetch", "parse" or "sheets_data".
+            labels (Optional[dict]): Prometheus labels for the stage histogram.
+                They are read when the block ends, so values only known
+                inside the block can still be filled in.
+            **fields: Extra attributes written to the span only, e.g. the URL.
+
+        Yields:
+            dict: The span attributes; add keys to it to enrich the span.
+        """
+        span_id = next(self._ids)
+        parent_id = _current_span.get()
+        token = _current_span.set(span_id)
+        attributes = dict(fields)
+        error = None
+        start_time = time.perf_counter()
+        try:
+            yield attributes
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - start_time
+            _current_span.reset(token)
+            self.observe(stage, elapsed, labels, error=error is not None)
+
+            record = {
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "stage": stage,
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "duration_ms": round(elapsed * 1000, 3),
+                "status": "error" if error is not None else "ok",
+                **(labels or {}),
+                **attributes,
+            }
+            if error is not None:
+                record["error"] = repr(error)
+            try:
+                self.emit(json.dumps(record, default=str))
+            except Exception:
+                # never let span logging break the timed code
+                pass
+
+    def timed(self, stage: str, labels: Optional[dict] = None):
+        """
+        Decorator form of `span` for whole functions.
+
+        Args:
+            stage (str): Stage name.
+            labels (Optional[dict]): Prometheus labels for the stage histogram.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(stage, labels):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+    def metrics(self) -> dict:
+        """
+        Count, error count, total seconds and quantiles per stage.
+
+        Returns:
+            dict: Metrics keyed by stage (labels appended as `stage{k=v}`).
+        """
+        result = {}
+        with self._lock:
+            for (stage, labels), histogram in self._histograms.items():
+                name = stage + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+                result[name] = {
+                    "count": histogram.count,
+                    "errors": histogram.errors,
+                    "seconds": histogram.total,
+                    **{f"p{round(q * 100)}": value for q, value in histogram.quantiles().items()},
+                }
+        return result
+
+    def render_prometheus(self, prefix: str = "weather_api") -> str:
+        """
+        Render every stage histogram in the Prometheus text exposition format.
+
+        Quantiles are taken over the last `window_size` samples of each
+        stage; `_sum`, `_count` and the error counter cover the whole process
+        lifetime.
+
+        Args:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: The metrics page.
+        """
+        with self._lock:
+            items = sorted(
+                (key, histogram.count, histogram.total, histogram.errors, histogram.quantiles())
+                for key, histogram in self._histograms.items()
+            )
+
+        duration = f"{prefix}_stage_duration_seconds"
+        errors = f"{prefix}_stage_errors_total"
+        lines = [
+            f"# HELP {duration} Duration of instrumented stages (quantiles over the last {self.window_size} samples).",
+            f"# TYPE {duration} summary",
+        ]
+        for (stage, labels), count, total, _, quantiles in items:
+            base = format_labels((("stage", stage),) + labels)
+            for q, value in quantiles.items():
+                lines.append(f"{duration}{format_labels((('stage', stage),) + labels + (('quantile', str(q)),))} {value:.6f}")
+            lines.append(f"{duration}_sum{base} {total:.6f}")
+            lines.append(f"{duration}_count{base} {count}")
+
+        lines += [
+            f"# HELP {errors} Instrumented stages that raised an exception.",
+            f"# TYPE {errors} counter",
+        ]
+        for (stage, labels), _, _, error_count, _ in items:
+            lines.append(f"{errors}{format_labels((('stage', stage),) + labels)} {error_count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Format label pairs as `{name="value",...}`, escaping the values."""
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+
+# Shared by every caller in the process
+instrumentation = Instrumentation()
+span = instrumentation.span
+timed = instrumentation.timed
@@ -0,0 +1,189 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Email: adedoyinsamuel25@gmail.com
+Date: 21-02-2025
+
+https://docs.python.org/3/library/threading.html#event-objects
+
+In-process read model of the weather store. The records are loaded once,
+indexed by (state, date, hour) and swapped in as a whole on every refresh, so
+requests are answered from memory without querying the store.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from weather_api.logger import logger
+
+Key = Tuple[str, str, str]
+
+
+def build_index(data: pd.DataFrame) -> Dict[Key, List[dict]]:
+    """
+    Index weather records by (state, date, time).
+
+    Args:
+        data (pd.DataFrame): All weather records.
+
+    Returns:
+        Dict[Key, List[dict]]: Records for each key, in store order, with
+        missing values as None.
+    """
+    if data.empty:
+        return {}
+
+    required_columns = {"state", "date", "time"}
+    if not required_columns.issubset(data.columns):
+        missing_cols = required_columns - set(data.columns)
+        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
+
+    # missing values as None: NaN is not valid JSON
+    records = data.astype(object).where(data.notna(), None).to_dict(orient="records")
+    index = defaultdict(list)
+    for record in records:
+        key = (
+            str(record["state"]).lower().strip(),
+            str(record["date"]),
+            str(record["time"]),
+        )
+        index[key].append(record)
+    return dict(index)
+
+
+class WeatherReadModel:
+    """
+    Cached, indexed copy of the weather store with background refresh.
+    """
+
+    def __init__(self, loader: Callable[[], pd.DataFrame], refresh_interval: float):
+        """
+        Args:
+            loader (Callable[[], pd.DataFrame]): Returns all weather records.
+            refresh_interval (float): Seconds between background refreshes.
+        """
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self._index: Dict[Key, List[dict]] = {}
+        self._data = pd.DataFrame()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.loaded_at: Optional[float] = None
+        self.rows = 0
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.last_refresh_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def refresh(self) -> bool:
+        """
+        Reload the records and atomically replace the index.
+
+        On failure the previous index keeps being served.
+
+        Returns:
+            bool: True if the refresh succeeded.
+        """
+        start_time = time.time()
+        try:
+            data = self.loader()
+            index = build_index(data)
+        except Exception as e:
+            self.failure_count += 1
+            self.last_error = str(e)
+            logger.exception(f"Read model refresh failed: {e}")
+            return False
+
+        with self._lock:
+            self._index = index
+            self._data = data
+            self.rows = len(data)
+            self.loaded_at = time.time()
+            self.refresh_count += 1
+            self.last_refresh_seconds = self.loaded_at - start_time
+            self.last_error = None
+
+        logger.info(
+            f"Read model refreshed: {self.rows} rows, {len(index)} keys "
+            f"in {self.last_refresh_seconds:.2f} seconds"
+        )
+        return True
+
+    def lookup(self, state: str, date: str, hour: str) -> List[dict]:
+        """
+        Get the records for a state at a given date and hour.
+
+        Args:
+            state (str): The state capital (case-insensitive).
+            date (str): Date in 'YYYY-MM-DD' format.
+            hour (str): Hour in 'HH:00' format.
+
+        Returns:
+            List[dict]: Matching weather records.
+        """
+        return list(self._index.get((state.lower().strip(), date, hour), []))
+
+    def frame(self) -> pd.DataFrame:
+        """
+        The DataFrame the current index was built from, for range scans.
+
+        Returns:
+            pd.DataFrame: All records of the last successful refresh.
+        """
+        return self._data
+
+    def _run(self) -> None:
+        # the first load runs here too, so startup never waits for the store
+        self.refresh()
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start(self) -> None:
+        """
+        Load the records and keep refreshing them in a background thread.
+
+        Returns at once; lookups see no data (`is_loaded` is False) until
+        the first load finishes.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="read-model-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def metrics(self) -> dict:
+        """
+        Cache age and refresh statistics.
+
+        Returns:
+            dict: Metrics describing the state of the read model.
+        """
+        with self._lock:
+            return {
+                "loaded": self.is_loaded,
+                "age_seconds": time.time() - self.loaded_at if self.loaded_at else None,
+                "rows": self.rows,
+                "keys": len(self._index),
+                "refresh_interval_seconds": self.refresh_interval,
+                "refresh_count": self.refresh_count,
+                "failure_count": self.failure_count,
+                "last_refresh_seconds": self.last_refresh_seconds,
+                "last_error": self.last_error,
+            }
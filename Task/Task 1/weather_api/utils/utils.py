@@ -1,7 +1,6 @@
 from datetime import  datetime
 from datetime import timedelta
 import json
-from weather_api.utils.google_sheet_utils import connect_to_sheet, get_all_record
 
 
 def get_current_time():
@@ -19,66 +18,170 @@ def get_current_time():
 
     return str(now.date()), full_hour.strftime("%H:00")
 
-def check_if_current_data_indb(sheet_name, service_key_path):
+def check_if_current_data_indb(storage):
     """
-    Check if weather data for the current date exists in the database (Google Sheets).
+    Check if weather data for the current date exists in the database.
+
+    Only the store's freshness metadata is read, so the check takes the same
+    time however much history is stored.
 
     Args:
-        sheet_name (str): Name of the Google Sheet.
-        service_key_path (str): Path to the service key for authentication.
+        storage (WeatherStorage): The configured weather store.
 
     Returns:
         bool: True if current date data is found, False otherwise.
     """
-    data = get_all_record(connect_to_sheet(sheet_name, service_key_path))
     current_date, _ = get_current_time()
+    return storage.has_date(current_date)
 
-    if data.empty:
-        return False  # Explicitly return False
-
-    return not data[data["date"] == current_date].empty
-
-def query_current_weather_info(state_capital: str, service_key_path, sheet_name, get_current_time):
+def query_current_weather_info(state_capital: str, storage, get_current_time):
     """
-    Query weather information for a given state capital from Google Sheets.
+    Query weather information for a given state capital from the weather store.
 
     Args:
         state_capital (str): Name of the state capital.
-        service_key_path (str): Path to the service key for authentication.
-        sheet_name (str): Name of the Google Sheet.
+        storage (WeatherStorage): The configured weather store.
         get_current_time (function): Function to fetch the current date and time.
 
     Returns:
         list or str: List of matching weather records in dictionary format or an error message in JSON.
     """
     try:
-        # Convert input to lowercase and strip spaces
-        state_capital = state_capital.lower().strip()
-
-        # Get all records from Google Sheets
-        data = get_all_record(connect_to_sheet(sheet_name, service_key_path))
+        # Get all records from the weather store
+        data = storage.load()
 
         # Get the current date and time
         current_date, current_time = get_current_time()
 
-        # Ensure required columns exist
-        required_columns = {"state", "date", "time"}
-        if not required_columns.issubset(data.columns):
-            missing_cols = required_columns - set(data.columns)
-            raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
-
-        # Convert 'state' column to lowercase
-        data["state"] = data["state"].str.lower()
-
         # Filter the DataFrame for matching date, time, and state
-        match = data[
-            (data["date"] == current_date)
-            & (data["time"] == current_time)
-            & (data["state"] == state_capital)
-        ]
+        match = filter_weather_data(
+            data,
+            [state_capital],
+            start_date=current_date,
+            end_date=current_date,
+            start_hour=current_time,
+            end_hour=current_time,
+        )
 
         # Return the filtered data as JSON
         return match.to_dict(orient="records")
 
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=4)
\ No newline at end of file
+        return json.dumps({"error": str(e)}, indent=4)
+
+def parse_date(value):
+    """
+    Validate a date query parameter.
+
+    Args:
+        value (str, optional): Date in 'YYYY-MM-DD' format.
+
+    Returns:
+        str or None: The date as 'YYYY-MM-DD' (None if not given).
+
+    Raises:
+        ValueError: If the value is not a 'YYYY-MM-DD' date.
+    """
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def parse_hour(value):
+    """
+    Validate an hour query parameter.
+
+    Hours are stored as 'HH:00', so '7', '07' and '07:00' all become '07:00'
+    (comparing '7' with the stored text would match the wrong rows).
+
+    Args:
+        value (str, optional): Hour as 'HH:MM' or a number from 0 to 23.
+
+    Returns:
+        str or None: The hour as 'HH:MM' (None if not given).
+
+    Raises:
+        ValueError: If the value is not an hour of the day.
+    """
+    if value is None:
+        return None
+    text = value.strip()
+    try:
+        hour = datetime.strptime(text, "%H:%M") if ":" in text else datetime.strptime(text, "%H")
+    except ValueError:
+        raise ValueError(f"Invalid hour {value!r}, expected HH:00")
+    return hour.strftime("%H:%M")
+
+
+def filter_weather_data(
+    data,
+    states,
+    start_date=None,
+    end_date=None,
+    start_hour=None,
+    end_hour=None,
+):
+    """
+    Filter weather records by states, an inclusive date range and an inclusive hour range.
+
+    Dates ('YYYY-MM-DD') and hours ('HH:MM') compare correctly as strings, so
+    the whole filter is one vectorized pass over the DataFrame.
+
+    Args:
+        data (pd.DataFrame): Weather records.
+        states (list): State capitals to keep (case-insensitive).
+        start_date (str, optional): First date to keep.
+        end_date (str, optional): Last date to keep.
+        start_hour (str, optional): First hour to keep, e.g. '06:00'.
+        end_hour (str, optional): Last hour to keep, e.g. '18:00'.
+
+    Returns:
+        pd.DataFrame: The matching records.
+    """
+    # Nothing stored yet
+    if data.empty:
+        return data
+
+    # Ensure required columns exist
+    required_columns = {"state", "date", "time"}
+    if not required_columns.issubset(data.columns):
+        missing_cols = required_columns - set(data.columns)
+        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
+
+    # Convert input to lowercase and strip spaces
+    states = [state.lower().strip() for state in states]
+
+    mask = data["state"].astype(str).str.lower().isin(states)
+    dates = data["date"].astype(str)
+    hours = data["time"].astype(str)
+    if start_date:
+        mask &= dates >= start_date
+    if end_date:
+        mask &= dates <= end_date
+    if start_hour:
+        mask &= hours >= start_hour
+    if end_hour:
+        mask &= hours <= end_hour
+
+    return data[mask]
+
+def to_arrow_ipc(data) -> bytes:
+    """
+    Serialize a DataFrame as an Arrow IPC stream.
+
+    Args:
+        data (pd.DataFrame): The records to serialize.
+
+    Returns:
+        bytes: The Arrow IPC stream.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -19,107 +19,198 @@ https://fastapi.tiangolo.com/tutorial/query-params/
 import sys 
 # Set all dependencies (module) part
 sys.path.append('../')
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.encoders import jsonable_encoder
+from typing import Optional
+import pyarrow as pa
 
-from processor.aggregate import PolarsAggregation, PandasAggregation
-from processor.clean import pd_transform_data, pl_transform_data
+from processor.aggregate import parse_metrics
+from processor.exports import choose_encoding
 from processor.utils import pl_download_data, pd_download_data
-from processor.load_data import download_extract_zip_file
-from api.config import URL
+from api.data_manager import data_manager
+from api.responses import FastJSONResponse, stream_table
 
-# Access data
-data_path = download_extract_zip_file(URL, "online_retail.zip")
+# The data is loaded by `data_manager` once the server is up (see main.py);
+# handlers get it through `data_manager.get()`, which answers 503 until then.
 
-# Transformed data using both pandas and polars
-pd_transformed_data = pd_transform_data(data_path)
-pl_transformed_data = pl_transform_data(data_path)
-pandas_agg = PandasAggregation(pd_transformed_data)
-polars_agg = PolarsAggregation(pl_transformed_data)
+# Download files, built once per data version (pruned by the data manager)
+exports = data_manager.exports
 
 # Set API router
 router = APIRouter()
 
+@router.get("/health", tags=["Status"])
+async def get_health():
+    """Liveness: the server is up. Also reports the data loading state."""
+    return JSONResponse(content=jsonable_encoder(data_manager.health()))
+
+@router.get("/ready", tags=["Status"])
+async def get_ready():
+    """Readiness: 200 once the data is loaded, 503 before that."""
+    status_code = 200 if data_manager.ready else 503
+    return JSONResponse(status_code=status_code, content=jsonable_encoder(data_manager.health()))
+
+def processed_response(table: pa.Table, format: str):
+    """A page of processed rows as JSON, or the rows streamed as NDJSON / Arrow IPC."""
+    if format == "json":
+        return FastJSONResponse(content=table.to_pylist())
+    return stream_table(table, format)
+
 # Get processed data
+# format=json returns one page (limit defaults to 20); format=ndjson|arrow
+# streams every row from skip on unless a limit is given
 @router.get("/processed_data/", tags=["Pandas"])
-async def pd_get_processed_data(skip: int = 0, limit: int = 20):
-    json_compatible_item_data = jsonable_encoder(pd_transformed_data)
-    return JSONResponse(content=json_compatible_item_data[skip: skip + limit])
+async def pd_get_processed_data(
+    skip: int = 0,
+    limit: Optional[int] = None,
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$"),
+):
+    if limit is None and format == "json":
+        limit = 20
+    end = None if limit is None else skip + limit
+    # slice first so only the requested rows are converted and encoded
+    data = data_manager.get()
+    table = pa.Table.from_pandas(data.pandas.iloc[skip:end], preserve_index=False)
+    return processed_response(table, format)
 
 @router.get("/pl_processed_data/", tags=["Polars"])
-async def pl_get_processed_data(skip: int = 0, limit: int = 20):
-    json_compatible_item_data = jsonable_encoder(pl_transformed_data)
-    return JSONResponse(content=json_compatible_item_data[skip: skip + limit])
+async def pl_get_processed_data(
+    skip: int = 0,
+    limit: Optional[int] = None,
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$"),
+):
+    if limit is None and format == "json":
+        limit = 20
+    # slicing is zero-copy, only the requested rows are encoded
+    table = data_manager.get().polars.slice(skip, limit).to_arrow()
+    return processed_response(table, format)
+
+DOWNLOAD_MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "json": "application/x-ndjson"}
+
+def download_response(request: Request, engine: str, format: str) -> Response:
+    """
+    Send the processed data as a Parquet or JSON (one record per line) file.
+
+    The file is written once per data version and then served from disk,
+    with an ETag (304 on If-None-Match), HTTP Range support and a gzip or
+    zstd copy for clients that accept it.
+    """
+    data = data_manager.get()
+    encoding = choose_encoding(format, request.headers.get("accept-encoding"))
+    etag = f'"{data.version[:16]}-{engine}-{format}-{encoding or "identity"}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    if engine == "pandas":
+        write = lambda extension, file_name: pd_download_data(data.pandas, extension, file_name)
+    else:
+        write = lambda extension, file_name: pl_download_data(data.polars, extension, file_name)
+
+    path = exports.get(data.version, engine, format, write, encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return FileResponse(
+        path,
+        media_type=DOWNLOAD_MEDIA_TYPES[format],
+        filename=f"online_retail.{format}",
+        headers=headers,
+    )
 
 # Download data using pandas
 @router.get("/download-json/", tags=["Pandas"])
-async def pd_download_json():
-    pd_download_data("json")
-    return {"message": "Saved successfully!"}
+def pd_download_json(request: Request):
+    return download_response(request, "pandas", "json")
 
 @router.get("/download-parquet/", tags=["Pandas"])
-async def pd_download_parquet():
-    pd_download_data("parquet")
-    return {"message": "Saved successfully!"}
+def pd_download_parquet(request: Request):
+    return download_response(request, "pandas", "parquet")
 
 # Download data using polars
 @router.get("/pl_download-json/", tags=["Polars"])
-async def pl_download_json():
-    pl_download_data("json")
-    return {"message": "Saved successfully!"}
+def pl_download_json(request: Request):
+    return download_response(request, "polars", "json")
 
 @router.get("/pl_download-parquet/", tags=["Polars"])
-async def pl_download_parquet():
-    pl_download_data("parquet")
-    return {"message": "Saved successfully!"}
+def pl_download_parquet(request: Request):
+    return download_response(request, "polars", "parquet")
+
+@router.get("/aggregate", tags=["Aggregate"])
+def get_aggregate(
+    group_by: str = Query("Country", description="Comma-separated columns, e.g. Country"),
+    metrics: str = Query(
+        "sum:Amount", description="Comma-separated aggregation:column pairs, e.g. sum:Amount,nunique:Customer ID,mean:Amount"
+    ),
+    engine: str = Query("polars", pattern="^(pandas|polars)$"),
+    skip: int = 0,
+    limit: int = 20,
+):
+    """
+    Group the processed data and compute several metrics in a single pass.
+
+    Supported aggregations: count, sum, mean, nunique, min, max, median
+    (sum, mean and median need a numeric column). Null group keys form their
+    own group, and every aggregation ignores null values, on both engines.
+    Each metric becomes a column named `aggregation_column`.
+
+    A plain `def`, so FastAPI runs the groupby in its thread pool instead of
+    blocking the event loop.
+    """
+    data = data_manager.get()
+    try:
+        columns = [column.strip() for column in group_by.split(",") if column.strip()]
+        requested = parse_metrics(metrics)
+        if engine == "pandas":
+            result = data.pandas_agg.aggregate(columns, requested)
+            result = result.iloc[skip: skip + limit].to_dict(orient="records")
+        else:
+            result = data.polars_agg.aggregate(columns, requested)
+            result = result.slice(skip, limit).to_dicts()
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    return JSONResponse(content=jsonable_encoder(result))
+
+def aggregate_page(group_by: str, metric: str, skip: int, limit: int) -> JSONResponse:
+    """Return a page of a precomputed aggregate as JSON records."""
+    data = data_manager.get().aggregates.page(group_by, metric, skip, limit)
+    json_compatible_item_data = jsonable_encoder(data.to_dicts())
+    return JSONResponse(content=json_compatible_item_data)
 
 # Get aggregate using pandas
 @router.get("/aggregate/transaction_per_country", tags=["Pandas"])
 async def pd_get_transaction_per_country(skip: int = 0, limit: int = 20):
-    data = pandas_agg.pd_transaction_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "transactions", skip, limit)
 
 @router.get("/aggregate/transaction_revenue_per_country", tags=["Pandas"])
 async def pd_get_transaction_revenue_per_country(skip: int = 0, limit: int = 20):
-    data = pandas_agg.pd_transaction_revenue_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "revenue", skip, limit)
 
 @router.get("/aggregate/unique_customers_per_country", tags=["Pandas"])
 async def pd_get_unique_customers_per_country(skip: int = 0, limit: int = 20):
-    data = pandas_agg.pd_unique_customers_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "unique_customers", skip, limit)
 
 @router.get("/aggregate/average_order_value_per_country", tags=["Pandas"])
 async def pd_get_average_order_value_per_country(skip: int = 0, limit: int = 20):
-    data = pandas_agg.pd_average_order_value_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "average_order_value", skip, limit)
 
 # Get aggregate using polars
 @router.get("/aggregate/pl_transaction_per_country", tags=["Polars"])
 async def pl_get_transaction_per_country(skip: int = 0, limit: int = 20):
-    data = polars_agg.pl_transaction_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "transactions", skip, limit)
 
 @router.get("/aggregate/pl_transaction_revenue_per_country", tags=["Polars"])
 async def pl_get_transaction_revenue_per_country(skip: int = 0, limit: int = 20):
-    data = polars_agg.pl_transaction_revenue_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "revenue", skip, limit)
 
 @router.get("/aggregate/pl_unique_customers_per_country", tags=["Polars"])
 async def pl_get_unique_customers_per_country(skip: int = 0, limit: int = 20):
-    data = polars_agg.pl_unique_customers_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "unique_customers", skip, limit)
 
 @router.get("/aggregate/pl_average_order_value_per_country", tags=["Polars"])
 async def pl_get_average_order_value_per_country(skip: int = 0, limit: int = 20):
-    data = polars_agg.pl_average_order_value_per_country()
-    json_compatible_item_data = jsonable_encoder(data[skip: skip + limit])
-    return JSONResponse(content=json_compatible_item_data)
+    return aggregate_page("Country", "average_order_value", skip, limit)
@@ -1 +1,7 @@
-URL = 'http://archive.ics.uci.edu/static/public/502/online+retail+ii.zip'
\ No newline at end of file
+URL = 'http://archive.ics.uci.edu/static/public/502/online+retail+ii.zip'
+
+ZIP_FILE_NAME = "online_retail.zip"
+
+# seconds before retrying a failed data load, doubled after each failure up to the maximum
+LOAD_RETRY_SECONDS = 5
+LOAD_RETRY_MAX_SECONDS = 300
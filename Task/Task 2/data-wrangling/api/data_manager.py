@@ -0,0 +1,191 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+https://fastapi.tiangolo.com/advanced/events/
+https://arrow.apache.org/docs/python/pandas.html#zero-copy-series-conversions
+
+Loads the retail data after the server has started instead of at import
+time, and keeps one immutable Arrow table that both the pandas and the
+polars endpoints read from.
+"""
+import sys
+# Set all dependencies (module) part
+sys.path.append('../')
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import pyarrow as pa
+from fastapi import FastAPI, HTTPException
+
+from processor.aggregate import PandasAggregation, PolarsAggregation
+from processor.clean import pd_view, pl_view, transform_table
+from processor.cube import AggregateStore
+from processor.exports import ExportCache
+from processor.load_data import download_extract_zip_file
+from processor.utils import data_version
+from api.config import LOAD_RETRY_MAX_SECONDS, LOAD_RETRY_SECONDS, URL, ZIP_FILE_NAME
+
+# Data manager states
+STARTING = "starting"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LoadedData:
+    """
+    One version of the transformed data and everything built from it.
+
+    `table` holds the rows; `pandas` and `polars` are views over its Arrow
+    buffers (see `processor.clean.pd_view` / `pl_view`).
+    """
+
+    def __init__(self, data_path: str, version: str, table: pa.Table, aggregates: AggregateStore):
+        self.data_path = data_path
+        self.version = version
+        self.table = table
+        self.polars = pl_view(table)
+        self.pandas = pd_view(table)
+        self.pandas_agg = PandasAggregation(self.pandas)
+        self.polars_agg = PolarsAggregation(self.polars)
+        self.aggregates = aggregates
+
+
+class DataManager:
+    """
+    Loads the data in the background and reports readiness.
+    """
+
+    def __init__(self, retry_seconds: float = LOAD_RETRY_SECONDS, max_retry_seconds: float = LOAD_RETRY_MAX_SECONDS):
+        """
+        Args:
+            retry_seconds (float): Wait before retrying a failed load, doubled
+                after each failure.
+            max_retry_seconds (float): Longest wait between retries.
+        """
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.state = STARTING
+        self.error: Optional[str] = None
+        self.data: Optional[LoadedData] = None
+        self.loaded_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self.aggregates = AggregateStore()
+        self.exports = ExportCache()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.data is not None
+
+    def load(self) -> LoadedData:
+        """
+        Download (if needed), transform and publish the data.
+
+        The new data replaces the old one in a single assignment, so requests
+        see either the old or the new version, never a mix.
+        """
+        self.state = LOADING
+        start_time = time.time()
+        try:
+            data_path = download_extract_zip_file(URL, ZIP_FILE_NAME)
+            version = data_version(data_path)
+            table = transform_table(data_path)
+            data = LoadedData(data_path, version, table, self.aggregates)
+            self.aggregates.ensure(data.polars.lazy(), version)
+        except Exception as e:
+            self.state = FAILED if self.data is None else READY
+            self.error = str(e)
+            print(f"Error loading data: {e}")
+            raise
+
+        previous = self.data
+        self.data = data
+        # the previous version's files stay for downloads already under way
+        self.exports.prune([version] + ([previous.version] if previous else []))
+        self.state = READY
+        self.error = None
+        self.loaded_at = time.time()
+        self.load_seconds = self.loaded_at - start_time
+        print(f"Data version {version} loaded: {table.num_rows} rows in {self.load_seconds:.2f} seconds")
+        return data
+
+    async def _load_in_background(self) -> None:
+        """Load the data, retrying with exponential backoff until it succeeds."""
+        delay = self.retry_seconds
+        while True:
+            try:
+                await asyncio.to_thread(self.load)
+                return
+            except Exception:
+                # already recorded in self.error and reported by /ready
+                pass
+            print(f"Retrying the data load in {delay:g} seconds")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_seconds)
+
+    def start(self) -> None:
+        """Start loading on the running event loop without waiting for it."""
+        self._task = asyncio.create_task(self._load_in_background())
+
+    async def stop(self) -> None:
+        """Stop loading or retrying (a load already running in its thread is left to finish)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get(self) -> LoadedData:
+        """
+        The loaded data, for request handlers.
+
+        Raises:
+            HTTPException: 503 while the data is not loaded yet.
+        """
+        data = self.data
+        if data is None:
+            raise HTTPException(status_code=503, detail=f"Data is {self.state}, try again shortly")
+        return data
+
+    def health(self) -> dict:
+        """
+        State of the data manager.
+
+        Returns:
+            dict: State, data version, row count, load time and last error.
+        """
+        data = self.data
+        return {
+            "state": self.state,
+            "ready": data is not None,
+            "version": data.version if data else None,
+            "rows": data.table.num_rows if data else None,
+            "memory_mb": round(data.table.nbytes / 2**20, 2) if data else None,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+# Shared by every request handler
+data_manager = DataManager()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start loading the data once the server is up (the port binds
+    immediately) and stop loading on shutdown.
+    """
+    data_manager.start()
+    yield
+    await data_manager.stop()
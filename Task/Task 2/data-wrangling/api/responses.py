@@ -0,0 +1,110 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+https://github.com/ijl/orjson
+https://fastapi.tiangolo.com/advanced/custom-response/#streamingresponse
+https://arrow.apache.org/docs/python/ipc.html#using-streams
+
+Responses built from Arrow data: a page is sliced before it is encoded, and
+full exports are streamed record batch by record batch as NDJSON or Arrow
+IPC, so a large export never becomes one JSON document in memory.
+"""
+import io
+import json
+from typing import Iterable, Iterator
+
+import pyarrow as pa
+from fastapi.responses import Response, StreamingResponse
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # fall back to the standard library encoder
+    HAS_ORJSON = False
+
+# rows per streamed record batch
+BATCH_SIZE = 10_000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(content) -> bytes:
+    """Encode to JSON bytes with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with `dumps` (orjson when available)."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def iter_ndjson(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    """Yield one NDJSON chunk per record batch."""
+    for batch in batches:
+        rows = batch.to_pylist()
+        if rows:
+            yield b"\n".join(dumps(row) for row in rows) + b"\n"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write target that hands out what was written since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        return len(chunk)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_arrow_ipc(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    """Yield an Arrow IPC stream, one chunk per record batch."""
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_table(table: pa.Table, format: str) -> StreamingResponse:
+    """
+    Stream an Arrow table as NDJSON or an Arrow IPC stream.
+
+    Args:
+        table (pa.Table): The rows to send.
+        format (str): "ndjson" or "arrow".
+
+    Returns:
+        StreamingResponse: The streamed rows.
+    """
+    batches = table.to_batches(max_chunksize=BATCH_SIZE)
+    if format == "arrow":
+        return StreamingResponse(iter_arrow_ipc(table.schema, batches), media_type=ARROW_MEDIA_TYPE)
+    return StreamingResponse(iter_ndjson(batches), media_type=NDJSON_MEDIA_TYPE)
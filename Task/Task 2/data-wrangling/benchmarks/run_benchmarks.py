@@ -0,0 +1,295 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+Pandas vs Polars on every cleaning and aggregation operation of
+`processor/clean.py` and `processor/aggregate.py`, on synthetic retail data
+at several scales.
+
+For each (scale, operation, engine) the input is loaded first and not timed;
+then the operation runs `--repeat` times. Reported per run:
+    seconds          - best wall time (median_seconds: median)
+    peak_rss_mb      - highest resident memory while the operation ran,
+                       sampled every few milliseconds (covers the native
+                       Arrow/Polars allocations Python cannot see)
+    op_rss_mb        - peak_rss_mb minus resident memory before it started
+    peak_alloc_mb    - peak Python heap allocations (--trace-alloc only)
+
+Every measurement runs in a fresh process so one run's memory does not
+leak into the next (--no-isolate runs them in this process).
+
+Run from the data-wrangling folder:
+    python -m benchmarks.run_benchmarks --rows 100000,1000000,10000000,50000000 \\
+        --output bench.json --markdown bench.md
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import polars as pl
+import psutil
+
+from benchmarks.synthetic import write_dataset
+from processor.aggregate import PandasAggregation, PolarsAggregation, parse_metrics
+from processor.clean import pd_clean, pl_clean
+
+ENGINES = ["pandas", "polars"]
+
+MULTI_METRIC = parse_metrics("sum:Amount,nunique:Customer ID,mean:Amount,count:Invoice")
+
+# operation -> (input, pandas function, polars function); input "raw" is the
+# generated data, "clean" is the same data after the cleaning step
+OPERATIONS = {
+    "clean": (
+        "raw",
+        lambda df: pd_clean(df),
+        lambda df: pl_clean(df.lazy()).collect(),
+    ),
+    "transaction_per_country": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_transaction_per_country(),
+        lambda df: PolarsAggregation(df).pol_transaction_per_country(),
+    ),
+    "transaction_revenue_per_country": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_transaction_revenue_per_country(),
+        lambda df: PolarsAggregation(df).pol_transaction_revenue_per_country(),
+    ),
+    "unique_customers_per_country": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_unique_customers_per_country(),
+        lambda df: PolarsAggregation(df).pol_unique_customers_per_country(),
+    ),
+    "average_order_value_per_country": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_average_order_value_per_country(),
+        lambda df: PolarsAggregation(df).pol_average_order_value_per_country(),
+    ),
+    "transactions_per_customer": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_transactions_per_customer(),
+        lambda df: PolarsAggregation(df).pol_transactions_per_customer(),
+    ),
+    "total_amount_spent_per_customer": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_total_amount_spent_per_customer(),
+        lambda df: PolarsAggregation(df).pol_total_amount_spent_per_customer(),
+    ),
+    "average_order_value_per_customer": (
+        "clean",
+        lambda df: PandasAggregation(df).pd_average_order_value_per_customer(),
+        lambda df: PolarsAggregation(df).pol_average_order_value_per_customer(),
+    ),
+    "multi_metric_per_country": (
+        "clean",
+        lambda df: PandasAggregation(df).aggregate(["Country"], MULTI_METRIC),
+        lambda df: PolarsAggregation(df).aggregate(["Country"], MULTI_METRIC),
+    ),
+}
+
+
+class RssSampler:
+    """Records the highest resident memory of this process in a background thread."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def load_input(engine: str, path: str):
+    """Load a benchmark input with the engine under test."""
+    if engine == "pandas":
+        return pd.read_parquet(path)
+    return pl.read_parquet(path)
+
+
+def measure(engine: str, operation: str, path: str, repeat: int, trace_alloc: bool) -> dict:
+    """
+    Time one operation on one engine.
+
+    Returns:
+        dict: Wall time and memory figures (see the module docstring).
+    """
+    _, pandas_function, polars_function = OPERATIONS[operation]
+    function = pandas_function if engine == "pandas" else polars_function
+
+    df = load_input(engine, path)
+    gc.collect()
+    rss_before = psutil.Process().memory_info().rss
+
+    times = []
+    with RssSampler() as sampler:
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            result = function(df)
+            times.append(time.perf_counter() - start_time)
+            if result is None:
+                raise RuntimeError(f"{engine} {operation} failed")
+            del result
+
+    measurement = {
+        "seconds": round(min(times), 6),
+        "median_seconds": round(statistics.median(times), 6),
+        "rss_before_mb": round(rss_before / 2**20, 2),
+        "peak_rss_mb": round(sampler.peak / 2**20, 2),
+        "op_rss_mb": round(max(sampler.peak - rss_before, 0) / 2**20, 2),
+    }
+
+    if trace_alloc:
+        tracemalloc.start()
+        function(df)
+        measurement["peak_alloc_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+
+    return measurement
+
+
+def measure_isolated(*args) -> dict:
+    """Run `measure` in a fresh process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(measure, *args).result()
+
+
+def prepare_inputs(rows: int, workdir: str) -> dict:
+    """Generate (or reuse) the raw and cleaned inputs for one scale."""
+    raw = os.path.join(workdir, f"raw_{rows}.parquet")
+    clean = os.path.join(workdir, f"clean_{rows}.parquet")
+    if not os.path.exists(raw):
+        write_dataset(rows, raw)
+    if not os.path.exists(clean):
+        pl_clean(pl.scan_parquet(raw)).sink_parquet(clean)
+    return {"raw": raw, "clean": clean}
+
+
+def compare(results: list) -> list:
+    """Side-by-side pandas/polars seconds and the faster engine per operation and scale."""
+    by_key = {}
+    for result in results:
+        by_key.setdefault((result["rows"], result["operation"]), {})[result["engine"]] = result
+
+    comparison = []
+    for (rows, operation), engines in by_key.items():
+        row = {"rows": rows, "operation": operation}
+        for engine, result in engines.items():
+            row[f"{engine}_seconds"] = result["seconds"]
+            row[f"{engine}_op_rss_mb"] = result["op_rss_mb"]
+        if len(engines) == 2:
+            fastest = min(engines, key=lambda engine: engines[engine]["seconds"])
+            slowest = max(engines, key=lambda engine: engines[engine]["seconds"])
+            row["faster"] = fastest
+            row["speedup"] = round(engines[slowest]["seconds"] / max(engines[fastest]["seconds"], 1e-9), 2)
+        comparison.append(row)
+    return comparison
+
+
+def run(rows_list, engines=ENGINES, operations=None, repeat=3, isolate=True,
+        trace_alloc=False, workdir=os.path.join("data", "bench")) -> dict:
+    """
+    Benchmark every operation on every engine at every scale.
+
+    Returns:
+        dict: Machine-readable report with raw results and a comparison.
+    """
+    operations = operations or list(OPERATIONS)
+    results = []
+    for rows in rows_list:
+        inputs = prepare_inputs(rows, workdir)
+        for operation in operations:
+            for engine in engines:
+                args = (engine, operation, inputs[OPERATIONS[operation][0]], repeat, trace_alloc)
+                result = measure_isolated(*args) if isolate else measure(*args)
+                results.append({"rows": rows, "operation": operation, "engine": engine, **result})
+                print(f"{rows:>10} {operation:<34} {engine:<7} {result['seconds']:.4f}s", file=sys.stderr)
+
+    return {
+        "versions": {"pandas": pd.__version__, "polars": pl.__version__, "python": sys.version.split()[0]},
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "results": results,
+        "comparison": compare(results),
+    }
+
+
+def to_markdown(report: dict) -> str:
+    """The comparison as a Markdown table."""
+    lines = [
+        "| rows | operation | pandas s | polars s | pandas MB | polars MB | faster | speedup |",
+        "|---:|---|---:|---:|---:|---:|---|---:|",
+    ]
+    for row in report["comparison"]:
+        lines.append(
+            f"| {row['rows']:,} | {row['operation']} | {row.get('pandas_seconds', '')} | "
+            f"{row.get('polars_seconds', '')} | {row.get('pandas_op_rss_mb', '')} | "
+            f"{row.get('polars_op_rss_mb', '')} | {row.get('faster', '')} | {row.get('speedup', '')}x |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100000,1000000", help="comma-separated scales, e.g. 100000,1000000,10000000,50000000")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--operations", default=",".join(OPERATIONS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-isolate", action="store_true", help="measure in this process instead of a fresh one per run")
+    parser.add_argument("--trace-alloc", action="store_true", help="record peak Python allocations per run")
+    parser.add_argument("--workdir", default=os.path.join("data", "bench"), help="where generated inputs are kept")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--markdown", help="also write the comparison table to this file")
+    args = parser.parse_args()
+
+    report = run(
+        [int(rows) for rows in args.rows.split(",")],
+        engines=args.engines.split(","),
+        operations=args.operations.split(","),
+        repeat=args.repeat,
+        isolate=not args.no_isolate,
+        trace_alloc=args.trace_alloc,
+        workdir=args.workdir,
+    )
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.markdown:
+        with open(args.markdown, "w") as f:
+            f.write(to_markdown(report))
+
+
+if __name__ == "__main__":
+    main()
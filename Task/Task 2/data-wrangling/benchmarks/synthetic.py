@@ -0,0 +1,100 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+Synthetic Online Retail II data at any scale, with the same columns and
+roughly the same shape as the real workbook: repeated invoices, a few
+thousand stock codes, about a fifth of rows without a customer, a skewed
+country mix and some cancelled (negative) or zero-priced rows for the
+cleaning step to drop.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import os
+
+import numpy as np
+import polars as pl
+import pyarrow.parquet as pq
+
+COUNTRIES = [
+    "United Kingdom", "EIRE", "Germany", "France", "Netherlands", "Spain",
+    "Switzerland", "Belgium", "Portugal", "Australia", "Channel Islands",
+    "Italy", "Norway", "Sweden", "Cyprus", "Finland", "Austria", "Denmark",
+    "Greece", "Japan", "Poland", "USA", "Israel", "Unspecified", "Singapore",
+    "Iceland", "Canada", "Malta", "Lithuania", "Brazil",
+]
+
+# rows generated at a time, so large scales never sit in memory at once
+CHUNK_ROWS = 1_000_000
+
+
+def generate_chunk(rows: int, offset: int, seed: int) -> pl.DataFrame:
+    """One chunk of synthetic rows; `offset` keeps invoice numbers increasing."""
+    rng = np.random.default_rng(seed)
+
+    invoice = 489_434 + (offset + np.arange(rows)) // 20
+    stock = rng.integers(10_000, 14_000, rows)
+    quantity = rng.integers(1, 25, rows)
+    quantity[rng.random(rows) < 0.02] *= -1  # cancellations
+    price = np.round(rng.gamma(2.0, 2.0, rows), 2)
+    price[rng.random(rows) < 0.005] = 0.0
+    # one customer per invoice, as in the real data
+    invoice_customer = rng.integers(12_346, 18_288, rows // 20 + 2).astype(float)
+    invoice_customer[rng.random(len(invoice_customer)) < 0.2] = np.nan
+    customer = invoice_customer[invoice - invoice[0]]
+    # about 90% of rows are from the United Kingdom, as in the real data
+    country = np.array(COUNTRIES)[
+        np.where(rng.random(rows) < 0.9, 0, rng.integers(1, len(COUNTRIES), rows))
+    ]
+    seconds = rng.integers(0, 2 * 365 * 24 * 3600, rows)
+
+    return pl.DataFrame(
+        {
+            "Invoice": invoice,
+            "StockCode": stock,
+            "Description": stock,
+            "Quantity": quantity,
+            "InvoiceDate": seconds,
+            "Price": price,
+            "Customer ID": customer,
+            "Country": country,
+        }
+    ).with_columns(
+        pl.col("Invoice").cast(pl.String),
+        pl.col("StockCode").cast(pl.String),
+        pl.format("PRODUCT {}", pl.col("Description")).alias("Description"),
+        (pl.datetime(2009, 12, 1) + pl.duration(seconds=pl.col("InvoiceDate"))).alias("InvoiceDate"),
+        pl.col("Customer ID").fill_nan(None),
+    )
+
+
+def write_dataset(rows: int, path: str, seed: int = 0, row_group_size: int = None) -> str:
+    """
+    Write `rows` synthetic rows to a Parquet file, chunk by chunk.
+
+    Args:
+        rows (int): Number of rows.
+        path (str): Output Parquet file.
+        seed (int): Random seed; the same seed gives the same data.
+        row_group_size (int, optional): Rows per Parquet row group
+            (default: one per chunk).
+
+    Returns:
+        str: The path.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    writer = None
+    try:
+        for index, offset in enumerate(range(0, rows, CHUNK_ROWS)):
+            chunk = generate_chunk(min(CHUNK_ROWS, rows - offset), offset, seed + index)
+            table = chunk.to_arrow(compat_level=pl.CompatLevel.oldest())
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table, row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
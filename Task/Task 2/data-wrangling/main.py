@@ -7,6 +7,7 @@ Email: adedoyinsamuel25@gmail.com
 """
 from fastapi import FastAPI
 from api.api import router
+from api.data_manager import lifespan
 import uvicorn
 
 
@@ -20,6 +21,7 @@ app = FastAPI(
         "name": "Adedoyin Samuel",
         "email": "adedoyinsamuel25@gmail.com",
     },
+    lifespan=lifespan,
 )
 
 app.include_router(router)
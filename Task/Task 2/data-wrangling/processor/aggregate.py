@@ -5,6 +5,8 @@ Email: adedoyinsamuel25@gmail.com
 
 https://gist.github.com/niftycode/a747648db1b79396b8e4814946a4dba2
 https://docs.pola.rs/api/python/dev/reference/api/polars.read_excel.html
+https://pandas.pydata.org/docs/user_guide/groupby.html#named-aggregation
+https://docs.pola.rs/user-guide/concepts/_streaming/
 
 
 
@@ -16,121 +18,328 @@ https://docs.pola.rs/api/python/dev/reference/api/polars.read_excel.html
 4. Expose results via a FastAPI endpoint (`/aggregate`).
 
 """
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+from typing import Dict, List, Tuple
 
 import pandas as pd
 import polars as pl
 
+from processor.config import MEMORY_BUDGET_MB
+from processor.streaming import streaming_collect_all
+
+# aggregation name -> (pandas function, polars expression builder).
+# Both engines follow one null rule: null group keys form their own group
+# and every aggregation, nunique included, ignores null values.
+AGGREGATIONS = {
+    "count": ("count", lambda col: pl.col(col).count()),
+    "sum": ("sum", lambda col: pl.col(col).sum()),
+    "mean": ("mean", lambda col: pl.col(col).mean()),
+    "nunique": ("nunique", lambda col: pl.col(col).drop_nulls().n_unique()),
+    "min": ("min", lambda col: pl.col(col).min()),
+    "max": ("max", lambda col: pl.col(col).max()),
+    "median": ("median", lambda col: pl.col(col).median()),
+}
+
+# aggregations that only make sense on numeric columns
+NUMERIC_AGGREGATIONS = {"sum", "mean", "median"}
+
+# aggregations that run out of core: the streaming engine folds them batch by
+# batch (nunique is counted from the distinct (group, column) pairs); median
+# needs every value of a group at once
+STREAMING_AGGREGATIONS = ["count", "sum", "mean", "nunique", "min", "max"]
+
+Metric = Tuple[str, str]
+
+
+def parse_metrics(spec: str) -> List[Metric]:
+    """
+    Parse a metrics spec such as "sum:Amount,nunique:Customer ID".
+
+    Args:
+        spec (str): Comma-separated `aggregation:column` pairs.
+
+    Returns:
+        List[Metric]: (aggregation, column) pairs, in request order.
+    """
+    metrics = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        aggregation, sep, column = item.partition(":")
+        aggregation, column = aggregation.strip().lower(), column.strip()
+        if not sep or not column:
+            raise ValueError(f"Invalid metric {item!r}, expected 'aggregation:column'")
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(
+                f"Unknown aggregation {aggregation!r}, use one of {list(AGGREGATIONS)}"
+            )
+        if (aggregation, column) in metrics:
+            raise ValueError(f"Duplicate metric {aggregation}:{column}")
+        metrics.append((aggregation, column))
+
+    if not metrics:
+        raise ValueError("At least one metric is required")
+    return metrics
+
+
+def metric_name(metric: Metric) -> str:
+    """Output column name of a metric, e.g. "sum_Amount"."""
+    return f"{metric[0]}_{metric[1]}"
+
+
+def check_columns(
+    columns: List[str], group_by: List[str], metrics: List[Metric], numeric_columns: List[str] = None
+) -> None:
+    """
+    Raise ValueError when a request cannot run on the data: unknown or
+    repeated columns, repeated metrics, or a numeric aggregation (sum, mean,
+    median) of a non-numeric column.
+    """
+    if not group_by:
+        raise ValueError("At least one group column is required")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("Group columns must not repeat")
+    if len(set(metrics)) != len(metrics):
+        raise ValueError("Metrics must not repeat")
+    missing = [col for col in group_by + [col for _, col in metrics] if col not in columns]
+    if missing:
+        raise ValueError(f"Unknown columns: {', '.join(dict.fromkeys(missing))}")
+    if numeric_columns is not None:
+        invalid = [
+            f"{aggregation}:{col}" for aggregation, col in metrics
+            if aggregation in NUMERIC_AGGREGATIONS and col not in numeric_columns
+        ]
+        if invalid:
+            raise ValueError(f"Not numeric columns: {', '.join(invalid)}")
+
+
+def streaming_aggregate(
+    df: pl.LazyFrame, group_by: List[str], metrics: Dict[str, Metric], memory_mb: int = MEMORY_BUDGET_MB
+) -> pl.DataFrame:
+    """
+    Out-of-core `group_by().agg()` with the Polars streaming engine.
+
+    Args:
+        df (pl.LazyFrame): Query over the data, usually a Parquet scan.
+        group_by (List[str]): Columns to group by.
+        metrics (Dict[str, Metric]): Output column name -> (aggregation, column).
+        memory_mb (int): Memory budget in MB.
+
+    Returns:
+        pl.DataFrame: The group columns plus one column per metric, sorted by group.
+    """
+    unsupported = sorted({aggregation for aggregation, _ in metrics.values()} - set(STREAMING_AGGREGATIONS))
+    if unsupported:
+        raise ValueError(
+            f"{', '.join(unsupported)} cannot run out of core, use one of {STREAMING_AGGREGATIONS}"
+        )
+
+    folded = {name: m for name, m in metrics.items() if m[0] != "nunique"}
+    distinct = {name: m for name, m in metrics.items() if m[0] == "nunique"}
+    # the first query has every group; "__rows" keeps it valid without folded metrics
+    queries = [
+        df.group_by(group_by).agg(
+            [AGGREGATIONS[a][1](col).alias(name) for name, (a, col) in folded.items()]
+            + [pl.len().alias("__rows")]
+        )
+    ]
+    for name, (_, column) in distinct.items():
+        pairs = list(dict.fromkeys(group_by + [column]))
+        queries.append(
+            df.filter(pl.col(column).is_not_null())
+            .group_by(pairs).agg(pl.len())
+            .group_by(group_by).agg(pl.len().alias(name))
+        )
+
+    frames = streaming_collect_all(queries, df.collect_schema(), memory_mb)
+    # every query has one row per group, so the joins are small
+    result = frames[0]
+    for frame in frames[1:]:
+        result = result.join(frame, on=group_by, how="left", join_nulls=True)
+    # groups with only null values are missing from their nunique query
+    result = result.with_columns([pl.col(name).fill_null(0) for name in distinct])
+    return result.select(group_by + list(metrics)).sort(group_by, nulls_last=True)
+
 
 class PandasAggregation:
     def __init__(self, dataframe: pd.DataFrame):
         """Initialize the class with a Pandas DataFrame."""
         self.dataframe = dataframe
 
+    def aggregate(self, group_by: List[str], metrics: List[Metric], df: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Compute every metric in one groupby over the data.
+
+        Args:
+            group_by (List[str]): Columns to group by.
+            metrics (List[Metric]): (aggregation, column) pairs.
+            df (pd.DataFrame, optional): Data to use instead of the class data.
+
+        Returns:
+            pd.DataFrame: The group columns plus one column per metric, sorted by group.
+        """
+        df = self.dataframe if df is None else df
+        # booleans are not numeric here, as in Polars
+        numeric = [
+            col for col in df.columns
+            if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype)
+        ]
+        check_columns(list(df.columns), group_by, metrics, numeric)
+        return (
+            df.groupby(group_by, sort=True, dropna=False)
+            .agg(**{metric_name(m): (m[1], AGGREGATIONS[m[0]][0]) for m in metrics})
+            .reset_index()
+        )
+
+    def _single(self, group_by: List[str], metric: Metric, df: pd.DataFrame = None) -> pd.DataFrame:
+        """One metric, under the name of the column it aggregates."""
+        return self.aggregate(group_by, [metric], df).rename(columns={metric_name(metric): metric[1]})
+
     # Pandas aggregate functions
-    def pd_transaction_per_country(self,df: pd.DataFrame) -> pd.Series:
+    def pd_transaction_per_country(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Counts the number of transactions per country."""
         try:
-            return df.groupby("Country")["Invoice"].count()
+            return self._single(["Country"], ("count", "Invoice"), df)
         except Exception as e:
             print(f"Error: {e}")
 
-    def pd_transaction_revenue_per_country(self,df: pd.DataFrame) -> pd.Series:
+    def pd_transaction_revenue_per_country(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Calculates the total transaction amount per country."""
         try:
-            return df.groupby("Country")["Amount"].sum()
+            return self._single(["Country"], ("sum", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
 
-    def pd_unique_customers_per_country(self, df: pd.DataFrame) -> pd.Series:
+    def pd_unique_customers_per_country(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Counts the number of unique customers per country."""
         try:
-            return df.groupby("Country")["Customer ID"].nunique()
+            return self._single(["Country"], ("nunique", "Customer ID"), df)
         except Exception as e:
             print(f"Error: {e}")
 
-    def pd_average_order_value_per_country(self, df: pd.DataFrame) -> pd.Series:
+    def pd_average_order_value_per_country(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Computes the average order value per country."""
         try:
-            return df.groupby("Country")["Amount"].mean()
+            return self._single(["Country"], ("mean", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
 
-    def pd_transactions_per_customer(self, df: pd.DataFrame) -> pd.Series:
+    def pd_transactions_per_customer(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Counts the number of transactions per customer."""
         try:
-            return df.groupby("Customer ID")["Invoice"].nunique()
+            return self._single(["Customer ID"], ("nunique", "Invoice"), df)
         except Exception as e:
             print(f"Error: {e}")
 
-    def pd_total_amount_spent_per_customer(self, df: pd.DataFrame) -> pd.Series:
+    def pd_total_amount_spent_per_customer(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Calculates the total amount spent per customer."""
         try:
-            return df.groupby("Customer ID")["Amount"].sum()
+            return self._single(["Customer ID"], ("sum", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
 
-    def pd_average_order_value_per_customer(self, df: pd.DataFrame) -> pd.Series:
+    def pd_average_order_value_per_customer(self, df: pd.DataFrame = None) -> pd.DataFrame:
         """Computes the average order value per customer."""
         try:
-            return df.groupby("Customer ID")["Amount"].mean()
+            return self._single(["Customer ID"], ("mean", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
 
             
 class PolarsAggregation:
 
-    def __init__(self, dataframe: pd.DataFrame):
-            """Initialize the class with a Pandas DataFrame."""
-            self.dataframe = dataframe
-        
-    
+    def __init__(self, dataframe: pl.LazyFrame, out_of_core: bool = False, memory_mb: int = MEMORY_BUDGET_MB):
+        """
+        Initialize the class with a Polars LazyFrame (or DataFrame).
+
+        Every aggregation is added to this query and collected as one plan,
+        so only the columns it groups and aggregates are read from the source.
+        With `out_of_core`, plans run on the streaming engine within
+        `memory_mb` (see `streaming_aggregate`), for data larger than memory.
+        """
+        self.dataframe = dataframe.lazy()
+        self.out_of_core = out_of_core
+        self.memory_mb = memory_mb
+
+    def aggregate(self, group_by: List[str], metrics: List[Metric], df: pl.LazyFrame = None) -> pl.DataFrame:
+        """
+        Compute every metric in one `group_by().agg([...])` over the data.
+
+        Args:
+            group_by (List[str]): Columns to group by.
+            metrics (List[Metric]): (aggregation, column) pairs.
+            df (pl.LazyFrame, optional): Data to use instead of the class data.
+
+        Returns:
+            pl.DataFrame: The group columns plus one column per metric, sorted by group.
+        """
+        df = self.dataframe if df is None else df.lazy()
+        schema = df.collect_schema()
+        numeric = [col for col, dtype in schema.items() if dtype.is_numeric()]
+        check_columns(schema.names(), group_by, metrics, numeric)
+        if self.out_of_core:
+            return streaming_aggregate(df, group_by, {metric_name(m): m for m in metrics}, self.memory_mb)
+        return (
+            df.group_by(group_by)
+            .agg([AGGREGATIONS[m[0]][1](m[1]).alias(metric_name(m)) for m in metrics])
+            # pandas sorts null groups last
+            .sort(group_by, nulls_last=True)
+            .collect()
+        )
+
+    def _single(self, group_by: List[str], metric: Metric, df: pl.LazyFrame = None) -> pl.DataFrame:
+        """One metric, under the name of the column it aggregates."""
+        return self.aggregate(group_by, [metric], df).rename({metric_name(metric): metric[1]})
+
     # Polars aggregate functions
-    def pol_transaction_per_country(self, df: pl.DataFrame) -> pl.DataFrame:
+    def pol_transaction_per_country(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Counts the number of transactions per country."""
         try:
-            return df.group_by("Country").agg(pl.col("Invoice").count())
+            return self._single(["Country"], ("count", "Invoice"), df)
         except Exception as e:
             print(f"Error: {e}")
         
-    def pol_transaction_revenue_per_country(self, df: pl.DataFrame) -> pl.DataFrame:
+    def pol_transaction_revenue_per_country(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Calculates the total transaction amount per country."""
         try:
-            return df.group_by("Country").agg(pl.col("Amount").sum())
+            return self._single(["Country"], ("sum", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
         
-    def pol_unique_customers_per_country(self, df: pl.DataFrame) -> pl.DataFrame:
+    def pol_unique_customers_per_country(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Counts the number of unique customers per country."""
         try:
-            return df.group_by("Country").agg(pl.col("Customer ID").n_unique())
+            return self._single(["Country"], ("nunique", "Customer ID"), df)
         except Exception as e:
             print(f"Error : {e}")
         
-    def pol_average_order_value_per_country(df: pl.DataFrame) -> pl.DataFrame:
+    def pol_average_order_value_per_country(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Computes the average order value per country."""
         try:
-            return df.group_by("Country").agg(pl.col("Amount").mean())
+            return self._single(["Country"], ("mean", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
         
-    def pol_transactions_per_customer(self, df: pl.DataFrame) -> pl.DataFrame:
+    def pol_transactions_per_customer(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Counts the number of transactions per customer."""
         try:
-            return df.group_by("Customer ID").agg(pl.col("Invoice").n_unique())
+            return self._single(["Customer ID"], ("nunique", "Invoice"), df)
         except Exception as e:
             print(f"Error: {e}")
         
-    def pol_total_amount_spent_per_customer(self, df: pl.DataFrame) -> pl.DataFrame:
+    def pol_total_amount_spent_per_customer(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Calculates the total amount spent per customer."""
         try:
-            return df.group_by("Customer ID").agg(pl.col("Amount").sum())
+            return self._single(["Customer ID"], ("sum", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
         
-    def pol_average_order_value_per_customer(self, df: pl.DataFrame) -> pl.DataFrame:
+    def pol_average_order_value_per_customer(self, df: pl.LazyFrame = None) -> pl.DataFrame:
         """Computes the average order value per customer."""
         try:
-            return df.group_by("Customer ID").agg(pl.col("Amount").mean())
+            return self._single(["Customer ID"], ("mean", "Amount"), df)
         except Exception as e:
             print(f"Error: {e}")
-        
\ No newline at end of file
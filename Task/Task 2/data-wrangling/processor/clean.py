@@ -4,6 +4,11 @@ Date: 01-03-2025
 Email: adedoyinsamuel25@gmail.com
 
 https://docs.pola.rs/api/python/dev/reference/api/polars.read_excel.html
+https://pandas.pydata.org/docs/user_guide/pyarrow.html
+
+The cleaned data is built once as an Arrow table (`transform_table`); the
+pandas and polars engines work on views of that table (`pd_view`, `pl_view`)
+instead of each keeping its own copy.
 """
 
 import sys 
@@ -12,46 +17,93 @@ sys.path.append('../')
 
 import pandas as pd
 import polars as pl
-from processor.utils import polars_read_data, pandas_read_data
+import pyarrow as pa
+from processor.utils import polars_scan_data
 
 
-def pd_transform_data(data_path:str) -> pd.DataFrame:
-    """Perform Transformation on the data using pandas"""
-    try:
-        # read data
-        df = pandas_read_data(data_path)
+def pd_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """The cleaning steps of `pl_clean`, written with pandas"""
+    # copy the original file without modification
+    df = df.copy()
+
+    # Keep only rows with a positive Price and Quantity
+    df = df[(df['Price'] > 0) & (df['Quantity'] > 0)].copy()
+
+    # create the amount field which is pirce* quantiy
+    df['Amount'] = df["Price"] * df["Quantity"]
 
-        # copy the original file without modification
-        df = df.copy()
+    # Fill missing CustomerID with "Unknown" (as text, like the polars path)
+    df["Customer ID"] = df["Customer ID"].astype("Int64").astype("string").fillna("Unknown")
 
-        # Convert negative values in Price and Quantity to positive
-        df = df[(df['Price'] < 0) | (df['Quantity'] < 0)]
+    return df
 
-        # create the amount field which is pirce* quantiy
-        df['Amount'] = df["Price"] * df["Quantity"]
 
-        # Fill missing CustomerID with "Unknown"
-        df["Customer ID"] = df["Customer ID"].fillna("Unknown")
+def pl_clean(df: pl.LazyFrame) -> pl.LazyFrame:
+    """Add the cleaning steps to a Polars query (nothing runs until collect)"""
+    return (
+        df.filter((pl.col("Price")> 0) & (pl.col("Quantity")>0))
+        .with_columns([
+            (pl.col("Price")* pl.col("Quantity")).alias("Amount"),
+            # cast first: the column is numeric and "Unknown" is text
+            pl.col("Customer ID").cast(pl.Int64).cast(pl.String).fill_null("Unknown")
+        ])
+    )
 
-        return df.to_dict()
+
+def pl_transform_data(data_path:str) -> pl.LazyFrame:
+    """
+    Perform Transformation on the data using Polars.
+
+    Returns a lazy query over the cached Parquet copy; callers add their own
+    steps (slicing, aggregation) and collect, so Polars only reads the
+    columns and rows the final query needs.
+    """
+    try:
+        # scan data
+        df = polars_scan_data(data_path)
+
+        return pl_clean(df)
     
     except Exception as e:
         print(f"Error {e}")
 
 
-def pl_transform_data(data_path:str) -> pl.DataFrame:
-    """Perform Transformation on the data using Polars"""
+def transform_table(data_path: str) -> pa.Table:
+    """
+    Clean the data once and return it as an immutable Arrow table.
+
+    Strings use the classic Arrow layout (large_string) so the pandas view
+    supports every pandas string operation.
+    """
+    return pl_transform_data(data_path).collect().to_arrow(
+        compat_level=pl.CompatLevel.oldest()
+    )
+
+
+def pd_view(table: pa.Table) -> pd.DataFrame:
+    """
+    Pandas view of the shared table.
+
+    Columns are ArrowDtype arrays wrapping the table's buffers, so no data is
+    copied.
+    """
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def pl_view(table: pa.Table) -> pl.DataFrame:
+    """
+    Polars view of the shared table.
+
+    Numeric and date buffers are shared with the table; Polars stores text
+    in its own string-view layout, so string columns are re-encoded once.
+    """
+    return pl.from_arrow(table, rechunk=False)
+
+
+def pd_transform_data(data_path:str) -> pd.DataFrame:
+    """Perform Transformation on the data using pandas (a view of the shared Arrow table)"""
     try:
-        # read data
-        df = polars_read_data(data_path)
-        
-        return(
-            df.filter((pl.col("Price")> 0) & (pl.col("Quantity")>0))
-            .with_columns([
-                (pl.col("Price")* pl.col("Quantity")).alias("Amount"),
-                pl.col("Customer ID").fill_null("Unknown")
-            ])
-        ).to_dict(as_series=False)
+        return pd_view(transform_table(data_path))
     
     except Exception as e:
-        print(f"Error {e}")
\ No newline at end of file
+        print(f"Error {e}")
@@ -0,0 +1,38 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import os
+
+# folder holding the downloaded and extracted dataset
+DATA_DIR = "data"
+
+# columnar copies of the Excel workbook, one Parquet file per workbook hash
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+
+# download files, one folder per data version
+EXPORT_DIR = os.path.join(DATA_DIR, "exports")
+
+# text columns that hold both numbers and strings in the workbook
+# (e.g. cancelled invoices "C489449"), read as strings for a stable schema
+STRING_COLUMNS = ["Invoice", "StockCode", "Description", "Country"]
+
+# dataset download: seconds to wait for the server (connect, read), attempts
+# before giving up, and bytes written to disk at a time
+DOWNLOAD_TIMEOUT = (10, 60)
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# workbook inside the downloaded zip
+DATA_MEMBER = "online_retail_II.xlsx"
+
+# SHA-256 of the downloaded zip; None skips the checksum and only checks that
+# the file is complete and a valid zip
+DATA_SHA256 = None
+
+# out-of-core processing (processor/out_of_core.py): memory, in MB, that
+# sizes the streaming engine's batches (see processor/streaming.py), and
+# where the cleaned data and aggregates are written
+MEMORY_BUDGET_MB = 1024
+OUT_OF_CORE_DIR = os.path.join(DATA_DIR, "out_of_core")
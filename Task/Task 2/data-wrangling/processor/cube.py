@@ -0,0 +1,184 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+https://docs.pola.rs/api/python/stable/reference/api/polars.collect_all.html
+
+Materialized aggregates of the transformed retail data. Every metric the
+/aggregate endpoints serve is computed once per data version, for both
+Country and Customer ID, and kept sorted by key, so a page of results is a
+zero-copy slice instead of a new groupby over the whole dataset.
+
+Saved cubes are keyed by the source data hash and by `LOGIC_KEY`, a hash of
+the cleaning step and metric definitions, so a change to either rebuilds
+them instead of serving aggregates computed the old way.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import hashlib
+import inspect
+import os
+import shutil
+from typing import Dict
+
+import polars as pl
+
+from processor.aggregate import AGGREGATIONS, streaming_aggregate
+from processor.clean import pl_clean
+from processor.config import CACHE_DIR, MEMORY_BUDGET_MB
+
+GROUP_COLUMNS = ["Country", "Customer ID"]
+
+# metric name -> (aggregation, column), computed for every group column
+METRICS = {
+    "transactions": ("count", "Invoice"),
+    "orders": ("nunique", "Invoice"),
+    "revenue": ("sum", "Amount"),
+    "average_order_value": ("mean", "Amount"),
+    "unique_customers": ("nunique", "Customer ID"),
+}
+
+# bump when the aggregates change in a way LOGIC_KEY cannot see
+# (e.g. how an aggregation in processor/aggregate.py treats nulls)
+CUBE_VERSION = 2
+
+# saved cubes built with other cleaning or metric logic are not reused
+LOGIC_KEY = hashlib.sha256(
+    repr((CUBE_VERSION, GROUP_COLUMNS, METRICS, inspect.getsource(pl_clean))).encode()
+).hexdigest()[:12]
+
+
+class AggregateCube:
+    """
+    Every (group column x metric) aggregate of one version of the data.
+    """
+
+    def __init__(self, version: str, tables: Dict[str, pl.DataFrame]):
+        """
+        Args:
+            version (str): Hash of the source data the aggregates were built from.
+            tables (Dict[str, pl.DataFrame]): One table per group column, sorted
+                by that column, with one column per metric.
+        """
+        self.version = version
+        self.tables = tables
+
+    @classmethod
+    def build(
+        cls, df: pl.LazyFrame, version: str, out_of_core: bool = False, memory_mb: int = MEMORY_BUDGET_MB
+    ) -> "AggregateCube":
+        """
+        Compute all aggregates in one pass over the data.
+
+        The group-bys share one scan of the source: `collect_all` runs them
+        as a single plan. With `out_of_core` they run on the streaming
+        engine within `memory_mb` instead (see `streaming_aggregate`).
+        """
+        if out_of_core:
+            return cls(
+                version,
+                {column: streaming_aggregate(df, [column], METRICS, memory_mb) for column in GROUP_COLUMNS},
+            )
+
+        queries = [
+            df.group_by(column)
+            .agg([AGGREGATIONS[aggregation][1](col).alias(name) for name, (aggregation, col) in METRICS.items()])
+            .sort(column, nulls_last=True)
+            for column in GROUP_COLUMNS
+        ]
+        return cls(version, dict(zip(GROUP_COLUMNS, pl.collect_all(queries))))
+
+    @staticmethod
+    def _folder(version: str, cache_dir: str) -> str:
+        return os.path.join(cache_dir, f"{version}-{LOGIC_KEY}.cube")
+
+    def save(self, cache_dir: str = CACHE_DIR) -> None:
+        """Write the aggregates next to the cached data they were built from."""
+        folder = self._folder(self.version, cache_dir)
+        tmp_folder = f"{folder}.tmp"
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+        os.makedirs(tmp_folder)
+        for index, column in enumerate(GROUP_COLUMNS):
+            self.tables[column].write_parquet(os.path.join(tmp_folder, f"{index}.parquet"))
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(tmp_folder, folder)
+
+    @classmethod
+    def load(cls, version: str, cache_dir: str = CACHE_DIR):
+        """
+        Read saved aggregates of a data version, or None if there are none
+        (or the saved folder is incomplete or unreadable).
+        """
+        folder = cls._folder(version, cache_dir)
+        paths = [os.path.join(folder, f"{index}.parquet") for index in range(len(GROUP_COLUMNS))]
+        if not all(os.path.isfile(path) for path in paths):
+            return None
+        try:
+            tables = {column: pl.read_parquet(path) for column, path in zip(GROUP_COLUMNS, paths)}
+        except Exception as e:
+            print(f"Error reading saved aggregates in {folder}: {e}")
+            return None
+        if any(set(METRICS) - set(table.columns) for table in tables.values()):
+            return None
+        return cls(version, tables)
+
+    def page(self, group_by: str, metric: str, skip: int = 0, limit: int = 20) -> pl.DataFrame:
+        """
+        A page of one metric, ordered by the group column.
+
+        Args:
+            group_by (str): "Country" or "Customer ID".
+            metric (str): One of `METRICS`.
+            skip (int): Rows to skip.
+            limit (int): Rows to return.
+
+        Returns:
+            pl.DataFrame: The group column and the metric, at most `limit` rows.
+        """
+        if group_by not in self.tables:
+            raise ValueError(f"Unknown group column {group_by!r}, use one of {GROUP_COLUMNS}")
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, use one of {list(METRICS)}")
+        return self.tables[group_by].select(group_by, metric).slice(skip, limit)
+
+
+class AggregateStore:
+    """
+    Holds the cube of the current data version and rebuilds it when the
+    version changes.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.cube = None
+
+    def ensure(self, df: pl.LazyFrame, version: str) -> AggregateCube:
+        """
+        Get the cube for a data version, loading or building it if needed.
+
+        Args:
+            df (pl.LazyFrame): The transformed data of that version.
+            version (str): Hash of the source data.
+
+        Returns:
+            AggregateCube: Aggregates of that version.
+        """
+        if self.cube is not None and self.cube.version == version:
+            return self.cube
+
+        cube = AggregateCube.load(version, self.cache_dir)
+        if cube is None:
+            cube = AggregateCube.build(df, version)
+            cube.save(self.cache_dir)
+            print(f"Aggregates built for data version {version}")
+        self.cube = cube
+        return cube
+
+    def page(self, group_by: str, metric: str, skip: int = 0, limit: int = 20) -> pl.DataFrame:
+        """A page of the current cube (see `AggregateCube.page`)."""
+        if self.cube is None:
+            raise RuntimeError("Aggregates are not built yet")
+        return self.cube.page(group_by, metric, skip, limit)
@@ -0,0 +1,135 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+https://arrow.apache.org/docs/python/generated/pyarrow.CompressedOutputStream.html
+
+Download files built once per data version. Each version gets its own
+folder named after the source data hash, so a file never changes once it is
+written and can be cached by clients for as long as the version is current.
+Old versions are only removed by `prune`, once a newer version is published.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import os
+import shutil
+import threading
+from typing import Callable, List, Optional
+
+import pyarrow as pa
+
+from processor.config import EXPORT_DIR
+
+# download format -> file extension
+FORMATS = {"parquet": ".parquet", "json": ".json"}
+
+# content encoding -> (pyarrow codec, file suffix); Parquet is already
+# compressed, so only JSON is offered in these encodings
+ENCODINGS = {"zstd": ("zstd", ".zst"), "gzip": ("gzip", ".gz")}
+COMPRESSIBLE_FORMATS = {"json"}
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> set:
+    """Encodings listed in an Accept-Encoding header (ignoring those with q=0)."""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(format: str, accept_encoding: Optional[str]) -> Optional[str]:
+    """The best encoding for a download format, or None to send it as is."""
+    if format not in COMPRESSIBLE_FORMATS:
+        return None
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in ENCODINGS:
+        if encoding in accepted and pa.Codec.is_available(ENCODINGS[encoding][0]):
+            return encoding
+    return None
+
+
+class ExportCache:
+    """
+    Content-addressed download files: `<directory>/<version>/<engine>.<format>[.gz|.zst]`.
+    """
+
+    def __init__(self, directory: str = EXPORT_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def path(self, version: str, engine: str, format: str, encoding: Optional[str] = None) -> str:
+        suffix = ENCODINGS[encoding][1] if encoding else ""
+        return os.path.join(self.directory, version, f"{engine}{FORMATS[format]}{suffix}")
+
+    def get(
+        self,
+        version: str,
+        engine: str,
+        format: str,
+        write: Callable[[str, str], str],
+        encoding: Optional[str] = None,
+    ) -> str:
+        """
+        Path of a download file, building it on first use.
+
+        Args:
+            version (str): Hash of the data the file is built from.
+            engine (str): "pandas" or "polars".
+            format (str): "parquet" or "json".
+            write (Callable[[str, str], str]): Writes the data, called as
+                `write(extension, file_name_without_extension)` (the
+                `pd_download_data` / `pl_download_data` convention), and
+                returns the written path.
+            encoding (Optional[str]): "gzip" or "zstd" for a compressed copy.
+
+        Returns:
+            str: Path of the file.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Invalid format {format!r}, use one of {list(FORMATS)}")
+
+        target = self.path(version, engine, format, encoding)
+        if os.path.exists(target):
+            return target
+
+        # one build at a time, so concurrent first downloads do not race
+        with self._lock:
+            if os.path.exists(target):
+                return target
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            plain = self.path(version, engine, format)
+            if not os.path.exists(plain):
+                tmp_name = f"{plain}.tmp"
+                written = write(FORMATS[format], tmp_name)
+                os.replace(written, plain)
+
+            if encoding:
+                codec = ENCODINGS[encoding][0]
+                tmp_path = f"{target}.tmp"
+                with open(plain, "rb") as src, pa.CompressedOutputStream(tmp_path, codec) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                os.replace(tmp_path, target)
+
+            return target
+
+    def prune(self, keep: List[str]) -> None:
+        """
+        Delete the files of every data version not in `keep`.
+
+        Called after a new version is published, keeping the previous one
+        too, so a download that started on the previous version can finish.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name not in keep:
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
@@ -5,59 +5,225 @@ Email: adedoyinsamuel25@gmail.com
 
 https://gist.github.com/niftycode/a747648db1b79396b8e4814946a4dba2
 https://docs.pola.rs/api/python/dev/reference/api/polars.read_excel.html
+https://requests.readthedocs.io/en/latest/user/advanced/#body-content-workflow
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Range_requests
 
 
 ### **Task 2: Data Loading**
+
+The zip is streamed to `<name>.part` in chunks and only renamed to its final
+name once it is complete (and matches its checksum, when one is known), so a
+file under the final name is never a partial download. An interrupted
+download resumes from the end of the `.part` file with an HTTP Range request.
 """
-import requests
-import zipfile
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import hashlib
+import io
 import os
+import re
+import time
+import zipfile
+from typing import Optional
+
+import requests
+
+from processor.config import (
+    CACHE_DIR,
+    DATA_DIR,
+    DATA_MEMBER,
+    DATA_SHA256,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_TIMEOUT,
+)
+from processor.utils import file_hash, write_excel_cache
+
+
+class IncompleteDownload(Exception):
+    """The server closed the connection before sending the whole file."""
+
+
+def is_valid_download(file_path: str, expected_sha256: Optional[str] = None) -> bool:
+    """
+    Check a downloaded zip: its checksum when one is known, otherwise that it
+    is a readable zip (a truncated zip has no central directory).
+    """
+    if expected_sha256:
+        return file_hash(file_path) == expected_sha256.lower()
+    return zipfile.is_zipfile(file_path)
+
+
+def _total_size(response: requests.Response, offset: int) -> Optional[int]:
+    """Full size of the remote file, from Content-Range or Content-Length."""
+    match = re.match(r"bytes \d+-\d+/(\d+)", response.headers.get("Content-Range", ""))
+    if match:
+        return int(match.group(1))
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length is not None else None
+
+
+def _fetch(url: str, part_path: str, chunk_size: int, timeout) -> None:
+    """
+    Stream `url` into `part_path`, continuing from its current size.
 
-def download_data(url, file_name):
-    """Download a file from a URL and save it locally."""
+    Raises:
+        IncompleteDownload: The file on disk is shorter than the remote file.
+        requests.exceptions.RequestException: Network or HTTP error.
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    # identity encoding so the byte offsets match the file on the server
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
 
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 416:
+            # nothing left after offset: either the .part file is already
+            # complete or it is longer than the remote file
+            match = re.match(r"bytes \*/(\d+)", response.headers.get("Content-Range", ""))
+            if match and int(match.group(1)) == offset:
+                return
+            os.remove(part_path)
+            raise IncompleteDownload(f"Cannot resume at byte {offset}, restarting")
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            mode = "ab"
+        else:
+            # the server ignored the Range header and sent the whole file
+            offset, mode = 0, "wb"
+        total = _total_size(response, offset)
+
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+
+    size = os.path.getsize(part_path)
+    if total is not None and size != total:
+        raise IncompleteDownload(f"Received {size} of {total} bytes")
+
+
+def download_data(
+    url: str,
+    file_name: str,
+    expected_sha256: Optional[str] = DATA_SHA256,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    timeout=DOWNLOAD_TIMEOUT,
+    retries: int = DOWNLOAD_RETRIES,
+    backoff: float = 1.0,
+) -> str:
+    """
+    Download a file from a URL and save it locally, resuming if interrupted.
+
+    Args:
+        url (str): File to download.
+        file_name (str): Name of the file inside the data folder.
+        expected_sha256 (Optional[str]): Checksum the file must match.
+        chunk_size (int): Bytes written to disk at a time.
+        timeout: Seconds to wait for the server, as `requests` takes it.
+        retries (int): Attempts before giving up.
+        backoff (float): Seconds before the first retry, doubled on each retry.
+
+    Returns:
+        str: Path of the downloaded file.
+
+    Raises:
+        ValueError: The download does not match `expected_sha256`.
+        IncompleteDownload, requests.exceptions.RequestException: Every
+            attempt failed.
+    """
     # Create a 'data' folder if it doesn't exist
-    os.makedirs("data", exist_ok=True)
+    os.makedirs(DATA_DIR, exist_ok=True)
 
-    file_path = os.path.join("data", file_name)
+    file_path = os.path.join(DATA_DIR, file_name)
+    part_path = f"{file_path}.part"
 
-    # check if the data exists
+    # check if the data exists and is complete
     if os.path.exists(file_path):
-        print(f"{file_name} already exists")
-        return file_path
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an error for bad responses (4xx, 5xx)
+        if is_valid_download(file_path, expected_sha256):
+            print(f"{file_name} already exists")
+            return file_path
+        print(f"{file_name} is incomplete or corrupt, downloading it again")
+        os.remove(file_path)
+
+    for attempt in range(1, retries + 1):
+        try:
+            _fetch(url, part_path, chunk_size, timeout)
+            break
+        except (requests.exceptions.RequestException, IncompleteDownload) as e:
+            print(f"Download failed (attempt {attempt}/{retries}): {e}")
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+    if not is_valid_download(part_path, expected_sha256):
+        os.remove(part_path)
+        raise ValueError(f"{file_name} failed its integrity check")
+
+    os.replace(part_path, file_path)
+    print(f"Download complete: {file_name}")
+    return file_path
+
+
+def find_member(archive: zipfile.ZipFile, member: Optional[str] = DATA_MEMBER) -> str:
+    """Name of `member` in the zip, or of its first .xlsx file when `member` is None."""
+    names = archive.namelist()
+    if member is None:
+        workbooks = [name for name in names if name.endswith(".xlsx")]
+        if not workbooks:
+            raise FileNotFoundError("No .xlsx files found in the zip")
+        return workbooks[0]
+
+    for name in names:
+        if name == member or os.path.basename(name) == member:
+            return name
+    raise FileNotFoundError(f"{member} not found in the zip")
+
+
+def extract_zip_file(zip_file: str, extract_to: str = DATA_DIR, member: Optional[str] = DATA_MEMBER) -> str:
+    """Extract one workbook from a ZIP file and return its path."""
+    with zipfile.ZipFile(zip_file, "r") as archive:
+        path = archive.extract(find_member(archive, member), extract_to)
 
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
+    print(f"Extraction complete: {zip_file} → {path}")
+    return path
 
-        print(f"Download complete: {file_name}")
-        
 
-    except requests.exceptions.RequestException as e:
-        print(f"Download failed: {e}")
+def zip_member_to_parquet(
+    zip_file: str,
+    member: Optional[str] = DATA_MEMBER,
+    cache_dir: str = CACHE_DIR,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> str:
+    """
+    Convert a workbook inside a zip straight into the Parquet cache.
 
+    The workbook is decompressed into memory (the Excel reader needs random
+    access) and hashed on the way, so its cache file has the same name as
+    `excel_to_parquet` would give the extracted workbook; nothing is written
+    to disk but the Parquet file.
 
-def extract_zip_file(zip_file, extract_to="data"):
-    """Extract a ZIP file to the specified directory and return a string of extracted .xlsx files."""
-    # check if the data exists
-    try:
-        with zipfile.ZipFile(zip_file, 'r') as file:
-            file.extractall(extract_to)
-        
-        # List all extracted files and filter for .xlsx files
-        extracted_files = [f for f in os.listdir(extract_to) if f.endswith(".xlsx")]
-        
-        print(f"Extraction complete: {zip_file} → {extract_to}")
-        return ", ".join(extracted_files) if extracted_files else "No .xlsx files found"
+    Returns:
+        str: Path to the Parquet copy of the workbook.
+    """
+    with zipfile.ZipFile(zip_file, "r") as archive:
+        name = find_member(archive, member)
+        digest = hashlib.sha256()
+        buffer = io.BytesIO()
+        # zipfile checks the member's CRC once it is read to the end
+        with archive.open(name) as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+                buffer.write(chunk)
 
-    except Exception as e:
-        print(f"Extraction failed: {e}")
+    buffer.seek(0)
+    return write_excel_cache(buffer, digest.hexdigest(), cache_dir)
 
 
-def download_extract_zip_file(url, file_name)-> str:
+def download_extract_zip_file(url: str, file_name: str) -> str:
+    """Download the dataset zip and return the Parquet copy of its workbook."""
     zip_file_path = download_data(url, file_name)
-    file_path = extract_zip_file(zip_file_path)
-    return os.path.join("data",file_path)
\ No newline at end of file
+    return zip_member_to_parquet(zip_file_path)
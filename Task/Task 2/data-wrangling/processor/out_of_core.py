@@ -0,0 +1,81 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+https://docs.pola.rs/api/python/stable/reference/api/polars.LazyFrame.sink_parquet.html
+
+Cleans and aggregates retail data larger than memory. The cleaned rows are
+streamed from the source Parquet file to a new one, then every aggregate of
+`processor/cube.py` is computed from that file on the streaming engine, all
+within a memory budget (see `processor/streaming.py`). On small machines,
+also lower POLARS_MAX_THREADS: each thread holds its own batch.
+
+Run from the data-wrangling folder:
+    python -m processor.out_of_core data/extract.parquet --memory-mb 1024 --output data/out_of_core
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import argparse
+import os
+
+import polars as pl
+
+from processor.clean import pl_transform_data
+from processor.config import MEMORY_BUDGET_MB, OUT_OF_CORE_DIR
+from processor.cube import GROUP_COLUMNS, AggregateCube
+from processor.streaming import memory_budget
+
+
+def clean_to_parquet(data_path: str, output_path: str, memory_mb: int = MEMORY_BUDGET_MB) -> str:
+    """
+    Stream the cleaned data (`pl_transform_data`) into a Parquet file.
+
+    Returns:
+        str: The output path.
+    """
+    query = pl_transform_data(data_path)
+    tmp_path = f"{output_path}.tmp"
+    with memory_budget(query.collect_schema(), memory_mb):
+        query.sink_parquet(tmp_path)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def run(data_path: str, output_dir: str = OUT_OF_CORE_DIR, memory_mb: int = MEMORY_BUDGET_MB) -> dict:
+    """
+    Clean the data and compute every aggregate out of core.
+
+    Args:
+        data_path (str): Source data (Parquet, or a workbook to convert first).
+        output_dir (str): Folder for the results.
+        memory_mb (int): Memory budget in MB.
+
+    Returns:
+        dict: "clean" and each group column -> path of the Parquet file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {"clean": clean_to_parquet(data_path, os.path.join(output_dir, "clean.parquet"), memory_mb)}
+
+    cube = AggregateCube.build(pl.scan_parquet(paths["clean"]), "", out_of_core=True, memory_mb=memory_mb)
+    for column in GROUP_COLUMNS:
+        paths[column] = os.path.join(output_dir, f"by_{column.lower().replace(' ', '_')}.parquet")
+        cube.tables[column].write_parquet(paths[column])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data_path", help="Parquet file (or .xlsx workbook) with the raw retail data")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_BUDGET_MB, help="memory budget in MB")
+    parser.add_argument("--output", default=OUT_OF_CORE_DIR, help="folder for the cleaned data and aggregates")
+    args = parser.parse_args()
+
+    for name, path in run(args.data_path, args.output, args.memory_mb).items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+
+https://docs.pola.rs/user-guide/concepts/_streaming/
+https://docs.pola.rs/api/python/stable/reference/api/polars.Config.set_streaming_chunk_size.html
+
+Runs Polars queries with the streaming engine inside a memory budget. The
+engine reads the source in batches and folds each batch into the result, so
+memory depends on the batch size, not on the size of the data. The budget
+sets the batch size: the batches of all threads together take `BATCH_SHARE`
+of it, leaving the rest for the aggregation state and the Parquet reader. A
+larger budget gives larger batches (fewer, cheaper steps); a smaller one
+lowers peak memory.
+
+The budget does not bound the aggregation state, which holds one entry per
+group: per-customer aggregates, and the (group, value) pairs behind
+nunique, grow with the number of distinct keys rather than with the rows.
+For the retail data that is thousands of customers and about one pair per
+invoice, well inside the budget; a key with as many values as there are
+rows is not a good fit for this mode.
+"""
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+from contextlib import contextmanager
+from typing import List
+
+import polars as pl
+
+from processor.config import MEMORY_BUDGET_MB
+
+# bytes per value assumed for text and other variable-width columns
+VARIABLE_WIDTH_BYTES = 32
+
+# share of the budget for the batches in flight
+BATCH_SHARE = 0.25
+
+# smallest batch, below which per-batch overhead dominates
+MIN_CHUNK_ROWS = 1_000
+
+# polars 1.25 selects the streaming engine with `engine="streaming"`; the
+# `streaming=True` flag of older versions is deprecated and removed in 2.0
+ENGINE_ARGUMENT = tuple(int(part) for part in pl.__version__.split(".")[:2]) >= (1, 25)
+
+
+def row_bytes(schema: pl.Schema) -> int:
+    """Rough in-memory size of one row."""
+    return sum(
+        8 if dtype.is_numeric() or dtype.is_temporal() or dtype == pl.Boolean else VARIABLE_WIDTH_BYTES
+        for dtype in schema.values()
+    )
+
+
+def chunk_rows(schema: pl.Schema, memory_mb: int = MEMORY_BUDGET_MB) -> int:
+    """Rows per streaming batch for data with this schema under the budget."""
+    batch_bytes = memory_mb * 2**20 * BATCH_SHARE / pl.thread_pool_size()
+    rows = int(batch_bytes / max(row_bytes(schema), 1))
+    return max(MIN_CHUNK_ROWS, rows)
+
+
+@contextmanager
+def memory_budget(schema: pl.Schema, memory_mb: int = MEMORY_BUDGET_MB):
+    """Size streaming batches for the budget while the block runs."""
+    with pl.Config(streaming_chunk_size=chunk_rows(schema, memory_mb)):
+        yield
+
+
+def streaming_collect_all(
+    queries: List[pl.LazyFrame], schema: pl.Schema, memory_mb: int = MEMORY_BUDGET_MB
+) -> List[pl.DataFrame]:
+    """
+    Collect queries with the streaming engine.
+
+    Args:
+        queries (List[pl.LazyFrame]): Queries over the same source.
+        schema (pl.Schema): Schema of that source, to size the batches.
+        memory_mb (int): Memory budget in MB.
+
+    Returns:
+        List[pl.DataFrame]: One result per query.
+    """
+    with memory_budget(schema, memory_mb):
+        if ENGINE_ARGUMENT:
+            return pl.collect_all(queries, engine="streaming")
+        return pl.collect_all(queries, streaming=True)
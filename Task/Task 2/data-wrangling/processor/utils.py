@@ -5,52 +5,169 @@ Email: adedoyinsamuel25@gmail.com
 
 https://medium.com/@chodvadiyasaurabh/building-a-file-upload-and-download-api-with-python-and-fastapi-3de94e4d1a35
 https://stackoverflow.com/questions/67295253/how-to-download-a-file-using-fastapi?noredirect=1
+https://docs.pola.rs/api/python/stable/reference/api/polars.read_excel.html
 """
+import sys
+# set all depencies (module) part
+sys.path.append('../')
+
+import hashlib
+import os
+
 import pandas as pd
 import polars as pl
 
+from processor.config import CACHE_DIR, STRING_COLUMNS
+
+
+def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_parquet_path(digest: str, cache_dir: str = CACHE_DIR) -> str:
+    """Path of the Parquet copy of the workbook with the given SHA-256."""
+    return os.path.join(cache_dir, f"{digest}.parquet")
+
+
+def write_excel_cache(source, digest: str, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Convert every sheet of a workbook into one Parquet file named after its hash.
+
+    Args:
+        source: Workbook path or its bytes.
+        digest (str): SHA-256 of the workbook.
+        cache_dir (str): Folder holding the Parquet copies.
+
+    Returns:
+        str: Path to the Parquet copy of the workbook.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    parquet_path = cached_parquet_path(digest, cache_dir)
+    if os.path.exists(parquet_path):
+        return parquet_path
+
+    # calamine (fastexcel) parses the workbook much faster than openpyxl
+    sheets = pl.read_excel(
+        source,
+        sheet_id=0,
+        engine="calamine",
+        schema_overrides={column: pl.String for column in STRING_COLUMNS},
+    )
+    df = pl.concat(list(sheets.values()), how="vertical_relaxed")
+
+    # write next to the final name first so a crash never leaves a partial cache file
+    tmp_path = f"{parquet_path}.tmp"
+    df.write_parquet(tmp_path)
+    os.replace(tmp_path, parquet_path)
+    print(f"Cached workbook ({len(sheets)} sheets, {df.height} rows) as {parquet_path}")
+    return parquet_path
+
+
+def excel_to_parquet(file_path: str, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Convert every sheet of an Excel workbook into one cached Parquet file.
+
+    The cache file is named after the workbook's hash, so the slow Excel
+    parse only happens once per workbook version; a changed workbook gets a
+    new cache file. Non-Excel paths are returned unchanged.
+
+    Args:
+        file_path (str): Path to the .xlsx workbook.
+        cache_dir (str): Folder holding the Parquet copies.
+
+    Returns:
+        str: Path to the Parquet copy of the workbook.
+    """
+    if not file_path.endswith((".xlsx", ".xls")):
+        return file_path
+    return write_excel_cache(file_path, file_hash(file_path), cache_dir)
+
+
+def data_version(file_path: str) -> str:
+    """Hash identifying the content of a data file (the name of its cached copy)."""
+    cached_path = excel_to_parquet(file_path)
+    name = os.path.splitext(os.path.basename(cached_path))[0]
+    in_cache = os.path.abspath(os.path.dirname(cached_path)) == os.path.abspath(CACHE_DIR)
+    if cached_path != file_path or in_cache:
+        return name
+    return file_hash(file_path)
+
+
 def pandas_read_data(file_path:str) -> pd.DataFrame:
-    """Read data from an Excel file"""
+    """Read data from an Excel file (through its cached Parquet copy)"""
     try:
-        pandas_df = pd.read_excel(file_path)
+        pandas_df = pd.read_parquet(excel_to_parquet(file_path), memory_map=True)
         return pandas_df
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
         return None
-    
+
 def polars_read_data(file_path: str) -> pl.DataFrame:
-    """Reads an Excel file with Polars"""
+    """Reads an Excel file with Polars (through its cached Parquet copy)"""
     try:
-        polars_df = pl.read_excel(file_path, has_header=True)
+        polars_df = pl.read_parquet(excel_to_parquet(file_path), memory_map=True)
         return polars_df
     except Exception as e:
         print(f"Error loading file: {e}")
         return None
 
-def pd_download_data(df:pd.DataFrame, download_format: str, file_name: str = "online_retail"):
+def polars_scan_data(file_path: str) -> pl.LazyFrame:
+    """
+    Lazily scan the cached Parquet copy of a workbook with Polars.
+
+    Nothing is read until the query is collected, and then only the columns
+    and row groups the query needs.
+    """
+    return pl.scan_parquet(excel_to_parquet(file_path))
+
+def pd_download_data(df:pd.DataFrame, download_format: str, file_name: str = "online_retail") -> str:
+    """
+    Save a pandas DataFrame as Parquet or JSON (one record per line).
+
+    Returns:
+        str: Path of the written file.
+    """
     try:
+        file_path = f"{file_name}{download_format}"
         if download_format == ".parquet":
-            df.to_parquet(f"{file_name}.parquet")
+            df.to_parquet(file_path, index=False)
 
         elif download_format == ".json":
-            df.to_json(f"{file_name}.json", orient="records")
+            df.to_json(file_path, orient="records", lines=True, date_format="iso")
         else:
             raise ValueError("Invalid format. Use '.parquet' or '.json'.")
-        print(f"File saved as {file_name}{download_format}")
+        print(f"File saved as {file_path}")
+        return file_path
 
     except Exception as e:
         print(f"Error: {e}")
+        raise
+
+def pl_download_data(df:pl.DataFrame, download_format: str, file_name: str = "online_retail") -> str:
+    """
+    Save a Polars DataFrame as Parquet or JSON (one record per line) with
+    the native Polars writers.
 
-def pl_download_data(df:pd.DataFrame, download_format: str, file_name: str = "online_retail"):
+    Returns:
+        str: Path of the written file.
+    """
     try:
+        file_path = f"{file_name}{download_format}"
         if download_format == ".parquet":
-            df.to_parquet(f"{file_name}.parquet")
+            df.write_parquet(file_path)
 
         elif download_format == ".json":
-            df.to_json(f"{file_name}.json", orient="records")
+            df.write_ndjson(file_path)
         else:
             raise ValueError("Invalid format. Use '.parquet' or '.json'.")
-        print(f"File saved as {file_name}{download_format}")
+        print(f"File saved as {file_path}")
+        return file_path
 
     except Exception as e:
-        print(f"Error: {e}")
\ No newline at end of file
+        print(f"Error: {e}")
+        raise
@@ -0,0 +1,33 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import polars as pl
+
+from benchmarks.run_benchmarks import OPERATIONS, run, to_markdown
+from benchmarks.synthetic import write_dataset
+
+
+def test_synthetic_data_matches_the_retail_schema(tmp_path):
+    df = pl.read_parquet(write_dataset(5_000, str(tmp_path / "raw.parquet")))
+
+    assert df.height == 5_000
+    assert df.columns == [
+        "Invoice", "StockCode", "Description", "Quantity",
+        "InvoiceDate", "Price", "Customer ID", "Country",
+    ]
+    assert df["Customer ID"].null_count() > 0
+    assert (df["Quantity"] < 0).any()
+
+
+def test_report_compares_both_engines(tmp_path):
+    report = run([2_000], repeat=1, isolate=False, workdir=str(tmp_path))
+
+    assert len(report["results"]) == 2 * len(OPERATIONS)
+    assert {row["faster"] for row in report["comparison"]} <= {"pandas", "polars"}
+    assert all(result["peak_rss_mb"] > 0 for result in report["results"])
+    assert "| 2,000 | clean |" in to_markdown(report)
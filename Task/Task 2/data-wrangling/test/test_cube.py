@@ -0,0 +1,71 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import os
+
+import polars as pl
+import pytest
+
+from processor import cube as cube_module
+from processor.cube import AggregateCube, AggregateStore
+
+
+def transformed():
+    return pl.DataFrame(
+        {
+            "Invoice": ["1", "1", "2", "3"],
+            "Amount": [10.0, 5.0, 20.0, 7.0],
+            "Customer ID": ["100", "100", "200", "Unknown"],
+            "Country": ["United Kingdom", "United Kingdom", "France", "Spain"],
+        }
+    ).lazy()
+
+
+def test_pages_come_from_sorted_aggregates(tmp_path):
+    store = AggregateStore(str(tmp_path))
+    store.ensure(transformed(), "v1")
+
+    page = store.page("Country", "revenue", skip=1, limit=1)
+    assert page.to_dicts() == [{"Country": "Spain", "revenue": 7.0}]
+    assert store.page("Customer ID", "orders", limit=1).to_dicts() == [
+        {"Customer ID": "100", "orders": 1}
+    ]
+
+    with pytest.raises(ValueError):
+        store.page("Country", "median")
+
+
+def test_cube_is_reused_per_version_and_rebuilt_on_change(tmp_path):
+    store = AggregateStore(str(tmp_path))
+    cube = store.ensure(transformed(), "v1")
+    assert store.ensure(transformed(), "v1") is cube
+
+    # a new process loads the saved aggregates instead of recomputing them
+    reloaded = AggregateStore(str(tmp_path)).ensure(pl.LazyFrame(), "v1")
+    assert reloaded.page("Country", "transactions").to_dicts() == cube.page(
+        "Country", "transactions"
+    ).to_dicts()
+
+    changed = transformed().filter(pl.col("Country") != "Spain")
+    assert store.ensure(changed, "v2").page("Country", "transactions").height == 2
+
+
+def test_saved_cube_is_rebuilt_when_logic_changes_or_files_are_missing(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    AggregateStore(cache_dir).ensure(transformed(), "v1")
+    assert AggregateCube.load("v1", cache_dir) is not None
+
+    # a table file lost after saving
+    folder = AggregateCube._folder("v1", cache_dir)
+    os.remove(os.path.join(folder, "1.parquet"))
+    assert AggregateCube.load("v1", cache_dir) is None
+
+    AggregateStore(cache_dir).ensure(transformed(), "v1")
+    monkeypatch.setattr(cube_module, "LOGIC_KEY", "changed")
+    assert AggregateCube.load("v1", cache_dir) is None
+    assert AggregateStore(cache_dir).ensure(transformed(), "v1").page("Country", "revenue").height == 3
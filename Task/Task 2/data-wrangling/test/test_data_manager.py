@@ -0,0 +1,101 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import asyncio
+
+import polars as pl
+import pytest
+from fastapi import HTTPException
+
+from api import data_manager as data_manager_module
+from api.data_manager import DataManager, FAILED, READY
+
+
+def retail_parquet(path):
+    pl.DataFrame(
+        {
+            "Invoice": ["489434", "489435", "C489449"],
+            "Quantity": [12, 3, -1],
+            "Price": [6.95, 2.1, 2.1],
+            "Customer ID": [13085.0, None, 13085.0],
+            "Country": ["United Kingdom", "France", "France"],
+        }
+    ).write_parquet(path)
+    return str(path)
+
+
+def test_not_ready_until_loaded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = retail_parquet(tmp_path / "retail.parquet")
+    monkeypatch.setattr(data_manager_module, "download_extract_zip_file", lambda url, name: path)
+
+    manager = DataManager()
+    with pytest.raises(HTTPException) as error:
+        manager.get()
+    assert error.value.status_code == 503
+
+    data = manager.load()
+
+    assert manager.state == READY and manager.health()["rows"] == 2
+    assert manager.get() is data
+    assert data.pandas["Customer ID"].tolist() == ["13085", "Unknown"]
+    assert data.aggregates.page("Country", "transactions").height == 2
+
+
+def test_failed_load_is_reported(monkeypatch):
+    def fail(url, name):
+        raise OSError("network down")
+
+    monkeypatch.setattr(data_manager_module, "download_extract_zip_file", fail)
+
+    manager = DataManager()
+    with pytest.raises(OSError):
+        manager.load()
+
+    assert manager.state == FAILED
+    assert manager.health()["error"] == "network down"
+
+
+def test_failed_load_is_retried_with_backoff(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = retail_parquet(tmp_path / "retail.parquet")
+    attempts = []
+
+    def flaky(url, name):
+        attempts.append(name)
+        if len(attempts) < 3:
+            raise OSError("network down")
+        return path
+
+    monkeypatch.setattr(data_manager_module, "download_extract_zip_file", flaky)
+    manager = DataManager(retry_seconds=0.01)
+
+    async def run():
+        manager.start()
+        await asyncio.wait_for(manager._task, timeout=10)
+        await manager.stop()
+
+    asyncio.run(run())
+    assert len(attempts) == 3
+    assert manager.state == READY and manager.error is None
+
+
+def test_stop_cancels_retries(monkeypatch):
+    def fail(url, name):
+        raise OSError("network down")
+
+    monkeypatch.setattr(data_manager_module, "download_extract_zip_file", fail)
+    manager = DataManager(retry_seconds=60)
+
+    async def run():
+        manager.start()
+        await asyncio.sleep(0.2)
+        await asyncio.wait_for(manager.stop(), timeout=5)
+
+    asyncio.run(run())
+    assert manager.state == FAILED and manager._task is None
@@ -0,0 +1,54 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import gzip
+import json
+import os
+
+import polars as pl
+
+from processor.exports import ExportCache, choose_encoding
+from processor.utils import pl_download_data
+
+
+def test_choose_encoding():
+    assert choose_encoding("json", "gzip, deflate, br, zstd") == "zstd"
+    assert choose_encoding("json", "gzip, zstd;q=0") == "gzip"
+    assert choose_encoding("json", None) is None
+    # parquet is already compressed
+    assert choose_encoding("parquet", "gzip") is None
+
+
+def test_files_are_built_once_per_version(tmp_path):
+    df = pl.DataFrame({"Invoice": ["489434", "489435"], "Amount": [83.4, 10.0]})
+    calls = []
+
+    def write(extension, file_name):
+        calls.append(extension)
+        return pl_download_data(df, extension, file_name)
+
+    exports = ExportCache(str(tmp_path))
+    path = exports.get("v1", "polars", "json", write)
+    assert exports.get("v1", "polars", "json", write) == path
+    assert calls == [".json"]
+    assert [json.loads(line) for line in open(path)] == df.to_dicts()
+
+    gzipped = exports.get("v1", "polars", "json", write, encoding="gzip")
+    assert gzipped.endswith(".json.gz") and calls == [".json"]
+    with gzip.open(gzipped, "rt") as f:
+        assert [json.loads(line) for line in f] == df.to_dicts()
+
+    # a new data version does not delete the old files while they may be served
+    exports.get("v2", "polars", "parquet", write)
+    assert sorted(os.listdir(str(tmp_path))) == ["v1", "v2"]
+    assert pl.read_parquet(exports.path("v2", "polars", "parquet")).equals(df)
+
+    # pruning after a publish keeps the listed versions only
+    exports.get("v3", "polars", "parquet", write)
+    exports.prune(["v3", "v2"])
+    assert sorted(os.listdir(str(tmp_path))) == ["v2", "v3"]
@@ -0,0 +1,145 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import polars as pl
+import pytest
+
+from processor.load_data import download_data, download_extract_zip_file, extract_zip_file
+from processor.utils import excel_to_parquet
+from test.test_processor import write_workbook
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves `server.payload`, honouring Range, optionally cutting responses short."""
+
+    def do_GET(self):
+        server = self.server
+        server.ranges.append(self.headers.get("Range"))
+        payload = server.payload
+        start = 0
+
+        header = self.headers.get("Range")
+        if header and server.supports_range:
+            start = int(header.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        else:
+            self.send_response(200)
+        body = payload[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if server.drop_after:
+            # send part of the body, then hang up (once)
+            body, server.drop_after = body[:server.drop_after], 0
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.payload = b""
+    server.ranges = []
+    server.supports_range = True
+    server.drop_after = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/online_retail.zip"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def retail_zip(tmp_path) -> bytes:
+    workbook = str(tmp_path / "online_retail_II.xlsx")
+    write_workbook(workbook)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(workbook, "online_retail_II.xlsx")
+        archive.writestr("README.txt", "not needed")
+    os.remove(workbook)
+    return buffer.getvalue()
+
+
+def test_interrupted_download_resumes_with_range(tmp_path, monkeypatch, stub_server):
+    monkeypatch.chdir(tmp_path)
+    stub_server.payload = os.urandom(300_000)
+    stub_server.drop_after = 100_000
+
+    path = download_data(stub_server.url, "online_retail.zip", hashlib.sha256(stub_server.payload).hexdigest(),
+                         chunk_size=8192, backoff=0)
+
+    assert open(path, "rb").read() == stub_server.payload
+    assert stub_server.ranges[0] is None
+    # resumes from the end of the .part file: the whole chunks written before
+    # the drop (a partial last chunk is lost with the connection)
+    offset = int(stub_server.ranges[1].split("=")[1].rstrip("-"))
+    assert 0 < offset <= 100_000
+    assert offset % 8192 == 0
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_server_without_range_support_restarts(tmp_path, monkeypatch, stub_server):
+    monkeypatch.chdir(tmp_path)
+    stub_server.payload = retail_zip(tmp_path)
+    stub_server.supports_range = False
+    stub_server.drop_after = 1000
+
+    path = download_data(stub_server.url, "online_retail.zip", backoff=0)
+
+    assert open(path, "rb").read() == stub_server.payload
+
+
+def test_checksum_mismatch_is_rejected(tmp_path, monkeypatch, stub_server):
+    monkeypatch.chdir(tmp_path)
+    stub_server.payload = b"not the dataset"
+
+    with pytest.raises(ValueError):
+        download_data(stub_server.url, "online_retail.zip", "0" * 64, backoff=0)
+    assert os.listdir(tmp_path / "data") == []
+
+
+def test_truncated_file_is_downloaded_again(tmp_path, monkeypatch, stub_server):
+    monkeypatch.chdir(tmp_path)
+    stub_server.payload = retail_zip(tmp_path)
+    os.makedirs("data")
+    with open(os.path.join("data", "online_retail.zip"), "wb") as f:
+        f.write(stub_server.payload[:500])
+
+    path = download_data(stub_server.url, "online_retail.zip", backoff=0)
+    assert open(path, "rb").read() == stub_server.payload
+
+    # a complete file is reused without a request
+    assert download_data(stub_server.url, "online_retail.zip") == path
+    assert len(stub_server.ranges) == 1
+
+
+def test_workbook_goes_from_zip_to_cache(tmp_path, monkeypatch, stub_server):
+    monkeypatch.chdir(tmp_path)
+    stub_server.payload = retail_zip(tmp_path)
+
+    parquet_path = download_extract_zip_file(stub_server.url, "online_retail.zip")
+
+    assert pl.read_parquet(parquet_path).height == 4
+    assert sorted(os.listdir("data")) == ["cache", "online_retail.zip"]
+
+    # same cache file as converting the extracted workbook
+    workbook = extract_zip_file(os.path.join("data", "online_retail.zip"), str(tmp_path / "extracted"))
+    assert os.listdir(tmp_path / "extracted") == ["online_retail_II.xlsx"]
+    assert excel_to_parquet(workbook) == parquet_path
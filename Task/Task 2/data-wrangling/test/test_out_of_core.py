@@ -0,0 +1,90 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import gc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+import psutil
+import pytest
+from polars.testing import assert_frame_equal
+
+from benchmarks.run_benchmarks import RssSampler
+from benchmarks.synthetic import write_dataset
+from processor.aggregate import PolarsAggregation, parse_metrics
+from processor.clean import pl_transform_data
+from processor.cube import AggregateCube
+from processor.out_of_core import run
+from processor.streaming import MIN_CHUNK_ROWS, chunk_rows
+
+BUDGET_MB = 256
+ROWS = 10_000_000
+
+
+def run_measured(data_path, output_dir, memory_mb):
+    """Run the out-of-core pipeline and report the memory it added, in MB."""
+    gc.collect()
+    rss_before = psutil.Process().memory_info().rss
+    with RssSampler() as sampler:
+        paths = run(data_path, output_dir, memory_mb)
+    return paths, (sampler.peak - rss_before) / 2**20
+
+
+def run_isolated(data_path, output_dir, memory_mb):
+    """`run_measured` in a fresh process, so earlier runs do not inflate its memory."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_measured, data_path, output_dir, memory_mb).result()
+
+
+def test_out_of_core_aggregates_match_in_memory(tmp_path):
+    data_path = write_dataset(20_000, str(tmp_path / "raw.parquet"))
+    metrics = parse_metrics("count:Invoice,sum:Amount,mean:Amount,nunique:Customer ID,max:Price")
+    cleaned = pl_transform_data(data_path)
+
+    assert_frame_equal(
+        PolarsAggregation(cleaned, out_of_core=True, memory_mb=64).aggregate(["Country"], metrics),
+        PolarsAggregation(cleaned).aggregate(["Country"], metrics),
+    )
+    with pytest.raises(ValueError):
+        PolarsAggregation(cleaned, out_of_core=True).aggregate(["Country"], [("median", "Amount")])
+
+
+def test_batch_size_follows_the_budget():
+    schema = pl.Schema({"Invoice": pl.String, "Price": pl.Float64, "Quantity": pl.Int64})
+
+    assert chunk_rows(schema, 2048) == 2 * chunk_rows(schema, 1024)
+    assert chunk_rows(schema, 64) < chunk_rows(schema, 1024)
+    assert chunk_rows(schema, 0) == MIN_CHUNK_ROWS
+
+
+def test_out_of_core_run_stays_within_the_memory_budget(tmp_path, monkeypatch):
+    data_path = write_dataset(ROWS, str(tmp_path / "raw.parquet"), row_group_size=250_000)
+    sample = pl.scan_parquet(data_path).head(100_000).collect()
+    # the data would not fit in the budget
+    assert sample.estimated_size("mb") * ROWS / sample.height > 2 * BUDGET_MB
+
+    # a fresh process on two threads, like a small machine
+    monkeypatch.setenv("POLARS_MAX_THREADS", "2")
+    paths, used_mb = run_isolated(data_path, str(tmp_path / "out"), BUDGET_MB)
+
+    assert used_mb < BUDGET_MB
+    assert pl.scan_parquet(paths["clean"]).select(pl.len()).collect().item() < ROWS
+    expected = AggregateCube.build(pl_transform_data(data_path), "").tables["Country"]
+    assert_frame_equal(pl.read_parquet(paths["Country"]), expected)
+
+
+def test_smaller_budget_lowers_peak_memory(tmp_path, monkeypatch):
+    # row groups as large as the biggest batch, so the batch size is what varies
+    data_path = write_dataset(ROWS, str(tmp_path / "raw.parquet"), row_group_size=1_000_000)
+    monkeypatch.setenv("POLARS_MAX_THREADS", "2")
+
+    _, small_mb = run_isolated(data_path, str(tmp_path / "small"), 64)
+    _, large_mb = run_isolated(data_path, str(tmp_path / "large"), 4 * BUDGET_MB)
+
+    assert small_mb < large_mb
@@ -0,0 +1,182 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import os
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from processor.aggregate import PandasAggregation, PolarsAggregation, parse_metrics
+from processor.clean import pd_clean, pd_view, pl_clean, pl_view
+from processor.utils import excel_to_parquet, pandas_read_data, polars_read_data
+
+
+def retail_sheet(invoices):
+    return pd.DataFrame(
+        {
+            "Invoice": invoices,
+            "StockCode": ["85048", "79323P"],
+            "Description": ["LIGHT", "CANDLE"],
+            "Quantity": [12, -1],
+            "InvoiceDate": pd.to_datetime(["2009-12-01 07:45", "2009-12-01 07:46"]),
+            "Price": [6.95, 2.1],
+            "Customer ID": [13085.0, None],
+            "Country": ["United Kingdom", "France"],
+        }
+    )
+
+
+def write_workbook(path):
+    with pd.ExcelWriter(path) as writer:
+        retail_sheet([489434, "C489449"]).to_excel(writer, sheet_name="Year 2009-2010", index=False)
+        retail_sheet([581587, 581588]).to_excel(writer, sheet_name="Year 2010-2011", index=False)
+
+
+def test_excel_is_cached_once_per_workbook_hash(tmp_path):
+    workbook = str(tmp_path / "online_retail_II.xlsx")
+    cache_dir = str(tmp_path / "cache")
+    write_workbook(workbook)
+
+    parquet_path = excel_to_parquet(workbook, cache_dir)
+    mtime = os.path.getmtime(parquet_path)
+
+    # a second call reuses the cached copy
+    assert excel_to_parquet(workbook, cache_dir) == parquet_path
+    assert os.path.getmtime(parquet_path) == mtime
+    assert excel_to_parquet(parquet_path, cache_dir) == parquet_path
+
+
+def test_readers_load_every_sheet_from_the_cache(tmp_path, monkeypatch):
+    workbook = str(tmp_path / "online_retail_II.xlsx")
+    write_workbook(workbook)
+    # the cache folder is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    pandas_df = pandas_read_data(workbook)
+    polars_df = polars_read_data(workbook)
+
+    assert len(pandas_df) == polars_df.height == 4
+    assert list(pandas_df["Invoice"]) == ["489434", "C489449", "581587", "581588"]
+
+
+def test_lazy_polars_clean_and_aggregate():
+    df = pl.from_pandas(
+        pd.concat([retail_sheet(["489434", "C489449"]), retail_sheet(["581587", "581588"])])
+    ).lazy()
+
+    cleaned = pl_clean(df)
+    assert isinstance(cleaned, pl.LazyFrame)
+
+    polars_agg = PolarsAggregation(cleaned)
+    revenue = polars_agg.pol_transaction_revenue_per_country()
+    customers = polars_agg.pol_unique_customers_per_country()
+
+    # rows with a negative quantity are dropped
+    assert revenue["Country"].to_list() == ["United Kingdom"]
+    assert revenue["Amount"].to_list() == pytest.approx([2 * 12 * 6.95])
+    assert customers.to_dicts() == [{"Country": "United Kingdom", "Customer ID": 1}]
+
+
+def test_parse_metrics():
+    assert parse_metrics("sum:Amount, nunique:Customer ID,MEAN:Amount") == [
+        ("sum", "Amount"),
+        ("nunique", "Customer ID"),
+        ("mean", "Amount"),
+    ]
+    for spec in ["", "sum", "mode:Amount", "sum:", "sum:Amount,sum:Amount"]:
+        with pytest.raises(ValueError):
+            parse_metrics(spec)
+
+
+def test_pandas_and_polars_engines_agree():
+    df = pd.DataFrame(
+        {
+            "Invoice": ["1", "1", "2", "3"],
+            "Amount": [10.0, 5.0, 20.0, 7.0],
+            "Customer ID": ["100", "100", "200", "100"],
+            "Country": ["United Kingdom", "United Kingdom", "France", "France"],
+        }
+    )
+    metrics = parse_metrics("sum:Amount,nunique:Customer ID,count:Invoice")
+
+    pandas_result = PandasAggregation(df).aggregate(["Country"], metrics)
+    polars_result = PolarsAggregation(pl.from_pandas(df)).aggregate(["Country"], metrics)
+
+    assert pandas_result.to_dict(orient="records") == polars_result.to_dicts() == [
+        {"Country": "France", "sum_Amount": 27.0, "nunique_Customer ID": 2, "count_Invoice": 2},
+        {"Country": "United Kingdom", "sum_Amount": 15.0, "nunique_Customer ID": 1, "count_Invoice": 2},
+    ]
+
+    with pytest.raises(ValueError):
+        PolarsAggregation(pl.from_pandas(df)).aggregate(["Region"], metrics)
+
+
+def test_engines_follow_the_same_null_rule():
+    df = pd.DataFrame(
+        {
+            "Invoice": ["1", "2", "3", "4"],
+            "Amount": [10.0, 5.0, None, 7.0],
+            "Customer ID": ["100", None, "200", None],
+            "Country": ["France", "France", None, None],
+        }
+    )
+    metrics = parse_metrics("nunique:Customer ID,count:Amount,sum:Amount")
+
+    pandas_result = PandasAggregation(df).aggregate(["Country"], metrics)
+    polars_result = PolarsAggregation(pl.from_pandas(df)).aggregate(["Country"], metrics)
+    streaming_result = PolarsAggregation(pl.from_pandas(df), out_of_core=True).aggregate(["Country"], metrics)
+
+    # null keys form their own group (last); nunique ignores null values
+    expected = [
+        {"Country": "France", "nunique_Customer ID": 1, "count_Amount": 2, "sum_Amount": 15.0},
+        {"Country": None, "nunique_Customer ID": 1, "count_Amount": 1, "sum_Amount": 7.0},
+    ]
+    assert polars_result.to_dicts() == streaming_result.to_dicts() == expected
+    assert pandas_result.astype(object).where(pandas_result.notna(), None).to_dict(orient="records") == expected
+
+
+def test_invalid_requests_are_rejected_before_running():
+    df = pd.DataFrame({"Amount": [10.0], "Country": ["France"], "Description": ["LIGHT"]})
+    for group_by, metrics in [
+        (["Country"], [("sum", "Country")]),
+        (["Country"], [("mean", "Description")]),
+        (["Country"], [("sum", "Amount"), ("sum", "Amount")]),
+        (["Country", "Country"], [("sum", "Amount")]),
+    ]:
+        with pytest.raises(ValueError):
+            PandasAggregation(df).aggregate(group_by, metrics)
+        with pytest.raises(ValueError):
+            PolarsAggregation(pl.from_pandas(df)).aggregate(group_by, metrics)
+
+    # min, max, count and nunique work on text
+    assert PolarsAggregation(pl.from_pandas(df)).aggregate(["Country"], [("max", "Description")]).height == 1
+
+
+def test_engines_share_one_arrow_table():
+    raw = pd.concat([retail_sheet(["489434", "C489449"]), retail_sheet(["581587", "581588"])])
+    table = pl_clean(pl.from_pandas(raw).lazy()).collect().to_arrow(
+        compat_level=pl.CompatLevel.oldest()
+    )
+    price = table.column("Price").chunk(0).buffers()[1].address
+
+    pandas_df = pd_view(table)
+    polars_df = pl_view(table)
+
+    # both views read the table's buffers instead of copies
+    assert pandas_df["Price"].array._pa_array.chunk(0).buffers()[1].address == price
+    assert polars_df["Price"].to_arrow().buffers()[1].address == price
+
+    # the pandas cleaning rules give the same rows as the shared table
+    assert pd_clean(raw)["Customer ID"].tolist() == pandas_df["Customer ID"].tolist() == ["13085", "13085"]
+
+    metrics = parse_metrics("sum:Amount,count:Invoice")
+    assert (
+        PandasAggregation(pandas_df).aggregate(["Country"], metrics).to_dict(orient="records")
+        == PolarsAggregation(polars_df).aggregate(["Country"], metrics).to_dicts()
+    )
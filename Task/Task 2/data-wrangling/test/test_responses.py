@@ -0,0 +1,47 @@
+"""
+Author: Ajeyomi Adedoyin Samuel
+Date: 01-03-2025
+Email: adedoyinsamuel25@gmail.com
+"""
+import sys
+sys.path.append('../')
+
+import json
+from datetime import datetime
+
+import pyarrow as pa
+
+from api.responses import dumps, iter_arrow_ipc, iter_ndjson
+
+
+def table():
+    return pa.table(
+        {
+            "Invoice": ["489434", "489435", "489436"],
+            "InvoiceDate": [datetime(2009, 12, 1, 7, 45)] * 3,
+            "Amount": [83.4, None, 10.0],
+        }
+    )
+
+
+def test_dumps_handles_dates():
+    assert json.loads(dumps({"date": datetime(2009, 12, 1, 7, 45)})) == {
+        "date": "2009-12-01T07:45:00"
+    }
+
+
+def test_ndjson_is_written_per_batch():
+    chunks = list(iter_ndjson(table().to_batches(max_chunksize=2)))
+
+    assert len(chunks) == 2
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["Invoice"] for row in rows] == ["489434", "489435", "489436"]
+    assert rows[1]["Amount"] is None
+
+
+def test_arrow_stream_round_trips():
+    data = table()
+    chunks = list(iter_arrow_ipc(data.schema, data.to_batches(max_chunksize=2)))
+
+    assert len(chunks) == 3  # one per batch, then the end-of-stream marker
+    assert pa.ipc.open_stream(b"".join(chunks)).read_all().equals(data)